@@ -0,0 +1,217 @@
+"""
+run.py — End-to-end throughput benchmarks against the local fake server.
+
+Runs the SDK's bulk entry points against :class:`server.FakeServer` and
+prints wall time and throughput for each:
+
+* ``inventory.get``            — stream and parse one large manifest
+* ``inventory.download``       — fetch and verify the ``bin`` files of a dataset
+* ``reports.daily``            — ``reports._create_daily_report(overwrite=True)``
+* ``citations.report``         — ``datecite.citation_report`` over every dataset
+* ``citations.records``        — ``datecite.get_datacite_citations`` fan-out
+
+Every benchmark runs in a scratch directory with its own client, so numbers
+are comparable across releases. Rate limits are disabled unless ``--limits``
+is given, and the DOI cache is off so citation lookups always hit the server.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --large 1000000 --latency 0.02 --error-rate 0.01
+    python benchmarks/run.py --quick --json results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Run from a checkout without installing: the package first, then server.py.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [_HERE, os.path.dirname(_HERE)]
+
+from server import LARGE, FakeServer  # noqa: E402
+
+import brainimagelibrary  # noqa: E402
+from brainimagelibrary import client, datecite, inventory, reports  # noqa: E402
+from brainimagelibrary._api import _batch  # noqa: E402
+from brainimagelibrary.doicache import set_doi_cache  # noqa: E402
+from brainimagelibrary.metrics import Metrics  # noqa: E402
+from brainimagelibrary.ratelimit import DEFAULT_LIMITS  # noqa: E402
+
+
+def bench_inventory(server, args):
+    result = inventory.get(bildid=LARGE)
+    if result is None:
+        raise RuntimeError("inventory.get returned None")
+    return len(result["manifest"]), "entries"
+
+
+def bench_inventory_many(server, args):
+    results = inventory.get_many(server.bildids, processes=args.processes)
+    failed = [bildid for bildid, result in results if result is None]
+    if failed:
+        raise RuntimeError(f"{len(failed)} inventories failed")
+    return sum(len(result["manifest"]) for _, result in results), "entries"
+
+
+def bench_download(server, args):
+    result = inventory.get(bildid=server.bildids[0])
+    folder = result.download(n=args.download_files, extensions="bin", local=None)
+    if folder is None:
+        raise RuntimeError("download returned None")
+    total = 0
+    for root, _, names in os.walk(folder):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in names if name.endswith(".bin"))
+    if total != args.download_files * args.file_size:
+        raise RuntimeError(f"downloaded {total} bytes, expected {args.download_files * args.file_size}")
+    return total / 1e6, "MB"
+
+
+def bench_daily_report(server, args):
+    df = reports._create_daily_report(overwrite=True)
+    if len(df) != len(server.bildids):
+        raise RuntimeError(f"report has {len(df)} rows, expected {len(server.bildids)}")
+    return len(df), "datasets"
+
+
+def bench_citation_report(server, args):
+    df = datecite.citation_report()
+    if df is None or len(df) != len(server.bildids):
+        raise RuntimeError("citation report is incomplete")
+    return len(df), "datasets"
+
+
+def bench_citation_records(server, args):
+    results = _batch(datecite.get_datacite_citations, server.bildids, max_workers=8)
+    failed = [bildid for bildid, result in results if not isinstance(result, dict)]
+    if failed:
+        raise RuntimeError(f"{len(failed)} datasets failed")
+    return len(results), "datasets"
+
+
+BENCHMARKS = {
+    "inventory.get": bench_inventory,
+    "inventory.get_many": bench_inventory_many,
+    "inventory.download": bench_download,
+    "reports.daily": bench_daily_report,
+    "citations.report": bench_citation_report,
+    "citations.records": bench_citation_records,
+}
+
+
+def run(args) -> dict:
+    limits = DEFAULT_LIMITS if args.limits else {}
+    previous_cache = set_doi_cache(None)
+    results = {}
+    cwd = os.getcwd()
+    with FakeServer(
+        datasets=args.datasets,
+        files=args.files,
+        large=args.large,
+        downloads=args.download_files,
+        file_size=args.file_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    ) as server:
+        server.warm()
+        for name, bench in BENCHMARKS.items():
+            if args.only and name not in args.only:
+                continue
+            with tempfile.TemporaryDirectory() as scratch:
+                os.chdir(scratch)
+                metrics = Metrics() if args.metrics else None
+                previous = client.set_client(
+                    server.client(limits=limits, pool_maxsize=32, metrics=metrics)
+                )
+                server.reset()
+                try:
+                    start = time.perf_counter()
+                    amount, unit = bench(server, args)
+                    seconds = time.perf_counter() - start
+                    stats = client.get_client().stats()
+                finally:
+                    client.get_client().close()
+                    client.set_client(previous)
+                    os.chdir(cwd)
+            results[name] = {
+                "seconds": round(seconds, 4),
+                "amount": amount,
+                "unit": unit,
+                "throughput": round(amount / seconds, 2) if seconds else None,
+                "requests": sum(server.requests().values()),
+                "connections": stats["connections"],
+                "retries": stats["retries"].get("retries", 0),
+            }
+            print(
+                f"{name:<20} {seconds:9.3f} s  {amount / seconds:12.1f} {unit}/s"
+                f"  {results[name]['requests']:7d} requests  {stats['connections']:4d} connections",
+                flush=True,
+            )
+            if metrics is not None:
+                results[name]["metrics"] = stats["metrics"]
+                for key, entry in stats["metrics"]["endpoints"].items():
+                    latency = entry["latency"]
+                    print(
+                        f"    {key:<60} {entry['requests']:7d}  p50 {latency['p50'] * 1000:8.1f} ms"
+                        f"  p95 {latency['p95'] * 1000:8.1f} ms"
+                    )
+    set_doi_cache(previous_cache)
+    return {
+        "version": brainimagelibrary.__version__,
+        "python": platform.python_version(),
+        "settings": {
+            key: getattr(args, key)
+            for key in (
+                "datasets",
+                "files",
+                "large",
+                "download_files",
+                "file_size",
+                "latency",
+                "error_rate",
+                "limits",
+                "processes",
+            )
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--datasets", type=int, default=200, help="datasets listed by the server")
+    parser.add_argument("--files", type=int, default=1000, help="manifest entries per dataset")
+    parser.add_argument("--large", type=int, default=200_000, help="manifest entries of the large inventory")
+    parser.add_argument("--download-files", type=int, default=8, help="files fetched by the download benchmark")
+    parser.add_argument("--file-size", type=int, default=8 * 1024 * 1024, help="bytes per downloaded file")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of responses answered with 503")
+    parser.add_argument("--limits", action="store_true", help="keep the default per-host rate limits")
+    parser.add_argument("--processes", type=int, default=None, help="parser processes for inventory.get_many")
+    parser.add_argument("--metrics", action="store_true", help="report per-endpoint latency")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--quick", action="store_true", help="small sizes, for smoke testing")
+    parser.add_argument("--json", metavar="PATH", help="write results to PATH as JSON")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.datasets, args.files, args.large = 10, 50, 2000
+        args.download_files, args.file_size = 2, 64 * 1024
+    return args
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args(argv)
+    report = run(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
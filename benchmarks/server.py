@@ -0,0 +1,534 @@
+"""
+server.py — A local stand-in for the Brain Image Library and citation APIs.
+
+Serves synthetic but self-consistent responses for every host the SDK talks
+to, so benchmarks exercise the real request pipeline (pooling, retries, rate
+limits, coalescing, streaming, range downloads) without touching the network:
+
+* ``api.brainimagelibrary.org`` — ``/query``, ``/retrieve``,
+  ``/query/submission``, ``/query/fulltext``
+* ``download.brainimagelibrary.org`` — ``<bildid>.json.gz`` inventories with
+  ``ETag``/``Last-Modified`` and data files with ``Range`` support
+* ``api.datacite.org``, ``opencitations.net``, ``api.crossref.org`` and
+  ``api.semanticscholar.org`` — DOI metadata, citation counts and paginated
+  citation lists
+
+Every response can be delayed and a fraction of them answered with 503, per
+host, to measure how the SDK behaves against slow or flaky services.
+
+Usage:
+    from server import FakeServer
+
+    with FakeServer(datasets=100, files=1000, latency=0.01) as server:
+        client.set_client(server.client())
+        ...
+"""
+
+import functools
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from brainimagelibrary.client import Client, _CountingAdapter
+from brainimagelibrary.coalesce import Coalescer
+from brainimagelibrary.ratelimit import RateLimiter
+
+HOSTS = (
+    "api.brainimagelibrary.org",
+    "download.brainimagelibrary.org",
+    "api.datacite.org",
+    "opencitations.net",
+    "api.crossref.org",
+    "api.semanticscholar.org",
+)
+
+DOI_PREFIX = "10.35077"
+
+LARGE = "large"
+
+_LAST_MODIFIED = "Mon, 06 Jan 2025 00:00:00 GMT"
+
+
+class FakeServer:
+    """
+    A threaded HTTP server answering for every host in :data:`HOSTS`.
+
+    Requests are routed by the first path segment, which
+    :meth:`client` fills in by rewriting ``https://<host>/...`` to
+    ``http://127.0.0.1:<port>/<host>/...``.
+
+    Args:
+        datasets (int, optional): Datasets listed by ``/query/submission``.
+            Defaults to 100.
+        files (int, optional): Manifest entries per dataset. Defaults to 1000.
+        large (int, optional): Manifest entries of the unlisted ``large``
+            dataset. Defaults to 100000.
+        downloads (int, optional): Entries per manifest with extension
+            ``bin`` that are served with real content. Defaults to 4.
+        file_size (int, optional): Size in bytes of each ``bin`` file.
+            Defaults to 1 MiB.
+        citations (int, optional): Most citations per dataset. Defaults to 20.
+        papers (int, optional): Distinct citing papers shared by all datasets.
+            Defaults to 200.
+        latency (float | dict, optional): Seconds added to every response,
+            or ``{host: seconds}``. Defaults to 0.
+        error_rate (float | dict, optional): Fraction of responses answered
+            with 503, or ``{host: fraction}``. Defaults to 0.
+        seed (int, optional): Seed for error injection. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        datasets: int = 100,
+        files: int = 1000,
+        large: int = 100_000,
+        downloads: int = 4,
+        file_size: int = 1024 * 1024,
+        citations: int = 20,
+        papers: int = 200,
+        latency=0.0,
+        error_rate=0.0,
+        seed: int = 0,
+    ) -> None:
+        self.bildids = [f"bench-{i:05d}" for i in range(datasets)]
+        self.files = files
+        self.large = large
+        self.downloads = downloads
+        self.file_size = file_size
+        self.citations = citations
+        self.papers = [f"10.9999/paper.{i}" for i in range(papers)]
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._inventories = {}
+        self._requests = {}
+        self._httpd = None
+        self._thread = None
+
+    # --- lifecycle ---
+
+    def start(self) -> "FakeServer":
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def client(self, limits: Optional[dict] = None, **kwargs) -> Client:
+        """
+        Returns a :class:`~brainimagelibrary.client.Client` that talks to this server.
+
+        Args:
+            limits (dict, optional): Per-host rate limits. Defaults to none,
+                so benchmarks measure the SDK rather than its politeness.
+            **kwargs: Passed to :class:`~brainimagelibrary.client.Client`.
+        """
+        kwargs.setdefault("limiter", RateLimiter(limits if limits is not None else {}))
+        kwargs.setdefault("coalesce", Coalescer(ttl=0))
+        client = Client(**kwargs)
+        adapter = _RedirectAdapter(
+            self.url,
+            pool_connections=client._adapter._pool_connections,
+            pool_maxsize=client._adapter._pool_maxsize,
+            pool_block=client._adapter._pool_block,
+        )
+        client._adapter = adapter
+        client.session.mount("https://", adapter)
+        client.session.mount("http://", adapter)
+        return client
+
+    def warm(self) -> None:
+        """Builds every inventory up front so timings measure the client, not the server."""
+        for bildid in [*self.bildids, LARGE]:
+            self.inventory(bildid)
+
+    def requests(self) -> dict:
+        """Returns the number of requests served per host."""
+        with self._lock:
+            return dict(self._requests)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+
+    # --- synthetic data ---
+
+    def _setting(self, value, host):
+        return value.get(host, 0) if isinstance(value, dict) else value
+
+    def _count(self, host: str) -> None:
+        with self._lock:
+            self._requests[host] = self._requests.get(host, 0) + 1
+
+    def _fail(self, host: str) -> bool:
+        rate = self._setting(self.error_rate, host)
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def number_of_citations(self, bildid: str) -> int:
+        return int(hashlib.md5(bildid.encode()).hexdigest(), 16) % (self.citations + 1)
+
+    def citing(self, bildid: str) -> list:
+        n = self.number_of_citations(bildid)
+        start = int(hashlib.sha1(bildid.encode()).hexdigest(), 16) % len(self.papers)
+        return [self.papers[(start + i) % len(self.papers)] for i in range(n)]
+
+    def record(self, bildid: str) -> dict:
+        i = int(hashlib.md5(bildid.encode()).hexdigest(), 16)
+        return {
+            "Submission": {
+                "metadata": "1.0" if bildid in self.bildids[: len(self.bildids) // 2] else "2.0",
+                "bildate": "2024-01-01",
+                "project": f"Project {i % 13}",
+                "consortium": "BICCN",
+            },
+            "Contributors": [
+                {"contributorname": f"Contributor {i % 97}", "affiliation": f"University {i % 31}"}
+            ],
+            "Funders": [{"funder": "NIH", "award_number": f"U01MH{i % 100000:05d}"}],
+            "Dataset": [
+                {
+                    "bildirectory": f"/bil/data/bench/{bildid}",
+                    "title": f"Synthetic dataset {bildid}",
+                    "generalmodality": ("cell morphology", "connectivity", "spatial transcriptomics")[i % 3],
+                    "technique": ("light sheet", "two-photon", "MERFISH")[i % 3],
+                }
+            ],
+            "Specimen": [
+                {
+                    "species": ("Mus musculus", "Homo sapiens", "Macaca mulatta")[i % 3],
+                    "ncbitaxonomy": "10090",
+                    "genotype": "wild type",
+                    "samplelocalid": f"S{i % 1000}",
+                }
+            ],
+        }
+
+    def content(self, name: str, size: int) -> bytes:
+        """Returns the bytes of the file at *name*, the same in every dataset."""
+        block = hashlib.sha512(name.encode()).digest() * 64
+        return (block * (size // len(block) + 1))[:size]
+
+    @functools.lru_cache(maxsize=None)
+    def digest(self, name: str, size: int) -> str:
+        return hashlib.md5(self.content(name, size)).hexdigest()
+
+    def inventory(self, bildid: str) -> tuple:
+        """Returns ``(gzip bytes, etag)`` of the inventory of *bildid*."""
+        with self._lock:
+            cached = self._inventories.get(bildid)
+        if cached is not None:
+            return cached
+
+        n = self.large if bildid == LARGE else self.files
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        out = io.BytesIO()
+        out.write(compressor.compress(b'{"manifest": ['))
+        total, frequencies = 0, {}
+        for i in range(n):
+            if i < self.downloads:
+                name, extension, size = f"data/file{i:04d}.bin", "bin", self.file_size
+                md5 = self.digest(name, size)
+            else:
+                name, extension, size = f"images/z{i // 1000:04d}/tile{i:07d}.tif", "tif", 4096 + i % 4096
+                md5 = hashlib.md5(name.encode()).hexdigest()
+            entry = {
+                "fullpath": f"/bil/data/bench/{bildid}/{name}",
+                "download_url": f"https://download.brainimagelibrary.org/bench/{bildid}/{name}",
+                "extension": extension,
+                "mime_type": "application/octet-stream" if extension == "bin" else "image/tiff",
+                "size": size,
+                "md5": md5,
+                "is_cell_by_gene": False,
+            }
+            total += size
+            frequencies[extension] = frequencies.get(extension, 0) + 1
+            out.write(compressor.compress(((", " if i else "") + json.dumps(entry)).encode()))
+        tail = {
+            "number_of_files": n,
+            "size": total,
+            "pretty_size": f"{total / 1e9:.1f} GB",
+            "file_types": sorted(frequencies),
+            "frequencies": frequencies,
+            "mime_types": {"image/tiff": frequencies.get("tif", 0)},
+        }
+        out.write(compressor.compress(("], " + json.dumps(tail)[1:]).encode()))
+        out.write(compressor.flush())
+        body = out.getvalue()
+        cached = (body, '"' + hashlib.md5(body).hexdigest() + '"')
+        with self._lock:
+            self._inventories[bildid] = cached
+        return cached
+
+
+class _RedirectAdapter(_CountingAdapter):
+    """Sends requests for the real hosts to a :class:`FakeServer` instead."""
+
+    def __init__(self, base: str, **kwargs) -> None:
+        self.base = base
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if parts.hostname in HOSTS:
+            request.url = f"{self.base}/{parts.hostname}{parts.path}" + (
+                f"?{parts.query}" if parts.query else ""
+            )
+        return super().send(request, **kwargs)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeServer = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    # --- plumbing ---
+
+    def _route(self, head: bool = False) -> None:
+        _, host, rest = self.path.split("/", 2) if self.path.count("/") >= 2 else ("", "", "")
+        parts = urlsplit("/" + rest)
+        self.head = head
+        self.host = host
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        fake = self.fake
+        fake._count(host)
+
+        delay = fake._setting(fake.latency, host)
+        if delay:
+            time.sleep(delay)
+        if fake._fail(host):
+            return self._send(503, b"unavailable", headers={"Retry-After": "0"})
+
+        route = _ROUTES.get(host)
+        if route is None:
+            return self._send(404, b"unknown host")
+        try:
+            route(self, parts.path)
+        except KeyError:
+            self._json({"message": "GET failure, no entry found"}, status=404)
+
+    def do_GET(self) -> None:
+        self._route()
+
+    def do_HEAD(self) -> None:
+        self._route(head=True)
+
+    def _send(self, status: int, body: bytes, content_type="text/plain", headers=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not self.head:
+            self.wfile.write(body)
+
+    def _json(self, payload, status: int = 200) -> None:
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    # --- api.brainimagelibrary.org ---
+
+    def _bil(self, path: str) -> None:
+        fake = self.fake
+        if path == "/query/submission":
+            half = len(fake.bildids) // 2
+            ids = fake.bildids[:half] if self.query.get("metadata") == "1.0" else fake.bildids[half:]
+            return self._json({"bildids": ids})
+        if path == "/query/fulltext":
+            return self._json({"retjson": [fake.record(b) for b in fake.bildids[:10]]})
+        if path in ("/query", "/retrieve"):
+            bildid = self.query.get("bildid")
+            if bildid is not None:
+                if bildid not in fake.bildids and bildid != LARGE:
+                    raise KeyError(bildid)
+                return self._json({"success": True, "retjson": [fake.record(bildid)]})
+            return self._json({"retjson": [fake.record(b) for b in fake.bildids[:10]]})
+        raise KeyError(path)
+
+    # --- download.brainimagelibrary.org ---
+
+    def _download(self, path: str) -> None:
+        fake = self.fake
+        match = re.fullmatch(r"/inventory/datasets/JSON/(.+)\.json\.gz", path)
+        if match:
+            bildid = match.group(1)
+            if bildid not in fake.bildids and bildid != LARGE:
+                return self._send(404, b"not found")
+            body, etag = fake.inventory(bildid)
+            headers = {"ETag": etag, "Last-Modified": _LAST_MODIFIED}
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+            return self._send(200, body, "application/gzip", headers)
+
+        match = re.fullmatch(r"/bench/([^/]+)/(.+)", path)
+        if not match:
+            return self._send(404, b"not found")
+        _, name = match.groups()
+        size = fake.file_size if name.endswith(".bin") else 4096
+        content = fake.content(name, size)
+        range_header = self.headers.get("Range")
+        if range_header:
+            start, _, end = range_header.replace("bytes=", "").partition("-")
+            start = int(start)
+            end = min(int(end) if end else size - 1, size - 1)
+            return self._send(
+                206,
+                content[start : end + 1],
+                "application/octet-stream",
+                {"Content-Range": f"bytes {start}-{end}/{size}", "Accept-Ranges": "bytes"},
+            )
+        return self._send(200, content, "application/octet-stream", {"Accept-Ranges": "bytes"})
+
+    # --- citation services ---
+
+    def _bildid(self, doi: str) -> str:
+        prefix, _, bildid = doi.partition("/")
+        if prefix != DOI_PREFIX or bildid not in self.fake.bildids:
+            raise KeyError(doi)
+        return bildid
+
+    def _datacite(self, path: str) -> None:
+        fake = self.fake
+        if path == "/dois":
+            size = int(self.query.get("page[size]", 25))
+            cursor = int(self.query.get("page[cursor]", 1))
+            start = (cursor - 1) * size
+            page = fake.bildids[start : start + size]
+            data = [
+                {
+                    "id": f"{DOI_PREFIX}/{b}",
+                    "attributes": {"doi": f"{DOI_PREFIX}/{b}", "citationCount": fake.number_of_citations(b)},
+                }
+                for b in page
+            ]
+            links = {}
+            if start + size < len(fake.bildids):
+                query = dict(self.query, **{"page[cursor]": cursor + 1})
+                links["next"] = f"https://api.datacite.org/dois?{urlencode(query)}"
+            return self._json({"data": data, "links": links})
+        match = re.fullmatch(r"/dois/(10\.\d+/[^/]+)(/citations)?", path)
+        if not match:
+            raise KeyError(path)
+        bildid = self._bildid(match.group(1))
+        if match.group(2):
+            return self._json(
+                {
+                    "data": [
+                        {"attributes": {"doi": doi, "titles": [{"title": f"Paper {doi}"}]}}
+                        for doi in fake.citing(bildid)
+                    ]
+                }
+            )
+        return self._json(
+            {
+                "data": {
+                    "id": f"{DOI_PREFIX}/{bildid}",
+                    "attributes": {
+                        "doi": f"{DOI_PREFIX}/{bildid}",
+                        "titles": [{"title": f"Synthetic dataset {bildid}"}],
+                        "citationCount": fake.number_of_citations(bildid),
+                        "relatedIdentifiers": [
+                            {
+                                "relatedIdentifier": f"https://download.brainimagelibrary.org/bench/{bildid}",
+                                "relatedIdentifierType": "URL",
+                            }
+                        ],
+                    },
+                }
+            }
+        )
+
+    def _opencitations(self, path: str) -> None:
+        match = re.fullmatch(r"/index/coci/api/v1/(citation-count|citations)/(.+)", path)
+        if not match:
+            raise KeyError(path)
+        bildid = self._bildid(match.group(2))
+        citing = self.fake.citing(bildid)
+        if match.group(1) == "citation-count":
+            return self._json([{"count": str(len(citing))}])
+        return self._json([{"citing": doi, "cited": match.group(2)} for doi in citing])
+
+    def _crossref(self, path: str) -> None:
+        fake = self.fake
+        if path == "/works":
+            filters = self.query.get("filter", "")
+            if filters.startswith("cites:"):
+                citing = fake.citing(self._bildid(filters[len("cites:") :]))
+                rows = int(self.query.get("rows", 20))
+                cursor = self.query.get("cursor", "*")
+                start = 0 if cursor == "*" else int(cursor)
+                page = citing[start : start + rows]
+                items = [{"DOI": doi, "title": [f"Paper {doi}"]} for doi in page]
+                return self._json({"message": {"items": items, "next-cursor": str(start + rows)}})
+            dois = [f[len("doi:") :] for f in filters.split(",") if f.startswith("doi:")]
+            items = [{"DOI": doi, "title": [f"Paper {doi}"]} for doi in dois if doi in fake.papers]
+            return self._json({"message": {"items": items}})
+        doi = path[len("/works/") :]
+        if doi in fake.papers:
+            return self._json({"message": {"title": [f"Paper {doi}"]}})
+        bildid = self._bildid(doi)
+        return self._json({"message": {"is-referenced-by-count": fake.number_of_citations(bildid)}})
+
+    def _semanticscholar(self, path: str) -> None:
+        match = re.fullmatch(r"/graph/v1/paper/DOI:(10\.\d+/[^/]+)(/citations)?", path)
+        if not match:
+            raise KeyError(path)
+        citing = self.fake.citing(self._bildid(match.group(1)))
+        if not match.group(2):
+            return self._json({"citationCount": len(citing)})
+        offset = int(self.query.get("offset", 0))
+        limit = int(self.query.get("limit", 100))
+        page = citing[offset : offset + limit]
+        payload = {
+            "offset": offset,
+            "data": [
+                {"citingPaper": {"title": f"Paper {doi}", "externalIds": {"DOI": doi}}} for doi in page
+            ],
+        }
+        if offset + limit < len(citing):
+            payload["next"] = offset + limit
+        return self._json(payload)
+
+
+_ROUTES = {
+    "api.brainimagelibrary.org": _Handler._bil,
+    "download.brainimagelibrary.org": _Handler._download,
+    "api.datacite.org": _Handler._datacite,
+    "opencitations.net": _Handler._opencitations,
+    "api.crossref.org": _Handler._crossref,
+    "api.semanticscholar.org": _Handler._semanticscholar,
+}
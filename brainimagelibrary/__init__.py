@@ -6,14 +6,7 @@ __version__ = "0.0.24"
 __author__ = "Ivan Cao-Berg"
 __credits__ = "Brain Image Library Team"
 
-from .retrieve import by_id, by_directory, by_url
-from . import metadata
-from . import query
-from .metadata import *
-from .reports import *
-from .inventory import *
-from .datecite import *
-from .summary import *
+import importlib
 
 __all__ = [
     # version info
@@ -21,8 +14,11 @@ __all__ = [
     "__author__",
     "__credits__",
     # submodules
+    "client",
     "metadata",
     "query",
+    # client
+    "stats",
     # retrieve shortcuts
     "by_id",
     "by_directory",
@@ -44,6 +40,61 @@ __all__ = [
     "get_datacite_metadata",
     "get_datacite_citations",
     "get_number_of_citations",
+    "citation_report",
+    "iter_citations",
     # summary
     "load",
 ]
+
+# Public names and the submodule that defines them, imported on first access
+# (PEP 562) so that ``import brainimagelibrary`` stays cheap for short-lived
+# processes. A None attribute means the name is the submodule itself. Where
+# several submodules export the same name, this table keeps the binding the
+# former star imports produced: ``get`` from inventory, ``daily`` from summary.
+_LAZY = {
+    "client": ("client", None),
+    "metadata": ("metadata", None),
+    "query": ("query", None),
+    "stats": ("client", "stats"),
+    "summary": ("summary", None),
+    "by_id": ("retrieve", "by_id"),
+    "by_directory": ("retrieve", "by_directory"),
+    "by_url": ("retrieve", "by_url"),
+    "DatasetInventory": ("inventory", "DatasetInventory"),
+    "to_manifest": ("inventory", "to_manifest"),
+    "exists": ("inventory", "exists"),
+    "has": ("inventory", "has"),
+    "get": ("inventory", "get"),
+    "iter_manifest": ("inventory", "iter_manifest"),
+    "daily": ("summary", "daily"),
+    "get_all_bildids": ("reports", "get_all_bildids"),
+    "Dataset": ("datecite", "Dataset"),
+    "Collection": ("datecite", "Collection"),
+    "dataset": ("datecite", "dataset"),
+    "collection": ("datecite", "collection"),
+    "get_datacite_metadata": ("datecite", "get_datacite_metadata"),
+    "get_datacite_citations": ("datecite", "get_datacite_citations"),
+    "get_number_of_citations": ("datecite", "get_number_of_citations"),
+    "citation_report": ("datecite", "citation_report"),
+    "iter_citations": ("datecite", "iter_citations"),
+    "load": ("summary", "load"),
+}
+
+
+def __getattr__(name: str):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY.get(name, (name, None))
+    try:
+        module = importlib.import_module(f".{module_name}", __name__)
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{module_name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
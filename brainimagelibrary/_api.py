@@ -1,10 +1,14 @@
 """Shared low-level API utilities for the brainimagelibrary package."""
 
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, Optional, Union
 
 import requests
 
+from .client import get_client
+
 logger = logging.getLogger(__name__)
 
 BIL_API_BASE = "https://api.brainimagelibrary.org"
@@ -12,6 +16,16 @@ DOWNLOAD_BASE = "https://download.brainimagelibrary.org"
 
 _NOT_FOUND_MESSAGE = "GET failure, no entry found"
 
+DEFAULT_BATCH_WORKERS = 8
+
+# Threads of the executor shared by every batch. Threads are started on
+# demand, so the pool only grows as large as the widest batch run so far.
+_SHARED_POOL_SIZE = 32
+
+_shared_pool: Optional[ThreadPoolExecutor] = None
+_shared_pool_lock = threading.Lock()
+_worker = threading.local()
+
 
 def _fetch(
     url: str,
@@ -27,7 +41,7 @@ def _fetch(
         None: When the HTTP request itself fails.
     """
     try:
-        response = requests.get(url, params=params, headers=headers)
+        response = get_client().get(url, params=params, headers=headers)
         data = response.json()
         if data.get("message") == _NOT_FOUND_MESSAGE:
             return {}
@@ -35,3 +49,120 @@ def _fetch(
     except requests.exceptions.RequestException as exc:
         logger.error("API request failed (%s): %s", url, exc)
         return None
+
+
+def _batch(
+    fn: Callable,
+    items: Iterable,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    stream: bool = False,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Applies *fn* to each unique item of *items* on a bounded thread pool.
+
+    Empty items are dropped and duplicates are collapsed, keeping the order in
+    which items were first seen. An exception raised by *fn* is returned as
+    that item's result instead of failing the whole batch.
+
+    Args:
+        fn (Callable): A function of one positional argument.
+        items (Iterable): The inputs.
+        max_workers (int, optional): Maximum number of concurrent calls.
+            Defaults to 8.
+        stream (bool, optional): When True, return an iterator that yields
+            results as they complete. Defaults to False.
+
+    Returns:
+        list | Iterator[tuple]: ``(item, result)`` pairs, in input order when
+            ``stream`` is False or in completion order when it is True.
+    """
+    keys = list(dict.fromkeys(item for item in items if item))
+    iterator = _iter_batch(fn, keys, max_workers)
+    if stream:
+        return iterator
+    results = dict(iterator)
+    return [(key, results[key]) for key in keys]
+
+
+def _mark_worker() -> None:
+    _worker.shared = True
+
+
+def _get_shared_pool() -> ThreadPoolExecutor:
+    """Returns the process-wide batch executor, creating it on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = ThreadPoolExecutor(
+                    max_workers=_SHARED_POOL_SIZE,
+                    thread_name_prefix="brainimagelibrary-batch",
+                    initializer=_mark_worker,
+                )
+    return _shared_pool
+
+
+def _iter_batch(fn: Callable, keys: list, max_workers: int) -> Iterator[tuple]:
+    """
+    Yields ``(key, fn(key))`` in completion order, at most *max_workers* at a time.
+
+    Work runs on the shared executor, so repeated batches reuse its threads
+    instead of starting new ones. A batch started from inside a shared
+    worker (e.g. a per-dataset function that batches again), or one wider
+    than the shared pool, gets a private executor instead, so nested
+    batches cannot deadlock waiting on each other's threads.
+    """
+
+    def _call(key):
+        try:
+            return fn(key)
+        except Exception as exc:
+            logger.warning("Batch item %s failed: %s", key, exc)
+            return exc
+
+    private = getattr(_worker, "shared", False) or max_workers > _SHARED_POOL_SIZE
+    executor = ThreadPoolExecutor(max_workers=max_workers) if private else _get_shared_pool()
+    pending = iter(keys)
+    futures = {}
+
+    def _submit() -> None:
+        for key in pending:
+            futures[executor.submit(_call, key)] = key
+            return
+
+    try:
+        for _ in range(max(1, max_workers)):
+            _submit()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = futures.pop(future)
+                _submit()
+                yield key, future.result()
+    finally:
+        # Stop queued work if the caller abandons the iterator early.
+        for future in futures:
+            future.cancel()
+        if private:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _prefetch_pages(fetch: Callable, state) -> Iterator:
+    """
+    Yields pages from *fetch*, requesting each page while the previous one is consumed.
+
+    *fetch* takes a page state (a cursor or an offset) and returns
+    ``(page, next_state)``; a None ``next_state`` ends the iteration. The
+    request for page n + 1 is sent before page n is yielded, so a caller
+    that does real work per page rarely waits on the network. Exceptions
+    raised by *fetch* propagate when the page they belong to is reached.
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(fetch, state)
+        while future is not None:
+            page, state = future.result()
+            future = executor.submit(fetch, state) if state is not None else None
+            yield page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
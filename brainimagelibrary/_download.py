@@ -0,0 +1,485 @@
+"""Single-file HTTP download helpers used by :meth:`DatasetInventory.download`."""
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import requests
+from tqdm import tqdm
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - exercised only without the extra
+    xxhash = None
+
+from .client import get_client
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Files at least this large are fetched as concurrent byte ranges.
+DEFAULT_SEGMENT_THRESHOLD = 256 * 1024 * 1024
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Concurrent range requests per segmented file.
+DEFAULT_SEGMENTS = 4
+
+#: Checksum algorithms that can be verified, keyed by manifest column.
+CHECKSUMS = ("md5", "sha256", "xxh64", "b2sum")
+
+# CHECKSUMS from the cheapest to the most expensive to compute; sha256 is
+# last since most CPUs outside recent x86 lack instructions for it.
+_FASTEST_FIRST = ("xxh64", "b2sum", "md5", "sha256")
+
+# Times a file whose checksum does not match is downloaded again.
+DEFAULT_REFETCH = 1
+
+#: Ways a locally readable source file can be staged instead of downloaded.
+LOCAL_MODES = ("copy", "hardlink", "symlink")
+
+# ioctl request that shares the source extents on btrfs, XFS and similar.
+_FICLONE = 0x40049409
+
+# Errors meaning "this copy mechanism is not available here", as opposed to
+# a failure reading or writing the data.
+_UNSUPPORTED = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTTY, errno.EBADF}
+
+
+def cheapest_checksum(columns) -> Optional[str]:
+    """
+    Returns the fastest checksum among manifest *columns* that can be computed here.
+
+    ``xxh64`` is only considered when ``xxhash`` is installed. Returns None
+    if the manifest carries no checksum.
+    """
+    for algorithm in _FASTEST_FIRST:
+        if algorithm in columns and (algorithm != "xxh64" or xxhash is not None):
+            return algorithm
+    return None
+
+
+def new_hasher(algorithm: str):
+    """
+    Returns a fresh hash object for a manifest checksum column.
+
+    Raises:
+        ValueError: If *algorithm* is not one of :data:`CHECKSUMS`.
+        ImportError: If *algorithm* is ``'xxh64'`` and ``xxhash`` is not installed.
+    """
+    if algorithm == "md5":
+        return hashlib.md5()
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    if algorithm == "b2sum":
+        return hashlib.blake2b()
+    if algorithm == "xxh64":
+        if xxhash is None:
+            raise ImportError(
+                "xxh64 verification requires xxhash. "
+                "Install it with: pip install brainimagelibrary[xxhash]"
+            )
+        return xxhash.xxh64()
+    raise ValueError(f"checksum must be one of {CHECKSUMS}, got '{algorithm}'.")
+
+
+class _RangeNotSupported(Exception):
+    """The server ignored a ``Range`` header and sent the whole file."""
+
+
+def fetch(
+    url: str,
+    dest: str,
+    size: Optional[int] = None,
+    segments: int = DEFAULT_SEGMENTS,
+    segment_threshold: int = DEFAULT_SEGMENT_THRESHOLD,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    algorithm: Optional[str] = None,
+    expected: Optional[str] = None,
+    refetch: int = DEFAULT_REFETCH,
+) -> tuple:
+    """
+    Downloads *url* to *dest* through ``<dest>.part``.
+
+    Files of a known *size* of at least *segment_threshold* bytes are split
+    into *segment_size* byte ranges fetched by *segments* concurrent
+    connections (see :func:`_fetch_segmented`); everything else, and servers
+    that ignore ``Range``, use a single resumable stream.
+
+    When *algorithm* and *expected* are given, the file is hashed while it
+    is written and only renamed to *dest* if the digest matches. A mismatch
+    discards the ``.part`` file and downloads it again, up to *refetch* times.
+
+    Returns:
+        tuple: ``(status, digest)`` where status is ``"ok"``, ``"skipped"``
+            if *dest* already exists, ``"failed"`` or ``"mismatch"``, and
+            digest is the hex digest computed, or None.
+    """
+    if os.path.exists(dest):
+        return "skipped", None
+
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    part = dest + ".part"
+    verify = algorithm is not None and bool(expected)
+    expected = _normalize_digest(expected) if verify else None
+
+    for attempt in range(refetch + 1):
+        hasher = new_hasher(algorithm) if verify else None
+        try:
+            if segments > 1 and size and size >= segment_threshold:
+                try:
+                    status = _fetch_segmented(url, part, size, segments, segment_size, hasher)
+                except _RangeNotSupported:
+                    logger.info("%s does not support range requests, downloading serially.", url)
+                    _discard(part)
+                    hasher = new_hasher(algorithm) if verify else None
+                    status = _fetch_serial(url, part, hasher)
+            else:
+                status = _fetch_serial(url, part, hasher)
+        except (requests.exceptions.RequestException, OSError) as e:
+            logger.warning("Failed to download %s: %s", url, e)
+            return "failed", None
+
+        if status != "ok" or hasher is None:
+            break
+        digest = hasher.hexdigest()
+        if digest == expected:
+            break
+        logger.warning(
+            "%s checksum mismatch for %s (expected %s, got %s)%s.",
+            algorithm,
+            url,
+            expected,
+            digest,
+            ", downloading again" if attempt < refetch else "",
+        )
+        _discard(part)
+        status = "mismatch"
+
+    if status == "ok":
+        os.rename(part, dest)
+    return status, (hasher.hexdigest() if hasher is not None and status != "failed" else None)
+
+
+def copy_local(src: str, dest: str, mode: str = "copy") -> str:
+    """
+    Stages a locally readable file at *dest* without going through HTTP.
+
+    ``"copy"`` clones the file with a reflink where the filesystem supports
+    it and otherwise copies inside the kernel with ``copy_file_range`` or
+    ``sendfile``. ``"hardlink"`` links *dest* to *src*, falling back to a
+    copy across filesystems. ``"symlink"`` points *dest* at *src*.
+
+    Returns:
+        str: ``"local"``, or ``"skipped"`` if *dest* already exists.
+
+    Raises:
+        OSError: If *src* cannot be read or *dest* cannot be written.
+    """
+    if os.path.lexists(dest):
+        return "skipped"
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+
+    if mode == "symlink":
+        os.symlink(os.path.abspath(src), dest)
+        return "local"
+    if mode == "hardlink":
+        try:
+            os.link(src, dest)
+            return "local"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED | {errno.EPERM, errno.EMLINK}:
+                raise
+
+    part = dest + ".part"
+    try:
+        _clone(src, part)
+    except OSError:
+        _discard(part)
+        raise
+    os.rename(part, dest)
+    return "local"
+
+
+def _clone(src: str, dest: str) -> None:
+    """Copies *src* to *dest* using the cheapest mechanism the kernel offers."""
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                return
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED:
+                    raise
+
+        size = os.fstat(fsrc.fileno()).st_size
+        for name in ("copy_file_range", "sendfile"):
+            copy = getattr(os, name, None)
+            if copy is None:
+                continue
+            try:
+                offset = _copy_range(copy, fsrc.fileno(), fdst.fileno(), size)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED:
+                    raise
+                continue
+            if offset == size:
+                return
+            break
+
+        fsrc.seek(0)
+        fdst.seek(0)
+        fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, _CHUNK_SIZE)
+
+
+def _copy_range(copy, src_fd: int, dst_fd: int, size: int) -> int:
+    """Runs ``os.copy_file_range`` or ``os.sendfile`` until *size* bytes are copied."""
+    offset = 0
+    while offset < size:
+        count = min(size - offset, 1024 * _CHUNK_SIZE)
+        if copy is os.sendfile:
+            sent = copy(dst_fd, src_fd, offset, count)
+        else:
+            sent = copy(src_fd, dst_fd, count, offset, offset)
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+
+def _fetch_serial(url: str, part: str, hasher=None) -> str:
+    """
+    Streams *url* into *part*, resuming from its current size.
+
+    Written chunks are fed to *hasher*; when resuming, the bytes already in
+    *part* are hashed first.
+    """
+    # Determine resume offset from an existing .part file
+    resume_offset = os.path.getsize(part) if os.path.exists(part) else 0
+    headers = {"Range": f"bytes={resume_offset}-"} if resume_offset else {}
+
+    with get_client().get(url, stream=True, timeout=60, headers=headers) as resp:
+        # 416 = range not satisfiable → server thinks file is complete
+        if resp.status_code == 416:
+            if hasher is not None:
+                _hash_file(hasher, part)
+            return "ok"
+
+        if resp.status_code not in (200, 206):
+            return "failed"
+
+        resuming = resp.status_code == 206
+        total = int(resp.headers.get("Content-Length", 0))
+        if resuming:
+            total += resume_offset
+
+        mode = "ab" if resuming else "wb"
+        if resuming and hasher is not None:
+            _hash_file(hasher, part)
+        with _progress(part, total, resume_offset if resuming else 0) as pbar:
+            with open(part, mode) as f:
+                for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    pbar.update(len(chunk))
+    return "ok"
+
+
+def _fetch_segmented(
+    url: str, part: str, size: int, workers: int, segment_size: int, hasher=None
+) -> str:
+    """
+    Fetches *url* as concurrent byte ranges written into a preallocated *part*.
+
+    Completed segments are recorded in ``<part>.segments`` so an interrupted
+    download resumes per segment. A ``.part`` left by a serial download
+    counts as complete for the segments it already covers.
+
+    *hasher* is fed in file order by an :class:`_OrderedHasher`: the segment
+    at the head of the unhashed range is hashed as it streams in, and
+    segments that finish early are read back once the head reaches them.
+    On resume only the segments already on disk are read.
+
+    Raises:
+        _RangeNotSupported: If the server answers a range request with 200.
+    """
+    sidecar = part + ".segments"
+    count = -(-size // segment_size)
+    done = _load_segments(sidecar, size, segment_size)
+    if done is None:
+        done = set()
+        if os.path.exists(part) and not os.path.exists(sidecar):
+            done.update(range(min(os.path.getsize(part), size) // segment_size))
+    # Record state before preallocating, so a full-size .part is never
+    # mistaken for a completed serial download.
+    _save_segments(sidecar, size, segment_size, done)
+
+    mode = "r+b" if os.path.exists(part) else "wb"
+    with open(part, mode) as f:
+        f.truncate(size)
+
+    lock = threading.Lock()
+    pending = [i for i in range(count) if i not in done]
+    initial = sum(min(segment_size, size - i * segment_size) for i in done)
+    ordered = _OrderedHasher(hasher, part, size, segment_size) if hasher is not None else None
+    if ordered is not None:
+        ordered.advance(done)
+
+    with _progress(part, size, initial) as pbar:
+
+        def _one(index):
+            start = index * segment_size
+            end = min(start + segment_size, size) - 1
+            headers = {"Range": f"bytes={start}-{end}"}
+            with get_client().get(url, stream=True, timeout=60, headers=headers) as resp:
+                if resp.status_code == 200:
+                    raise _RangeNotSupported(url)
+                if resp.status_code != 206:
+                    return False
+                length = end + 1 - start
+                written = 0
+                with open(part, "r+b") as f:
+                    f.seek(start)
+                    for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                        chunk = chunk[: length - written]
+                        f.write(chunk)
+                        if ordered is not None and ordered.head == index:
+                            ordered.feed(index, start + written, chunk, f)
+                        written += len(chunk)
+                        with lock:
+                            pbar.update(len(chunk))
+                        if written == length:
+                            break
+            if written < length:
+                return False
+            with lock:
+                done.add(index)
+                _save_segments(sidecar, size, segment_size, done)
+            if ordered is not None:
+                ordered.advance(done)
+            return True
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_one, pending))
+
+    if not all(results):
+        return "failed"
+    _discard(sidecar)
+    return "ok"
+
+
+class _OrderedHasher:
+    """
+    Feeds the segments of *part* to *hasher* in file order.
+
+    :attr:`head` is the first segment not yet fully hashed and
+    :attr:`position` the number of bytes hashed. The worker writing the head
+    segment passes its chunks to :meth:`feed` as they arrive; other workers
+    finish first and call :meth:`advance`, which reads their segments back
+    once everything before them is hashed, while they are still recent.
+    """
+
+    def __init__(self, hasher, part: str, size: int, segment_size: int) -> None:
+        self.hasher = hasher
+        self.part = part
+        self.size = size
+        self.segment_size = segment_size
+        self.head = 0
+        self.position = 0
+        self._lock = threading.Lock()
+
+    def feed(self, index: int, offset: int, chunk: bytes, f) -> None:
+        """Hashes *chunk*, written at *offset* of segment *index* through *f*."""
+        with self._lock:
+            if index != self.head:
+                return
+            if self.position < offset:
+                # The segment became the head mid-stream: catch up on the
+                # part of it written so far.
+                f.flush()
+                self._read(offset)
+            self.hasher.update(chunk)
+            self.position = offset + len(chunk)
+
+    def advance(self, done: set) -> None:
+        """Hashes every completed segment that now directly follows the head."""
+        with self._lock:
+            while self.head in done:
+                self._read(min((self.head + 1) * self.segment_size, self.size))
+                self.head += 1
+
+    def _read(self, end: int) -> None:
+        if self.position >= end:
+            return
+        with open(self.part, "rb") as f:
+            f.seek(self.position)
+            while self.position < end:
+                chunk = f.read(min(_CHUNK_SIZE, end - self.position))
+                if not chunk:
+                    raise OSError(f"{self.part} is shorter than {end} bytes")
+                self.hasher.update(chunk)
+                self.position += len(chunk)
+
+
+def _hash_file(hasher, path: str) -> None:
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+
+
+def _normalize_digest(value: str) -> str:
+    """Accepts bare digests as well as ``<digest>  <filename>`` tool output."""
+    return str(value).strip().split()[0].lower()
+
+
+def _progress(path: str, total: int, initial: int) -> tqdm:
+    return tqdm(
+        total=total if total else None,
+        initial=initial,
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        desc=os.path.basename(path[: -len(".part")]),
+        leave=False,
+    )
+
+
+def _load_segments(sidecar: str, size: int, segment_size: int) -> Optional[set]:
+    """Returns completed segment indices, or None if *sidecar* is absent or stale."""
+    try:
+        with open(sidecar) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get("size") != size or state.get("segment_size") != segment_size:
+        return None
+    return set(state.get("done", []))
+
+
+def _save_segments(sidecar: str, size: int, segment_size: int, done: set) -> None:
+    tmp = sidecar + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"size": size, "segment_size": segment_size, "done": sorted(done)}, f)
+    os.replace(tmp, sidecar)
+
+
+def _discard(path: str) -> None:
+    for p in (path, path + ".segments"):
+        try:
+            os.remove(p)
+        except OSError:
+            pass
@@ -0,0 +1,159 @@
+"""Inventory decompression and parsing in worker processes, returned through shared memory."""
+
+import ast
+import gzip
+import io
+import json
+import multiprocessing
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .codec import loads
+from .manifest import Manifest
+
+# Buffers are placed at cache-line boundaries inside a segment.
+_ALIGN = 64
+
+# ``SharedMemory(track=...)`` exists from Python 3.13. Earlier versions
+# register every segment with the resource tracker of the process that
+# creates or attaches it, which would unlink a worker's results when the
+# worker exits, so ownership is handed to the parent explicitly.
+_TRACK_PARAMETER = sys.version_info >= (3, 13)
+
+
+def decode(content: bytes):
+    """
+    Decompresses and parses a ``.json.gz`` inventory payload.
+
+    Inventories written as Python literals rather than JSON are parsed with
+    :func:`ast.literal_eval`.
+
+    Raises:
+        gzip.BadGzipFile: If *content* is not gzip.
+        ValueError, SyntaxError: If the payload cannot be parsed.
+    """
+    with gzip.GzipFile(fileobj=io.BytesIO(content)) as gz:
+        raw = gz.read()
+    try:
+        return loads(raw)
+    except json.JSONDecodeError:
+        return ast.literal_eval(raw.decode("utf-8"))
+
+
+def mp_context():
+    """Returns the start method for parser processes: forkserver where available, else spawn."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def parse_in_worker(content: bytes) -> tuple:
+    """
+    Parses one inventory inside a worker process.
+
+    The manifest is built column by column and its buffers are copied into
+    a single shared-memory segment, so only a small description of the
+    result is pickled back to the parent. :func:`receive` turns the result
+    into ``(fields, manifest)`` and releases the segment.
+
+    Returns:
+        tuple: ``("ok", fields, layout, handle)`` or ``("error", message)``.
+    """
+    try:
+        data = decode(content)
+    except (gzip.BadGzipFile, OSError, EOFError) as e:
+        return ("error", f"Response is not a valid gzip file: {e}")
+    except (ValueError, SyntaxError) as e:
+        return ("error", f"Decompressed content could not be parsed: {e}")
+    if not isinstance(data, dict):
+        return ("error", "Decompressed content is not an inventory object.")
+
+    records = data.pop("manifest", None)
+    if records is None:
+        return ("ok", data, None, None)
+    layout, arrays = Manifest.from_records(records)._export()
+    return ("ok", data, layout, _share(arrays))
+
+
+def receive(result: tuple) -> tuple:
+    """
+    Unpacks the result of :func:`parse_in_worker` in the parent process.
+
+    Returns:
+        tuple: ``(fields, manifest)``; *manifest* is None if the inventory
+            has none.
+
+    Raises:
+        ValueError: With the worker's message if parsing failed.
+    """
+    if result[0] == "error":
+        raise ValueError(result[1])
+    _, fields, layout, handle = result
+    if layout is None:
+        return fields, None
+    return fields, Manifest._restore(layout, _collect(handle))
+
+
+def _share(arrays: list) -> tuple:
+    """Copies *arrays* into one shared-memory segment and returns a handle to it."""
+    offsets, total = [], 0
+    for array in arrays:
+        total = -(-total // _ALIGN) * _ALIGN
+        offsets.append(total)
+        total += array.nbytes
+    descriptors = [(offset, a.dtype.str, len(a)) for offset, a in zip(offsets, arrays)]
+
+    try:
+        if _TRACK_PARAMETER:
+            segment = shared_memory.SharedMemory(create=True, size=max(total, 1), track=False)
+        else:
+            segment = shared_memory.SharedMemory(create=True, size=max(total, 1))
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(segment._name, "shared_memory")
+    except OSError:
+        # No usable /dev/shm: pickle the buffers instead.
+        return ("inline", arrays)
+
+    try:
+        for offset, array in zip(offsets, arrays):
+            if array.nbytes:
+                target = np.ndarray(array.nbytes, dtype=np.uint8, buffer=segment.buf, offset=offset)
+                target[:] = array.view(np.uint8).reshape(-1)
+                del target
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+    segment.close()
+    return ("shm", segment.name, descriptors)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if _TRACK_PARAMETER:
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Attaching registers the segment with this process's resource tracker;
+    # unlink() below unregisters it again.
+    return shared_memory.SharedMemory(name=name)
+
+
+def _collect(handle: tuple) -> list:
+    """Copies the buffers referenced by *handle* out of shared memory and frees it."""
+    if handle[0] == "inline":
+        return handle[1]
+    _, name, descriptors = handle
+    segment = _attach(name)
+    try:
+        arrays = []
+        for offset, dtype, length in descriptors:
+            if length:
+                view = np.ndarray(length, dtype=dtype, buffer=segment.buf, offset=offset)
+                arrays.append(view.copy())
+                del view
+            else:
+                arrays.append(np.empty(0, dtype=dtype))
+    finally:
+        segment.close()
+        segment.unlink()
+    return arrays
@@ -0,0 +1,166 @@
+"""Incremental gzip decompression and JSON parsing for large inventory files."""
+
+import codecs
+import json
+import zlib
+from typing import Iterable, Iterator
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Consumed text is dropped from the parse buffer once it grows past this.
+_COMPACT_THRESHOLD = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def gunzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Decompresses a gzip stream chunk by chunk.
+
+    Input that does not start with the gzip magic number is passed through
+    unchanged, which covers servers that already decoded a
+    ``Content-Encoding: gzip`` response. Concatenated gzip members are
+    supported.
+
+    Raises:
+        zlib.error: If the stream is corrupt.
+    """
+    chunks = iter(chunks)
+    first = b""
+    for chunk in chunks:
+        first += chunk
+        if len(first) >= len(_GZIP_MAGIC):
+            break
+    if not first.startswith(_GZIP_MAGIC):
+        if first:
+            yield first
+        yield from chunks
+        return
+
+    inflater = zlib.decompressobj(wbits=31)
+    for chunk in _prepend(first, chunks):
+        while chunk:
+            data = inflater.decompress(chunk)
+            if data:
+                yield data
+            if not inflater.eof:
+                break
+            # Start of another gzip member.
+            chunk = inflater.unused_data
+            inflater = zlib.decompressobj(wbits=31)
+    data = inflater.flush()
+    if data:
+        yield data
+
+
+def iter_object(chunks: Iterable[bytes], stream_key: str) -> Iterator[tuple]:
+    """
+    Parses a top-level JSON object incrementally.
+
+    Yields ``("field", key, value)`` for each top-level member, except the
+    array stored under *stream_key*, whose elements are yielded one at a time
+    as ``("item", element)`` without the array ever being materialized.
+
+    Args:
+        chunks (Iterable[bytes]): UTF-8 encoded JSON text.
+        stream_key (str): Name of the member holding the array to stream.
+
+    Raises:
+        ValueError: If the text is not a JSON object.
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+    while True:
+        char = reader.peek()
+        if char == "}":
+            return
+        if char == ",":
+            reader.advance()
+            char = reader.peek()
+        if char != '"':
+            raise ValueError(f"Expected a JSON object key, found {char!r}.")
+        key = reader.value()
+        reader.expect(":")
+        if key == stream_key and reader.peek() == "[":
+            reader.advance()
+            while True:
+                char = reader.peek()
+                if char == "]":
+                    reader.advance()
+                    break
+                if char == ",":
+                    reader.advance()
+                yield ("item", reader.value())
+        else:
+            yield ("field", key, reader.value())
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+
+class _Reader:
+    """A text buffer over a chunked UTF-8 byte stream."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the buffer. Returns False at end of input."""
+        if self._eof:
+            return False
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._utf8.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input.")
+
+    def advance(self) -> None:
+        self._pos += 1
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r}, found {found!r}.")
+        self._pos += 1
+
+    def value(self):
+        """Parses and consumes one JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal that ends exactly at the buffer boundary
+            # may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
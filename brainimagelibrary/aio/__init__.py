@@ -0,0 +1,36 @@
+"""
+brainimagelibrary.aio — asyncio equivalents of the SDK lookups.
+
+Every coroutine in this namespace shares one :class:`AsyncClient` per event
+loop, i.e. a single aiohttp connection pool guarded by a concurrency
+semaphore. Callers own that pool: await :func:`close` before the loop ends.
+Requires the optional ``aiohttp`` dependency
+(``pip install brainimagelibrary[aio]``).
+
+Example:
+    >>> import asyncio
+    >>> from brainimagelibrary import aio
+    >>> async def main(bildids):
+    ...     try:
+    ...         return await asyncio.gather(*(aio.query.by_id(b) for b in bildids))
+    ...     finally:
+    ...         await aio.close()
+    >>> results = asyncio.run(main(["act-bag", "ace-and"]))
+"""
+
+from . import datecite, inventory, query, retrieve
+from ._client import AsyncClient, AsyncResponse, close, get_client, set_client
+
+__all__ = [
+    # submodules
+    "datecite",
+    "inventory",
+    "query",
+    "retrieve",
+    # client
+    "AsyncClient",
+    "AsyncResponse",
+    "get_client",
+    "set_client",
+    "close",
+]
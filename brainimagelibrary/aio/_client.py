@@ -0,0 +1,310 @@
+"""Shared asyncio HTTP client for the :mod:`brainimagelibrary.aio` namespace."""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import TYPE_CHECKING, Optional
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without the extra
+    aiohttp = None
+
+from .._api import _NOT_FOUND_MESSAGE
+from ..codec import loads
+from ..ratelimit import RateLimiter
+from ..retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from ..metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["AsyncClient", "AsyncResponse", "get_client", "set_client", "close"]
+
+# Upper bound on requests in flight from a single event loop.
+DEFAULT_CONCURRENCY = 100
+
+#: Exceptions treated as a failed request, mirroring ``RequestException``.
+REQUEST_ERRORS = (asyncio.TimeoutError,) + ((aiohttp.ClientError,) if aiohttp else ())
+
+
+class AsyncResponse:
+    """A fully read HTTP response returned by :meth:`AsyncClient.request`."""
+
+    __slots__ = ("status_code", "headers", "content", "url")
+
+    def __init__(self, status_code: int, headers: dict, content: bytes, url: str) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    def json(self):
+        """Parses the body as JSON."""
+        return loads(self.content)
+
+
+class AsyncClient:
+    """
+    An asyncio HTTP client with a single connection pool and a concurrency cap.
+
+    All coroutines in :mod:`brainimagelibrary.aio` share one
+    :class:`AsyncClient` per event loop (see :func:`get_client`). A semaphore
+    bounds the number of requests in flight, so callers can schedule thousands
+    of lookups with :func:`asyncio.gather` without exhausting sockets.
+
+    Args:
+        concurrency (int, optional): Maximum number of requests in flight.
+            Defaults to 100.
+        limit_per_host (int, optional): Maximum number of open connections per
+            host. 0 means no per-host limit. Defaults to 0.
+        timeout (float, optional): Total timeout in seconds for each request.
+            Defaults to 30.
+        retry (RetryPolicy, optional): Retry policy for idempotent requests,
+            as for :class:`brainimagelibrary.client.Client`. Defaults to
+            ``RetryPolicy()``.
+        limiter (RateLimiter, optional): Per-host limits. Only the request
+            rate applies here; concurrency is bounded by ``concurrency``.
+            Defaults to the limiter of the synchronous shared client, so
+            both APIs draw from the same per-host budget.
+        metrics (Metrics, optional): Where requests are recorded. Defaults
+            to the metrics of the synchronous shared client, if any.
+
+    Raises:
+        ImportError: If ``aiohttp`` is not installed.
+
+    Example:
+        >>> import asyncio
+        >>> from brainimagelibrary import aio
+        >>> async def main():
+        ...     async with aio.AsyncClient(concurrency=500) as client:
+        ...         aio.set_client(client)
+        ...         return await aio.query.by_id(bildid="act-bag")
+        >>> metadata = asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        limit_per_host: int = 0,
+        timeout: float = 30,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+        metrics: Optional["Metrics"] = None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "brainimagelibrary.aio requires aiohttp. "
+                "Install it with: pip install brainimagelibrary[aio]"
+            )
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+        self._limiter = limiter
+        self._metrics = metrics
+        self._semaphore = None
+        self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency, limit_per_host=self.limit_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        """
+        Sends a request and reads the full body.
+
+        Accepts the keyword arguments of :meth:`aiohttp.ClientSession.request`.
+        Idempotent requests are retried according to :attr:`retry`, and each
+        call is reported to :attr:`metrics`, if set.
+
+        Raises:
+            aiohttp.ClientError: If the request fails.
+            asyncio.TimeoutError: If the request times out.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return await self._request(method, url, None, **kwargs)
+
+        from ..metrics import RequestEvent  # deferred: only instrumented clients need it
+
+        retries = [0]
+        start = time.perf_counter()
+        try:
+            response = await self._request(method, url, retries, **kwargs)
+        except REQUEST_ERRORS as e:
+            seconds = time.perf_counter() - start
+            error = type(e).__name__
+            metrics.record(
+                RequestEvent(method, url, None, 0, seconds, retries=retries[0], error=error)
+            )
+            raise
+        seconds = time.perf_counter() - start
+        size = len(response.content)
+        metrics.record(
+            RequestEvent(method, url, response.status_code, size, seconds, retries=retries[0])
+        )
+        return response
+
+    async def _request(
+        self, method: str, url: str, retries: Optional[list], **kwargs
+    ) -> AsyncResponse:
+        """Sends a request, retrying it according to :attr:`retry`; counts retries in *retries*."""
+        policy = self.retry
+        if not policy.allows(method):
+            return await self._send(method, url, **kwargs)
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(method, url, **kwargs)
+            except REQUEST_ERRORS as e:
+                if not policy.should_retry(attempt):
+                    policy.record(url, type(e).__name__, gave_up=True)
+                    raise
+                reason, wait = type(e).__name__, policy.delay(attempt)
+            else:
+                status = response.status_code
+                if status not in policy.statuses:
+                    return response
+                if not policy.should_retry(attempt, status):
+                    policy.record(url, str(status), gave_up=True)
+                    return response
+                reason = str(status)
+                wait = policy.delay(attempt, response.headers, status)
+            policy.record(url, reason)
+            logger.info("%s %s failed (%s), retrying in %.1fs.", method, url, reason, wait)
+            await asyncio.sleep(wait)
+            attempt += 1
+            if retries is not None:
+                retries[0] += 1
+
+    @property
+    def limiter(self) -> RateLimiter:
+        if self._limiter is None:
+            from ..client import get_client as get_sync_client
+
+            return get_sync_client().limiter
+        return self._limiter
+
+    @property
+    def metrics(self) -> Optional["Metrics"]:
+        if self._metrics is None:
+            from ..client import get_client as get_sync_client
+
+            return get_sync_client().metrics
+        return self._metrics
+
+    async def _send(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        wait = self.limiter.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            async with self._get_session().request(method, url, **kwargs) as resp:
+                content = await resp.read()
+                return AsyncResponse(resp.status, dict(resp.headers), content, str(resp.url))
+
+    async def get(self, url: str, **kwargs) -> AsyncResponse:
+        """Sends a GET request. See :meth:`request`."""
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> AsyncResponse:
+        """Sends a HEAD request. Redirects are not followed unless requested."""
+        kwargs.setdefault("allow_redirects", False)
+        return await self.request("HEAD", url, **kwargs)
+
+    async def close(self) -> None:
+        """Closes the underlying connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+# aiohttp sessions are bound to the loop that created them, so keep one
+# default client per running loop.
+_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> AsyncClient:
+    """
+    Returns the :class:`AsyncClient` of the running event loop, creating it on first use.
+
+    The caller owns the default client's connection pool: await :func:`close`
+    before the loop ends, or install a client used as an ``async with``
+    context manager with :func:`set_client`. Otherwise aiohttp warns about an
+    unclosed session.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncClient()
+    return client
+
+
+def set_client(client: AsyncClient) -> Optional[AsyncClient]:
+    """
+    Replaces the :class:`AsyncClient` used by the running event loop.
+
+    Returns:
+        AsyncClient | None: The previously installed client.
+    """
+    loop = asyncio.get_running_loop()
+    previous = _clients.get(loop)
+    _clients[loop] = client
+    return previous
+
+
+async def close() -> None:
+    """
+    Closes and discards the running loop's default client.
+
+    Call it once the loop is done with :mod:`brainimagelibrary.aio`; the next
+    :func:`get_client` call creates a new client.
+
+    Example:
+        >>> import asyncio
+        >>> from brainimagelibrary import aio
+        >>> async def main():
+        ...     try:
+        ...         return await aio.query.by_id(bildid="act-bag")
+        ...     finally:
+        ...         await aio.close()
+        >>> metadata = asyncio.run(main())
+    """
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+async def _fetch(
+    url: str,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+) -> Optional[dict]:
+    """Async counterpart of :func:`brainimagelibrary._api._fetch`."""
+    try:
+        response = await get_client().get(url, params=params, headers=headers)
+        data = response.json()
+        if data.get("message") == _NOT_FOUND_MESSAGE:
+            return {}
+        return data
+    except REQUEST_ERRORS + (ValueError,) as exc:
+        logger.error("API request failed (%s): %s", url, exc)
+        return None
@@ -0,0 +1,168 @@
+"""Async equivalents of the citation lookups in :mod:`brainimagelibrary.datecite`."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from .. import datecite as _sync
+from ..doicache import normalize_doi
+from ._client import REQUEST_ERRORS, get_client
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Dataset", "dataset"]
+
+_PARSERS = {
+    "datacite": _sync._parse_datacite_citations,
+    "opencitations": None,
+    "crossref": _sync._parse_crossref_citations,
+    "semanticscholar": _sync._parse_semanticscholar_citations,
+}
+
+
+class Dataset:
+    """Async DOI operations for individual BIL datasets."""
+
+    async def exists(self, bildid: str = "act-bag") -> bool:
+        """
+        Checks whether a dataset has a DOI registered in DataCite.
+
+        Async counterpart of :meth:`brainimagelibrary.datecite.Dataset.exists`.
+
+        Args:
+            bildid (str, optional): The unique identifier for the dataset.
+                Defaults to "act-bag".
+
+        Returns:
+            bool: True if the DOI exists in DataCite, False otherwise.
+        """
+        try:
+            response = await get_client().get(_sync._datacite_url(bildid))
+            return response.status_code == 200
+        except REQUEST_ERRORS:
+            return False
+
+    async def get_citations(self, bildid: str = "act-bag") -> dict:
+        """
+        Retrieves citation metadata for a specific dataset from multiple sources.
+
+        Async counterpart of :meth:`brainimagelibrary.datecite.Dataset.get_citations`.
+        All four sources, and the Crossref title lookups for OpenCitations
+        records, are requested concurrently on the running event loop. Titles
+        are looked up in the DOI cache first (see
+        :func:`brainimagelibrary.doicache.get_doi_cache`) and the rest are
+        fetched in batches, as in the synchronous API.
+
+        Args:
+            bildid (str, optional): The unique identifier for the dataset.
+                Defaults to "act-bag".
+
+        Returns:
+            dict: A dictionary with keys ``datacite``, ``opencitations``,
+                ``crossref`` and ``semanticscholar``, each holding a list of
+                citation records or None if unavailable. Returns None for all
+                keys if the DOI does not exist.
+
+        Example:
+            >>> import asyncio
+            >>> from brainimagelibrary import aio
+            >>> result = asyncio.run(aio.datecite.dataset.get_citations(bildid="act-bag"))
+            >>> print(list(result.keys()))
+            ['datacite', 'opencitations', 'crossref', 'semanticscholar']
+        """
+        if not await self.exists(bildid=bildid):
+            return {key: None for key in _PARSERS}
+
+        results = await asyncio.gather(
+            *(_get_citations(source, bildid) for source in _PARSERS)
+        )
+        return dict(zip(_PARSERS, results))
+
+
+dataset = Dataset()
+
+
+async def _get_citations(source: str, bildid: str) -> Optional[list]:
+    """Returns the list of citing works from *source*, or None on failure."""
+    url = _sync._CITATION_URLS[source](bildid)
+    try:
+        response = await get_client().get(url)
+        if response.status_code != 200:
+            return None
+        payload = response.json()
+    except REQUEST_ERRORS + (ValueError,):
+        return None
+
+    if source != "opencitations":
+        try:
+            records = _PARSERS[source](payload)
+        except (KeyError, TypeError, AttributeError):
+            return None
+        if source == "datacite" and records:
+            pairs = [(r.get("attributes", {}).get("doi"), r["title"]) for r in records]
+            await asyncio.to_thread(_sync._remember_titles, pairs)
+        return records
+
+    if not payload:
+        return payload
+    titles = await _get_titles_for_dois(record.get("citing", "") for record in payload)
+    for record in payload:
+        citing = record.get("citing", "")
+        record["title"] = titles.get(normalize_doi(citing)) if citing else None
+    return payload
+
+
+async def _get_title_for_doi(doi: str) -> Optional[str]:
+    """Returns the title for a given DOI, via the DOI cache or Crossref. Returns None on failure."""
+    if not doi:
+        return None
+    return (await _get_titles_for_dois([doi])).get(normalize_doi(doi))
+
+
+async def _get_titles_for_dois(dois) -> dict:
+    """
+    Async counterpart of :func:`brainimagelibrary.datecite._get_titles_for_dois`.
+
+    Titles come from the DOI cache where possible; the rest are fetched from
+    Crossref in batches, concurrently, and cached. The SQLite cache is read
+    and written in a worker thread, off the event loop.
+    """
+    titles, todo = await asyncio.to_thread(_sync._cached_titles, list(dois))
+    batches, singles = _sync._crossref_title_lookups(todo)
+    results = await asyncio.gather(
+        *(_fetch_crossref_titles(batch) for batch in batches),
+        *(_fetch_crossref_title(doi) for doi in singles),
+    )
+    found = {}
+    for result in results:
+        if result is not None:
+            found.update(result)
+    await asyncio.to_thread(_sync._store_titles, titles, todo, found)
+    return titles
+
+
+async def _fetch_crossref_titles(dois: tuple) -> Optional[dict]:
+    """Async counterpart of :func:`brainimagelibrary.datecite._fetch_crossref_titles`."""
+    params = _sync._crossref_titles_params(dois)
+    try:
+        response = await get_client().get(f"{_sync.CROSSREF_API}/works", params=params)
+        if response.status_code != 200:
+            return None
+        titles = dict.fromkeys(dois)
+        titles.update(_sync._parse_crossref_titles(response.json()))
+        return titles
+    except REQUEST_ERRORS + (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+async def _fetch_crossref_title(doi: str) -> Optional[dict]:
+    """Async counterpart of :func:`brainimagelibrary.datecite._fetch_crossref_title`."""
+    try:
+        response = await get_client().get(f"{_sync.CROSSREF_API}/works/{doi}")
+        if response.status_code == 404:
+            return {doi: None}
+        if response.status_code != 200:
+            return None
+        return {doi: _sync._parse_crossref_title(response.json())}
+    except REQUEST_ERRORS + (ValueError, IndexError, KeyError, TypeError, AttributeError):
+        return None
@@ -0,0 +1,78 @@
+"""Async equivalents of :mod:`brainimagelibrary.inventory`."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from ..inventory import DatasetInventory, _parse, _url
+from ._client import REQUEST_ERRORS, get_client
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["exists", "get"]
+
+
+async def exists(bildid: Optional[str] = None) -> bool:
+    """
+    Checks whether the inventory file for a dataset exists and is accessible.
+
+    Async counterpart of :func:`brainimagelibrary.inventory.exists`.
+
+    Args:
+        bildid (str, optional): The unique identifier for the dataset. Defaults to None.
+
+    Returns:
+        bool: True if the compressed JSON file exists and is accessible, False otherwise.
+
+    Example:
+        >>> import asyncio
+        >>> from brainimagelibrary import aio
+        >>> asyncio.run(aio.inventory.exists(bildid="act-bag"))
+        True
+    """
+    if bildid is None:
+        return False
+
+    try:
+        resp = await get_client().head(_url(bildid))
+        return resp.status_code == 200
+    except REQUEST_ERRORS:
+        return False
+
+
+async def get(bildid: Optional[str] = None) -> Optional[DatasetInventory]:
+    """
+    Retrieves inventory information for a dataset by its ID from a compressed JSON (.json.gz).
+
+    Async counterpart of :func:`brainimagelibrary.inventory.get`. Once the
+    body has arrived it is decompressed and parsed in a worker thread, so a
+    large inventory does not stall the other coroutines on the loop.
+
+    Args:
+        bildid (str, optional): The unique identifier for the dataset. Defaults to None.
+
+    Returns:
+        DatasetInventory | None: Dataset inventory information if successful, otherwise None.
+
+    Example:
+        >>> import asyncio
+        >>> from brainimagelibrary import aio
+        >>> data = asyncio.run(aio.inventory.get(bildid="act-bag"))
+        >>> print(data["number_of_files"])
+        42
+    """
+    if bildid is None:
+        logger.error("bildid must be provided.")
+        return None
+
+    url = _url(bildid)
+
+    try:
+        resp = await get_client().get(url)
+        if resp.status_code != 200:
+            logger.error("Received status code %d for %s.", resp.status_code, url)
+            return None
+        return await asyncio.to_thread(_parse, resp.content, bildid)
+    except REQUEST_ERRORS as e:
+        logger.error("Error making API request: %s", e)
+        return None
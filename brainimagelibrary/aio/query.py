@@ -0,0 +1,89 @@
+"""Async equivalents of :mod:`brainimagelibrary.query`."""
+
+from typing import Optional
+
+from .._api import DOWNLOAD_BASE
+from ..query import _ENDPOINT
+from ._client import _fetch
+
+__all__ = ["by_id", "by_directory", "by_url"]
+
+
+async def by_id(
+    bildid: Optional[str] = None,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+) -> Optional[dict]:
+    """
+    Retrieves metadata for a dataset by its Brain Image Library ID.
+
+    Async counterpart of :func:`brainimagelibrary.query.by_id`.
+
+    Args:
+        bildid (str, optional): The unique identifier for the dataset. If not provided,
+            the function returns an empty dictionary.
+        params (dict, optional): Query parameters to include in the API request. Defaults to None.
+        headers (dict, optional): HTTP headers to include in the API request. Defaults to None.
+
+    Returns:
+        dict: The metadata for the dataset if the request is successful.
+        dict: An empty dictionary if the dataset ID is invalid or not found.
+        None: If the request fails or encounters an exception.
+
+    Example:
+        >>> import asyncio
+        >>> from brainimagelibrary import aio
+        >>> metadata = asyncio.run(aio.query.by_id(bildid="act-bag"))
+        >>> print("retjson" in metadata)
+        True
+    """
+    if not bildid:
+        return {}
+    return await _fetch(f"{_ENDPOINT}?bildid={bildid}", params=params, headers=headers)
+
+
+async def by_directory(
+    directory: Optional[str] = None,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+) -> Optional[dict]:
+    """
+    Retrieves metadata for a dataset by its directory path.
+
+    Async counterpart of :func:`brainimagelibrary.query.by_directory`.
+
+    Args:
+        directory (str, optional): The directory path of the dataset. If not provided,
+            the function returns an empty dictionary.
+        params (dict, optional): Query parameters to include in the API request. Defaults to None.
+        headers (dict, optional): HTTP headers to include in the API request. Defaults to None.
+
+    Returns:
+        dict: The metadata for the dataset if the request is successful.
+        dict: An empty dictionary if the directory path is invalid or not found.
+        None: If the request fails or encounters an exception.
+    """
+    if not directory:
+        return {}
+    return await _fetch(f"{_ENDPOINT}?bildirectory={directory}", params=params, headers=headers)
+
+
+async def by_url(url: Optional[str] = None) -> Optional[dict]:
+    """
+    Retrieves metadata for a dataset by its download URL.
+
+    Async counterpart of :func:`brainimagelibrary.query.by_url`.
+
+    Args:
+        url (str, optional): The download URL of the dataset. If not provided,
+            returns an empty dictionary.
+
+    Returns:
+        dict: The metadata for the dataset if the request is successful.
+        dict: An empty dictionary if the URL is not provided or no entry is found.
+        None: If the request fails or encounters an exception.
+    """
+    if not url:
+        return {}
+    directory = url.replace(DOWNLOAD_BASE, "/bil/data")
+    return await by_directory(directory=directory)
@@ -0,0 +1,271 @@
+"""Persistent on-disk HTTP response cache with conditional-GET revalidation."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+from ._api import BIL_API_BASE, DOWNLOAD_BASE
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ResponseCache"]
+
+DEFAULT_DIRECTORY = os.path.join("~", ".cache", "brainimagelibrary", "http")
+
+DEFAULT_MAX_SIZE = 2 * 1024**3  # 2 GiB
+
+DEFAULT_HOSTS = (urlsplit(BIL_API_BASE).hostname, urlsplit(DOWNLOAD_BASE).hostname)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+"""
+
+
+class ResponseCache:
+    """
+    A content-addressed disk cache for GET responses.
+
+    Bodies are stored once per SHA-256 digest under ``<directory>/objects``
+    and indexed by URL, together with the ``ETag`` and ``Last-Modified``
+    validators the server sent. When a cached URL is requested again the
+    :class:`~brainimagelibrary.client.Client` issues a conditional GET and, on
+    ``304 Not Modified``, serves the stored body instead of downloading it.
+    Entries are evicted least-recently-used first once the total body size
+    exceeds ``max_size``.
+
+    Args:
+        directory (str, optional): Cache location. Defaults to
+            ``~/.cache/brainimagelibrary/http``.
+        max_size (int, optional): Maximum total size of cached bodies in bytes.
+            Defaults to 2 GiB.
+        hosts (Iterable[str] | None, optional): Host names whose responses are
+            cached. None caches every host. Defaults to the BIL API and
+            download hosts.
+
+    Example:
+        >>> from brainimagelibrary import client
+        >>> from brainimagelibrary.cache import ResponseCache
+        >>> client.set_client(client.Client(cache=ResponseCache("/tmp/bil-cache")))
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_DIRECTORY,
+        max_size: int = DEFAULT_MAX_SIZE,
+        hosts: Optional[Iterable[str]] = DEFAULT_HOSTS,
+    ) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        self.hosts = frozenset(hosts) if hosts is not None else None
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.directory, "index.sqlite"),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.executescript(_SCHEMA)
+        self._counts = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def accepts(self, url: str) -> bool:
+        """Returns True if responses for *url* should be cached."""
+        return self.hosts is None or urlsplit(url).hostname in self.hosts
+
+    def validators(self, url: str) -> dict:
+        """
+        Returns conditional request headers for a cached *url*.
+
+        Returns:
+            dict: ``If-None-Match`` and/or ``If-Modified-Since`` headers, or an
+                empty dict when *url* is not cached.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, etag, last_modified FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._path(row[0])):
+            return {}
+        headers = {}
+        if row[1]:
+            headers["If-None-Match"] = row[1]
+        if row[2]:
+            headers["If-Modified-Since"] = row[2]
+        return headers
+
+    def load(self, url: str) -> Optional[tuple]:
+        """
+        Returns the cached body of *url* and marks it as recently used.
+
+        Returns:
+            tuple | None: ``(body, headers)`` where ``headers`` holds the stored
+                ``ETag``, ``Last-Modified`` and ``Content-Type`` values, or None
+                if *url* is not cached.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, etag, last_modified, content_type FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE entries SET accessed = ? WHERE url = ?", (time.time(), url)
+                )
+        if row is None:
+            self._count("misses")
+            return None
+        try:
+            with open(self._path(row[0]), "rb") as f:
+                body = f.read()
+        except OSError:
+            self._count("misses")
+            return None
+        self._count("hits")
+        headers = {
+            "ETag": row[1],
+            "Last-Modified": row[2],
+            "Content-Type": row[3],
+        }
+        return body, {k: v for k, v in headers.items() if v}
+
+    def store(self, url: str, body: bytes, headers) -> bool:
+        """
+        Stores *body* for *url* if the response carries a validator.
+
+        Args:
+            url (str): The request URL.
+            body (bytes): The response body.
+            headers (Mapping): The response headers.
+
+        Returns:
+            bool: True if the body was cached.
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified) or len(body) > self.max_size:
+            return False
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT digest FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    digest,
+                    len(body),
+                    etag,
+                    last_modified,
+                    headers.get("Content-Type"),
+                    time.time(),
+                ),
+            )
+            if previous is not None and previous[0] != digest:
+                self._release(previous[0])
+            self._counts["stores"] += 1
+            self._evict()
+        return True
+
+    def size(self) -> int:
+        """Returns the total size in bytes of all cached bodies."""
+        with self._lock:
+            return self._total_size()
+
+    def clear(self) -> None:
+        """Removes every cached entry."""
+        with self._lock:
+            digests = [r[0] for r in self._db.execute("SELECT DISTINCT digest FROM entries")]
+            self._db.execute("DELETE FROM entries")
+            for digest in digests:
+                self._unlink(digest)
+
+    def stats(self) -> dict:
+        """
+        Returns cache counters.
+
+        Returns:
+            dict: ``hits`` (revalidated or served from disk), ``misses``,
+                ``stores``, ``evictions``, ``entries`` and ``size`` in bytes.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            counts["entries"] = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            counts["size"] = self._total_size()
+        return counts
+
+    def close(self) -> None:
+        """Closes the index database."""
+        with self._lock:
+            self._db.close()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def _total_size(self) -> int:
+        # Bodies are shared between URLs with identical content, so count each
+        # digest once.
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+        ).fetchone()
+        return row[0]
+
+    def _evict(self) -> None:
+        total = self._total_size()
+        if total <= self.max_size:
+            return
+        rows = self._db.execute(
+            "SELECT url, digest, size FROM entries ORDER BY accessed ASC"
+        ).fetchall()
+        for url, digest, size in rows:
+            if total <= self.max_size:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            if self._release(digest):
+                total -= size
+            self._counts["evictions"] += 1
+
+    def _release(self, digest: str) -> bool:
+        """Deletes the body for *digest* if no entry references it anymore."""
+        in_use = self._db.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if in_use:
+            return False
+        self._unlink(digest)
+        return True
+
+    def _unlink(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except OSError:
+            pass
@@ -0,0 +1,463 @@
+"""Shared, pooled HTTP client used by every module in the brainimagelibrary package."""
+
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .coalesce import Coalescer, _request_key
+from .codec import loads
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Client", "get_client", "set_client", "stats"]
+
+# Matches the default ``max_workers`` of ThreadPoolExecutor so that the
+# executors used throughout the package never wait on a free connection.
+DEFAULT_POOL_MAXSIZE = min(32, (os.cpu_count() or 1) + 4)
+
+# Number of distinct hosts kept in the pool manager. The package talks to
+# the BIL API, the download server, DataCite, OpenCitations, Crossref and
+# Semantic Scholar.
+DEFAULT_POOL_CONNECTIONS = 10
+
+_CONDITIONAL_HEADERS = frozenset(("if-none-match", "if-modified-since"))
+
+# Transient failures that are worth another attempt under the retry policy.
+_RETRY_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class _Response(requests.Response):
+    """A :class:`requests.Response` whose :meth:`json` uses :func:`~brainimagelibrary.codec.loads`."""
+
+    def json(self, **kwargs):
+        if not kwargs and self.content:
+            try:
+                return loads(self.content)
+            except ValueError:
+                pass
+        # Let requests raise its own JSONDecodeError, a RequestException.
+        return super().json(**kwargs)
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that remembers connection counts of pools it evicts."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._lock = threading.Lock()
+        self._retired = {}
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def _dispose(pool):
+            self._retire(pool)
+            if dispose is not None:
+                dispose(pool)
+
+        pools.dispose_func = _dispose
+
+    def build_response(self, req, resp) -> requests.Response:
+        response = super().build_response(req, resp)
+        response.__class__ = _Response
+        return response
+
+    def _retire(self, pool) -> None:
+        with self._lock:
+            counts = self._retired.setdefault(pool.host, [0, 0])
+            counts[0] += pool.num_connections
+            counts[1] += pool.num_requests
+
+    def counts(self) -> dict:
+        """Returns ``{host: [connections_opened, requests_sent]}``."""
+        with self._lock:
+            totals = {host: list(c) for host, c in self._retired.items()}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            counts = totals.setdefault(pool.host, [0, 0])
+            counts[0] += pool.num_connections
+            counts[1] += pool.num_requests
+        return totals
+
+
+class Client:
+    """
+    A thread-safe HTTP client with keep-alive connection pooling.
+
+    Every request issued by the package goes through a single :class:`Client`
+    (see :func:`get_client`), so repeated calls to the same host reuse open
+    TCP/TLS connections instead of performing a new handshake each time.
+
+    Args:
+        pool_connections (int, optional): Number of per-host connection pools
+            to keep. Defaults to 10.
+        pool_maxsize (int, optional): Maximum number of connections kept open
+            per host. Defaults to the default ``max_workers`` of
+            :class:`concurrent.futures.ThreadPoolExecutor`.
+        pool_block (bool, optional): When True, requests wait for a free
+            connection instead of opening a temporary one when the pool is
+            exhausted. Defaults to False.
+        cache (ResponseCache, optional): Disk cache consulted for non-streamed
+            GET requests. Cached URLs are revalidated with a conditional GET
+            and served from disk on ``304 Not Modified``. Defaults to None.
+        retry (RetryPolicy, optional): How idempotent requests that fail with
+            a connection error, a timeout or a 429/5xx response are retried.
+            Defaults to ``RetryPolicy()``; pass ``RetryPolicy(attempts=1)`` to
+            disable retries.
+        limiter (RateLimiter, optional): Per-host rate and adaptive
+            concurrency limits shared by every thread using this client.
+            Defaults to ``RateLimiter()``, which limits the citation
+            services; pass ``RateLimiter({})`` to disable limiting.
+        coalesce (Coalescer, optional): Shares one response between identical
+            concurrent GET requests and reuses it for a few seconds. Defaults
+            to ``Coalescer()`` (30 s); pass ``Coalescer(ttl=0)`` to keep only
+            in-flight deduplication.
+        metrics (Metrics, optional): Records every request's status, size,
+            latency, retries and cache result; see
+            :class:`~brainimagelibrary.metrics.Metrics`. Defaults to None,
+            which skips instrumentation entirely.
+
+    Example:
+        >>> from brainimagelibrary import client
+        >>> client.set_client(client.Client(pool_maxsize=64))
+        >>> client.get_client().stats()["requests"]
+        0
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        cache: Optional["ResponseCache"] = None,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+        coalesce: Optional[Coalescer] = None,
+        metrics: Optional["Metrics"] = None,
+    ) -> None:
+        self.cache = cache
+        self.metrics = metrics
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.coalesce = coalesce if coalesce is not None else Coalescer()
+        self.session = requests.Session()
+        self._adapter = _CountingAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an HTTP request through the pooled session.
+
+        Accepts the same keyword arguments as :func:`requests.request`.
+        Idempotent requests are retried according to :attr:`retry`; the
+        response of the last attempt is returned even if its status is still
+        retryable. Identical non-streamed GET requests are shared through
+        :attr:`coalesce`. Each call is reported to :attr:`metrics`, if set.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        key = _request_key(method, url, kwargs)
+        if self.metrics is not None:
+            return self._observed(key, method, url, kwargs)
+        if key is not None:
+            return self.coalesce.call(key, lambda: self._request(method, url, **kwargs))
+        return self._request(method, url, **kwargs)
+
+    def _observed(self, key, method: str, url: str, kwargs: dict) -> requests.Response:
+        """Sends a request as :meth:`request` does and records it in :attr:`metrics`."""
+        from .metrics import RequestEvent  # deferred: only instrumented clients need it
+
+        trace = _Trace()
+        start = time.perf_counter()
+        try:
+            if key is not None:
+                response = self.coalesce.call(
+                    key, lambda: self._request(method, url, _trace=trace, **kwargs)
+                )
+            else:
+                response = self._request(method, url, _trace=trace, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.metrics.record(
+                RequestEvent(
+                    method,
+                    url,
+                    None,
+                    0,
+                    time.perf_counter() - start,
+                    retries=trace.retries,
+                    error=type(e).__name__,
+                )
+            )
+            raise
+        seconds = time.perf_counter() - start
+
+        if kwargs.get("stream"):
+            size = int(response.headers.get("Content-Length") or 0)
+        else:
+            size = len(response.content or b"")
+        if not trace.sent or getattr(response, "from_cache", False):
+            cache = "hit"
+        elif key is not None or (self.cache is not None and self.cache.accepts(url)):
+            cache = "miss"
+        else:
+            cache = None
+        self.metrics.record(
+            RequestEvent(
+                method,
+                url,
+                response.status_code,
+                size,
+                seconds,
+                retries=trace.retries,
+                cache=cache,
+            )
+        )
+        return response
+
+    def _request(
+        self, method: str, url: str, _trace: Optional["_Trace"] = None, **kwargs
+    ) -> requests.Response:
+        """Sends a request, retrying it according to :attr:`retry`."""
+        if _trace is not None:
+            _trace.sent = True
+        policy = self.retry
+        if not policy.allows(method):
+            return self._limited_send(method, url, **kwargs)
+
+        attempt = 0
+        while True:
+            try:
+                response = self._limited_send(method, url, **kwargs)
+            except _RETRY_ERRORS as e:
+                if not policy.should_retry(attempt):
+                    policy.record(url, type(e).__name__, gave_up=True)
+                    raise
+                reason, wait = type(e).__name__, policy.delay(attempt)
+            else:
+                status = response.status_code
+                if status not in policy.statuses:
+                    return response
+                if not policy.should_retry(attempt, status):
+                    policy.record(url, str(status), gave_up=True)
+                    return response
+                reason = str(status)
+                wait = policy.delay(attempt, response.headers, status)
+                response.close()
+            policy.record(url, reason)
+            logger.info(
+                "%s %s failed (%s), retrying in %.1fs (attempt %d of %d).",
+                method,
+                url,
+                reason,
+                wait,
+                attempt + 2,
+                policy.attempts,
+            )
+            time.sleep(wait)
+            attempt += 1
+            if _trace is not None:
+                _trace.retries += 1
+
+    def _limited_send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends one attempt inside a slot of :attr:`limiter`."""
+        slot = self.limiter.acquire(url)
+        status = None
+        try:
+            response = self._send(method, url, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            self.limiter.release(slot, status)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        if (
+            self.cache is not None
+            and method == "GET"
+            and not kwargs.get("stream")
+            and self.cache.accepts(url)
+        ):
+            return self._cached_get(url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def _cached_get(self, url: str, **kwargs) -> requests.Response:
+        """Sends a GET revalidated against :attr:`cache`."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        if any(h.lower() in _CONDITIONAL_HEADERS for h in headers):
+            # The caller is doing its own revalidation.
+            return self.session.request("GET", url, headers=headers, **kwargs)
+
+        key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        validators = self.cache.validators(key)
+        response = self.session.request(
+            "GET", url, headers={**headers, **validators}, **kwargs
+        )
+
+        if response.status_code == 304 and validators:
+            cached = self.cache.load(key)
+            if cached is None:
+                # The body vanished between revalidation and load.
+                return self.session.request("GET", url, headers=headers, **kwargs)
+            body, stored = cached
+            response.status_code = 200
+            response.reason = "OK"
+            response._content = body
+            for name, value in stored.items():
+                response.headers.setdefault(name, value)
+            response.headers["Content-Length"] = str(len(body))
+            response.from_cache = True
+        elif response.status_code == 200:
+            self.cache.store(key, response.content, response.headers)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Sends a GET request. See :meth:`request`."""
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """Sends a HEAD request. Redirects are not followed unless requested."""
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def stats(self) -> dict:
+        """
+        Reports how many connections were opened versus reused.
+
+        Returns:
+            dict: A dictionary with the following keys:
+
+                - ``connections`` (int): Connections opened across all hosts.
+                - ``requests`` (int): Requests sent across all hosts.
+                - ``reused`` (int): Requests served on an existing connection.
+                - ``hosts`` (dict): The same three counts keyed by host name.
+                - ``retries`` (dict): :meth:`RetryPolicy.stats`.
+                - ``limits`` (dict): :meth:`RateLimiter.stats`.
+                - ``coalesce`` (dict): :meth:`Coalescer.stats`.
+                - ``cache`` (dict): :meth:`ResponseCache.stats`, only present
+                  when a cache is configured.
+                - ``metrics`` (dict): :meth:`Metrics.snapshot`, only present
+                  when metrics are configured.
+        """
+        hosts = {}
+        for host, (connections, sent) in self._adapter.counts().items():
+            hosts[host] = {
+                "connections": connections,
+                "requests": sent,
+                "reused": max(sent - connections, 0),
+            }
+        stats = {
+            "connections": sum(h["connections"] for h in hosts.values()),
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "reused": sum(h["reused"] for h in hosts.values()),
+            "hosts": hosts,
+            "retries": self.retry.stats(),
+            "limits": self.limiter.stats(),
+            "coalesce": self.coalesce.stats(),
+        }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.metrics is not None:
+            stats["metrics"] = self.metrics.snapshot()
+        return stats
+
+    def close(self) -> None:
+        """Closes every pooled connection and the cache index, if any."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _Trace:
+    """What happened to one instrumented request below the coalescer."""
+
+    __slots__ = ("sent", "retries")
+
+    def __init__(self) -> None:
+        self.sent = False
+        self.retries = 0
+
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Client:
+    """
+    Returns the process-wide :class:`Client`, creating it on first use.
+
+    Example:
+        >>> from brainimagelibrary.client import get_client
+        >>> response = get_client().get("https://api.brainimagelibrary.org/retrieve?bildid=act-bag")
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Client()
+    return _client
+
+
+def set_client(client: Optional[Client]) -> Optional[Client]:
+    """
+    Replaces the process-wide :class:`Client`.
+
+    Useful for tuning pool limits or for substituting a fake client in tests.
+    Passing None discards the current client; a default one is created on the
+    next call to :func:`get_client`.
+
+    Args:
+        client (Client | None): The client every module should use.
+
+    Returns:
+        Client | None: The previously installed client.
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
+
+
+def stats() -> dict:
+    """
+    Returns :meth:`Client.stats` of the shared client.
+
+    Includes the request metrics under ``"metrics"`` when the shared client
+    was created with a :class:`~brainimagelibrary.metrics.Metrics`.
+
+    Example:
+        >>> import brainimagelibrary
+        >>> brainimagelibrary.stats()["requests"]  # doctest: +SKIP
+        42
+    """
+    return get_client().stats()
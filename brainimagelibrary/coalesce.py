@@ -0,0 +1,182 @@
+"""In-flight request deduplication with a short-lived in-memory response cache."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Coalescer"]
+
+DEFAULT_TTL = 30.0
+
+DEFAULT_MAX_ENTRIES = 1024
+
+# Larger bodies (e.g. inventories) are shared with concurrent waiters but not
+# kept in memory afterwards.
+DEFAULT_MAX_BODY = 1024 * 1024
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Coalescer:
+    """
+    Shares the result of identical concurrent requests and remembers it briefly.
+
+    When several threads ask for the same key at once, only the first calls
+    the fetch function; the others wait and receive a copy of its response
+    (or its exception). Responses are then kept for ``ttl`` seconds, so
+    back-to-back lookups of the same URL, such as checking that a DOI exists
+    and then fetching its metadata, cost one request.
+
+    Only 2xx and 3xx responses are kept, and only when the body is at most
+    ``max_body`` bytes; a 404 or other error is shared with the requests in
+    flight at the time but not remembered, so a dataset that appears a
+    moment later is seen on the next call. Exceptions are never cached.
+
+    Args:
+        ttl (float, optional): Seconds a response is reused. 0 keeps only
+            the in-flight deduplication. Defaults to 30.
+        max_entries (int, optional): Responses kept, least recently used
+            first out. Defaults to 1024.
+        max_body (int, optional): Largest body in bytes that is kept.
+            Defaults to 1 MiB.
+
+    Example:
+        >>> from brainimagelibrary import client
+        >>> from brainimagelibrary.coalesce import Coalescer
+        >>> client.set_client(client.Client(coalesce=Coalescer(ttl=300)))
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_body: int = DEFAULT_MAX_BODY,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._counts = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def call(self, key: Hashable, fetch: Callable):
+        """
+        Returns the response for *key*, calling *fetch* only if needed.
+
+        Raises:
+            Exception: Whatever *fetch* raised, in the caller and in every
+                thread that was waiting on the same key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counts["hits"] += 1
+                    return _copy(entry[1])
+                del self._entries[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counts["misses"] += 1
+            else:
+                self._counts["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy(flight.result)
+
+        try:
+            response = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.result = response
+            if self._keep(response):
+                with self._lock:
+                    self._entries[key] = (time.monotonic() + self.ttl, response)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            return _copy(response)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _keep(self, response) -> bool:
+        if self.ttl <= 0:
+            return False
+        status = getattr(response, "status_code", None)
+        if status is None or not 200 <= status < 400:
+            return False
+        return len(response.content or b"") <= self.max_body
+
+    def clear(self) -> None:
+        """Forgets every remembered response."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns coalescing counters.
+
+        Returns:
+            dict: ``hits`` (served from memory), ``misses`` (sent to the
+                network), ``coalesced`` (waited on an identical request in
+                flight) and ``entries`` currently remembered.
+        """
+        with self._lock:
+            return {**self._counts, "entries": len(self._entries)}
+
+
+def _copy(response):
+    """
+    Returns a shallow copy of *response* that keeps every attribute.
+
+    The headers are copied too, so one caller editing them does not change
+    what the others see.
+    """
+    clone = object.__new__(type(response))
+    clone.__dict__.update(response.__dict__)
+    headers = clone.__dict__.get("headers")
+    if headers is not None:
+        clone.headers = headers.copy()
+    return clone
+
+
+def _request_key(method: str, url: str, kwargs: dict) -> Optional[tuple]:
+    """
+    Returns a key identifying a request for :meth:`Coalescer.call`.
+
+    Returns None for requests that must not be shared: anything but a
+    non-streamed GET, or one carrying a body, cookies or credentials.
+    """
+    if method != "GET" or kwargs.get("stream"):
+        return None
+    if set(kwargs) - {"params", "headers", "timeout", "allow_redirects"}:
+        return None
+    params = kwargs.get("params")
+    if isinstance(params, dict):
+        params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+    elif params is not None and not isinstance(params, (str, bytes, tuple)):
+        return None
+    headers = kwargs.get("headers") or {}
+    headers = tuple(sorted((str(k).lower(), str(v)) for k, v in headers.items()))
+    return url, params, headers, kwargs.get("allow_redirects", True)
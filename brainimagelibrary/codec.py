@@ -0,0 +1,186 @@
+"""JSON decoding through the fastest installed backend."""
+
+import json
+import logging
+import threading
+from typing import Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - exercised only without the extra
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "BACKENDS",
+    "available_backends",
+    "get_backend",
+    "set_backend",
+    "loads",
+    "decode",
+]
+
+# In order of preference for untyped decoding. orjson builds dicts and lists
+# fastest; msgspec is close behind and is the only one that decodes straight
+# into typed structs.
+BACKENDS = ("orjson", "msgspec", "json")
+
+_backend: Optional[str] = None
+_backend_lock = threading.Lock()
+
+
+def available_backends() -> list:
+    """Returns the names in :data:`BACKENDS` that can be used in this environment."""
+    installed = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def get_backend() -> str:
+    """
+    Returns the name of the backend used by :func:`loads`.
+
+    Unless one was chosen with :func:`set_backend`, this is the first entry of
+    :data:`BACKENDS` that is installed.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = available_backends()[0]
+    return _backend
+
+
+def set_backend(name: Optional[str]) -> Optional[str]:
+    """
+    Selects the backend used by :func:`loads`.
+
+    Args:
+        name (str | None): One of :data:`BACKENDS`, or None to pick the
+            fastest installed backend again.
+
+    Returns:
+        str | None: The previously selected backend.
+
+    Raises:
+        ValueError: If *name* is not one of :data:`BACKENDS`.
+        ImportError: If the package behind *name* is not installed.
+
+    Example:
+        >>> from brainimagelibrary import codec
+        >>> previous = codec.set_backend("json")
+        >>> codec.get_backend()
+        'json'
+    """
+    global _backend
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got '{name}'.")
+        if name not in available_backends():
+            raise ImportError(
+                f"The {name} JSON backend is not installed. "
+                "Install it with: pip install brainimagelibrary[fastjson]"
+            )
+    with _backend_lock:
+        previous, _backend = _backend, name
+    return previous
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]):
+    """
+    Parses a JSON document with the selected backend.
+
+    Documents the fast backends reject but :mod:`json` accepts, such as
+    ``NaN`` literals, integers wider than 64 bits or non-UTF-8 text, are
+    parsed again with :mod:`json`, so the result never depends on which
+    backend is installed.
+
+    Args:
+        data (bytes | str): The JSON document.
+
+    Returns:
+        The decoded object: dicts, lists, strings, numbers, bools and None.
+
+    Raises:
+        ValueError: If *data* is not valid JSON. :class:`json.JSONDecodeError`
+            is raised whatever the backend.
+
+    Example:
+        >>> from brainimagelibrary import codec
+        >>> codec.loads(b'{"retjson": []}')
+        {'retjson': []}
+    """
+    backend = get_backend()
+    if backend != "json":
+        try:
+            if backend == "orjson":
+                return orjson.loads(data)
+            return msgspec.json.decode(data)
+        except ValueError:
+            pass
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def decode(data: Union[bytes, str], type: type):
+    """
+    Parses a JSON document into *type*, validating it on the way.
+
+    The SDK's own functions return plain dicts, as :func:`loads` produces;
+    this is for callers who want a payload checked against a schema of their
+    own and turned into compact structs.
+
+    Args:
+        data (bytes | str): The JSON document.
+        type (type): A :class:`msgspec.Struct` subclass, or any type
+            msgspec understands. Fields the schema does not list are skipped.
+
+    Returns:
+        An instance of *type*.
+
+    Raises:
+        ImportError: If msgspec is not installed.
+        ValueError: If *data* is not valid JSON or does not match *type*.
+            The message names the offending field, e.g.
+            ``Expected `int`, got `str` - at `$.manifest[3].size```.
+
+    Example:
+        >>> import msgspec
+        >>> from brainimagelibrary import codec
+        >>> class Entry(msgspec.Struct):
+        ...     download_url: str
+        ...     size: int
+        >>> class Inventory(msgspec.Struct):
+        ...     manifest: list[Entry]
+        >>> inventory = codec.decode(payload, Inventory)  # doctest: +SKIP
+        >>> inventory.manifest[0].size  # doctest: +SKIP
+        1048576
+    """
+    if msgspec is None:
+        raise ImportError(
+            "Typed decoding requires msgspec. "
+            "Install it with: pip install brainimagelibrary[fastjson]"
+        )
+    try:
+        return _decoder(type).decode(data)
+    except msgspec.ValidationError as e:
+        raise ValueError(f"Document does not match {getattr(type, '__name__', type)}: {e}") from None
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Document is not valid JSON: {e}") from None
+
+
+_decoders = {}
+
+
+def _decoder(type):
+    decoder = _decoders.get(type)
+    if decoder is None:
+        decoder = _decoders.setdefault(type, msgspec.json.Decoder(type))
+    return decoder
+
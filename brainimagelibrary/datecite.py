@@ -1,10 +1,21 @@
+import csv
+import functools
 import logging
+import os
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
+from tqdm import tqdm
+
+from ._api import _batch, _prefetch_pages
+from .client import get_client
+from .doicache import get_doi_cache, normalize_doi
 from .retrieve import by_url as _retrieve_by_url
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 __all__ = [
@@ -15,12 +26,31 @@ __all__ = [
     "get_datacite_metadata",
     "get_datacite_citations",
     "get_number_of_citations",
+    "citation_report",
+    "iter_citations",
 ]
 
 MAX_WORKERS = 8
 
+CITATION_SOURCES = ("datacite", "opencitations", "crossref", "semanticscholar")
+
+# DataCite's maximum page size for the /dois listing.
+DATACITE_PAGE_SIZE = 1000
+
+# DOIs per Crossref ``filter=doi:...`` lookup; the URL stays well under 8 KB.
+CROSSREF_BATCH_SIZE = 50
+
+# Largest page sizes Crossref (``rows``) and Semantic Scholar (``limit``) accept.
+CROSSREF_PAGE_SIZE = 1000
+SEMANTICSCHOLAR_PAGE_SIZE = 1000
+
 DOI_PREFIX = "10.35077"
 
+DATACITE_API = "https://api.datacite.org"
+OPENCITATIONS_API = "https://opencitations.net/index/coci/api/v1"
+CROSSREF_API = "https://api.crossref.org"
+SEMANTICSCHOLAR_API = "https://api.semanticscholar.org/graph/v1"
+
 
 class Dataset:
     """DOI operations for individual BIL datasets."""
@@ -372,11 +402,244 @@ def get_number_of_citations(bildid: str = "act-bag") -> dict:
     return dataset.get_number_of_citations(bildid=bildid)
 
 
+def iter_citations(bildid: str = "act-bag", source: str = "crossref") -> Iterator[dict]:
+    """
+    Yields every citing work of a dataset from Crossref or Semantic Scholar.
+
+    Follows Crossref's deep-paging cursor (``cursor=*``) or Semantic
+    Scholar's ``offset``/``next`` links with the largest page size each
+    service allows, and requests the next page while the caller works
+    through the current one. Records carry the same normalized ``title``
+    key as :func:`get_datacite_citations`.
+
+    Args:
+        bildid (str, optional): The unique identifier for the dataset.
+            Defaults to "act-bag".
+        source (str, optional): ``"crossref"`` or ``"semanticscholar"``.
+            Defaults to "crossref".
+
+    Yields:
+        dict: One citing work per record.
+
+    Raises:
+        ValueError: If *source* is not paginated, or a page is malformed.
+        requests.exceptions.RequestException: If a page cannot be retrieved.
+
+    Example:
+        >>> from brainimagelibrary import datecite
+        >>> for work in datecite.iter_citations("act-bag", source="semanticscholar"):  # doctest: +SKIP
+        ...     print(work["title"])
+    """
+    if source not in _CITATION_PAGES:
+        raise ValueError(f"source must be one of {sorted(_CITATION_PAGES)}, not {source!r}")
+    fetch_page, start = _CITATION_PAGES[source]
+    for page in _prefetch_pages(functools.partial(fetch_page, bildid), start):
+        yield from page
+
+
+def citation_report(
+    bildids: Optional[Iterable[str]] = None,
+    path: Optional[str] = None,
+    sources: Iterable[str] = CITATION_SOURCES,
+    max_workers: int = MAX_WORKERS,
+) -> Optional["pd.DataFrame"]:
+    """
+    Builds a table of citation counts for every BIL dataset with a DOI.
+
+    DataCite counts for all ``10.35077`` DOIs are read from the paginated
+    ``/dois`` listing, 1000 records per request, which also tells which
+    datasets have a DOI at all. The remaining sources are then queried for
+    those datasets concurrently; requests are paced per service by the
+    shared client's rate limiter.
+
+    When ``path`` is given, each row is appended to that TSV file as soon as
+    all of its sources have answered. Calling the function again with the
+    same ``path`` skips the datasets already in the file, so an interrupted
+    report resumes where it stopped. A lookup that failed leaves its cell
+    blank, so on resume the blank cells of datasets with a DOI are queried
+    again and the completed row is appended; the last row of a dataset wins.
+
+    Args:
+        bildids (Iterable[str], optional): Datasets to include. Datasets
+            without a DOI get empty counts. Defaults to every dataset with a
+            DOI in DataCite.
+        path (str, optional): TSV file to write rows to and resume from.
+            Defaults to None (nothing is written).
+        sources (Iterable[str], optional): Sources to include, any of
+            ``'datacite'``, ``'opencitations'``, ``'crossref'`` and
+            ``'semanticscholar'``. Defaults to all four.
+        max_workers (int, optional): Datasets queried concurrently.
+            Defaults to 8.
+
+    Returns:
+        pd.DataFrame | None: Citation counts indexed by ``bildid``, one
+            nullable integer column per source, or None if the DataCite
+            listing or an existing ``path`` cannot be read.
+
+    Example:
+        >>> from brainimagelibrary import datecite
+        >>> report = datecite.citation_report(path="citations.tsv")
+        >>> report.sort_values("datacite", ascending=False).head()  # doctest: +SKIP
+    """
+    sources = list(dict.fromkeys(sources))
+    unknown = set(sources) - set(CITATION_SOURCES)
+    if unknown:
+        logger.error("sources must be among %s, got %s.", CITATION_SOURCES, sorted(unknown))
+        return None
+
+    datacite_counts = _get_datacite_citation_counts()
+    if datacite_counts is None:
+        return None
+
+    if bildids is None:
+        wanted = sorted(datacite_counts)
+    else:
+        wanted = list(dict.fromkeys(b for b in bildids if b))
+
+    import pandas as pd  # deferred: most callers never build a report
+
+    columns = ["bildid"] + sources
+    previous = _load_citation_report(path, columns) if path else pd.DataFrame(columns=columns)
+    if previous is None:
+        return None
+    previous = previous.drop_duplicates(subset="bildid", keep="last")
+    queried = [source for source in sources if source != "datacite"]
+    # A blank count of a dataset with a DOI means the lookup failed; re-query it.
+    blank = previous["bildid"].isin(datacite_counts) & previous[queried].isna().any(axis=1)
+    known = {
+        row["bildid"]: {k: v for k, v in row.items() if k in queried and not pd.isna(v)}
+        for row in previous[blank].to_dict("records")
+    }
+    done = set(previous.loc[~blank, "bildid"])
+    todo = [bildid for bildid in wanted if bildid not in done]
+
+    counters = {
+        "opencitations": _get_number_of_citations_from_opencitations,
+        "crossref": _get_number_of_citations_from_crossref,
+        "semanticscholar": _get_number_of_citations_from_semanticscholar,
+    }
+
+    def _row(bildid):
+        row = {"bildid": bildid}
+        has_doi = bildid in datacite_counts
+        resumed = known.get(bildid, {})
+        for source in sources:
+            if source == "datacite":
+                row[source] = datacite_counts.get(bildid)
+            elif source in resumed:
+                row[source] = int(resumed[source])
+            else:
+                row[source] = counters[source](bildid=bildid) if has_doi else None
+        return row
+
+    rows = []
+    writer = _CitationReportWriter(path, columns) if path else None
+    try:
+        results = _batch(_row, todo, max_workers=max_workers, stream=True)
+        for bildid, row in tqdm(results, total=len(todo), desc="Citations"):
+            if isinstance(row, Exception):
+                continue
+            rows.append(row)
+            if writer is not None:
+                writer.write(row)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    frames = [frame for frame in (previous, pd.DataFrame(rows, columns=columns)) if not frame.empty]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    df = df.drop_duplicates(subset="bildid", keep="last")
+    order = {bildid: i for i, bildid in enumerate(wanted)}
+    df = df[df["bildid"].isin(order)]
+    df = df.sort_values("bildid", key=lambda col: col.map(order)).set_index("bildid")
+    return df.astype({source: "Int64" for source in sources})
+
+
+def _iter_datacite_dois(prefix: str = DOI_PREFIX) -> Iterator[dict]:
+    """
+    Yields every DataCite DOI record under *prefix*, following cursor pages.
+
+    Raises:
+        requests.exceptions.RequestException: If a page cannot be retrieved.
+        ValueError: If a page is not valid JSON.
+    """
+    url = f"{DATACITE_API}/dois"
+    params = {
+        "prefix": prefix,
+        "page[size]": DATACITE_PAGE_SIZE,
+        "page[cursor]": 1,
+        "fields[dois]": "doi,citationCount",
+    }
+    while url:
+        response = get_client().get(url, params=params, timeout=60)
+        response.raise_for_status()
+        payload = response.json()
+        yield from payload.get("data", [])
+        url = payload.get("links", {}).get("next")
+        params = None  # the next link carries the query string
+
+
+def _get_datacite_citation_counts(prefix: str = DOI_PREFIX) -> Optional[dict]:
+    """Returns ``{bildid: citationCount}`` for every DOI under *prefix*, or None on failure."""
+    counts = {}
+    try:
+        for record in _iter_datacite_dois(prefix):
+            doi = record.get("attributes", {}).get("doi") or record.get("id", "")
+            bildid = doi.split("/", 1)[-1].lower()
+            if bildid:
+                counts[bildid] = record.get("attributes", {}).get("citationCount")
+    except (ValueError, requests.exceptions.RequestException) as e:
+        logger.error("Could not list DataCite DOIs for prefix %s: %s", prefix, e)
+        return None
+    return counts
+
+
+def _load_citation_report(path: str, columns: list) -> Optional["pd.DataFrame"]:
+    """Reads the rows already written to *path*, or an empty frame if it does not exist."""
+    import pandas as pd
+
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    try:
+        df = pd.read_csv(path, sep="\t", dtype={"bildid": str})
+    except (OSError, ValueError) as e:
+        logger.error("Could not read citation report '%s': %s", path, e)
+        return None
+    if list(df.columns) != columns:
+        logger.error(
+            "Citation report '%s' has columns %s, expected %s; use another path.",
+            path,
+            list(df.columns),
+            columns,
+        )
+        return None
+    return df
+
+
+class _CitationReportWriter:
+    """Appends citation report rows to a TSV file, flushing after each row."""
+
+    def __init__(self, path: str, columns: list) -> None:
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, delimiter="\t")
+        if new:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def write(self, row: dict) -> None:
+        self._writer.writerow({k: ("" if v is None else v) for k, v in row.items()})
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
 def _doi_exists(bildid="act-bag"):
     """Returns True if the DOI exists in DataCite, False otherwise."""
-    url = f"https://api.datacite.org/dois/{DOI_PREFIX}/{bildid}"
+    url = _datacite_url(bildid)
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(url, timeout=30)
         return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
@@ -394,9 +657,9 @@ def _get_datacite_metadata(bildid="act-bag"):
         dict: A dictionary containing the dataset's metadata if the request is successful.
         None: If the request fails or the API returns an error.
     """
-    url = f"https://api.datacite.org/dois/{DOI_PREFIX}/{bildid}"
+    url = _datacite_url(bildid)
 
-    response = requests.get(url)
+    response = get_client().get(url)
 
     if response.status_code == 200:
         return response.json()
@@ -406,10 +669,10 @@ def _get_datacite_metadata(bildid="act-bag"):
 
 def _get_number_of_citations_from_opencitations(bildid="act-bag"):
     doi = f"{DOI_PREFIX}/{bildid}"
-    url = f"https://opencitations.net/index/coci/api/v1/citation-count/{doi}"
+    url = f"{OPENCITATIONS_API}/citation-count/{doi}"
 
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(url, timeout=30)
         if response.status_code != 200:
             return None
         data = response.json()
@@ -433,10 +696,10 @@ def _get_number_of_citations_from_datacite(bildid="act-bag"):
 
 def _get_number_of_citations_from_crossref(bildid="act-bag"):
     doi = f"{DOI_PREFIX}/{bildid}"
-    url = f"https://api.crossref.org/works/{doi}"
+    url = f"{CROSSREF_API}/works/{doi}"
 
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(url, timeout=30)
         if response.status_code != 200:
             return None
         data = response.json()
@@ -448,10 +711,10 @@ def _get_number_of_citations_from_crossref(bildid="act-bag"):
 
 def _get_number_of_citations_from_semanticscholar(bildid="act-bag"):
     doi = f"{DOI_PREFIX}/{bildid}"
-    url = f"https://api.semanticscholar.org/graph/v1/paper/DOI:{doi}?fields=citationCount"
+    url = f"{SEMANTICSCHOLAR_API}/paper/DOI:{doi}?fields=citationCount"
 
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(url, timeout=30)
         if response.status_code != 200:
             return None
         data = response.json()
@@ -462,32 +725,140 @@ def _get_number_of_citations_from_semanticscholar(bildid="act-bag"):
 
 
 def _get_title_for_doi(doi):
-    """Fetches the title for a given DOI via the Crossref API. Returns None on failure."""
-    url = f"https://api.crossref.org/works/{doi}"
+    """Returns the title for a given DOI, via the DOI cache or Crossref. Returns None on failure."""
+    if not doi:
+        return None
+    return _get_titles_for_dois([doi]).get(normalize_doi(doi))
+
+
+def _get_titles_for_dois(dois):
+    """
+    Returns ``{doi: title}`` for *dois*, keyed by normalized DOI.
+
+    Titles come from the DOI cache where possible; the rest are fetched from
+    Crossref in batches of :data:`CROSSREF_BATCH_SIZE` and cached, including
+    DOIs Crossref does not know. DOIs whose lookup failed map to None and are
+    not cached.
+    """
+    titles, todo = _cached_titles(dois)
+    batches, singles = _crossref_title_lookups(todo)
+    lookups = [(_fetch_crossref_titles, dois) for dois in batches]
+    lookups += [(_fetch_crossref_title, doi) for doi in singles]
+    found = {}
+    for _, result in _batch(lambda lookup: lookup[0](lookup[1]), lookups, max_workers=MAX_WORKERS):
+        if isinstance(result, dict):
+            found.update(result)
+    _store_titles(titles, todo, found)
+    return titles
+
+
+def _cached_titles(dois):
+    """
+    Looks *dois* up in the DOI cache.
+
+    Returns:
+        tuple: ``({doi: title}, todo)``, the cached titles keyed by normalized
+            DOI and the normalized DOIs still to fetch.
+    """
+    keys = list(dict.fromkeys(normalize_doi(doi) for doi in dois if doi))
+    cache = get_doi_cache()
+    cached = cache.get_many(keys) if cache is not None else {}
+    titles = {doi: (record or {}).get("title") for doi, record in cached.items()}
+    return titles, [doi for doi in keys if doi not in cached]
+
+
+def _crossref_title_lookups(dois):
+    """
+    Splits *dois* into Crossref title lookups.
+
+    Returns:
+        tuple: ``(batches, singles)``, tuples of up to
+            :data:`CROSSREF_BATCH_SIZE` DOIs to fetch with one filter query
+            each, and the DOIs to fetch one by one.
+    """
+    # The filter syntax separates DOIs with commas, so the rare DOI that
+    # contains one is looked up on its own.
+    plain = [doi for doi in dois if "," not in doi]
+    batches = [
+        tuple(plain[i : i + CROSSREF_BATCH_SIZE]) for i in range(0, len(plain), CROSSREF_BATCH_SIZE)
+    ]
+    return batches, [doi for doi in dois if "," in doi]
+
+
+def _store_titles(titles, todo, found):
+    """Caches the *found* titles and fills in *titles* for every DOI in *todo*."""
+    cache = get_doi_cache()
+    if cache is not None and found:
+        cache.put_many(
+            {doi: {"title": title} if title is not None else None for doi, title in found.items()}
+        )
+    for doi in todo:
+        titles[doi] = found.get(doi)
+
+
+def _crossref_titles_params(dois):
+    """Returns the ``/works`` query parameters that fetch the titles of *dois*."""
+    return {
+        "filter": ",".join(f"doi:{doi}" for doi in dois),
+        "rows": len(dois),
+        "select": "DOI,title",
+    }
+
+
+def _fetch_crossref_titles(dois):
+    """
+    Fetches the titles of up to one batch of DOIs in a single Crossref request.
+
+    Returns:
+        dict | None: ``{doi: title}`` for every DOI in *dois*, with None for
+            DOIs Crossref does not know, or None if the request failed.
+    """
+    params = _crossref_titles_params(dois)
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(f"{CROSSREF_API}/works", params=params, timeout=30)
         if response.status_code != 200:
             return None
-        titles = response.json().get("message", {}).get("title", [])
-        return titles[0] if titles else None
-    except (IndexError, KeyError, TypeError, requests.exceptions.RequestException):
+        titles = dict.fromkeys(dois)
+        titles.update(_parse_crossref_titles(response.json()))
+        return titles
+    except (KeyError, TypeError, ValueError, requests.exceptions.RequestException):
         return None
 
 
+def _fetch_crossref_title(doi):
+    """Like :func:`_fetch_crossref_titles`, for one DOI via ``/works/{doi}``."""
+    url = f"{CROSSREF_API}/works/{doi}"
+    try:
+        response = get_client().get(url, timeout=30)
+        if response.status_code == 404:
+            return {doi: None}
+        if response.status_code != 200:
+            return None
+        return {doi: _parse_crossref_title(response.json())}
+    except (IndexError, KeyError, TypeError, ValueError, requests.exceptions.RequestException):
+        return None
+
+
+def _remember_titles(pairs):
+    """Stores ``(doi, title)`` pairs seen in citation listings in the DOI cache."""
+    cache = get_doi_cache()
+    if cache is None:
+        return
+    records = {doi: {"title": title} for doi, title in pairs if doi and title}
+    if records:
+        cache.put_many(records)
+
+
 def _get_citations_from_datacite(bildid="act-bag"):
     """Returns list of citing works from DataCite, or None on failure."""
-    doi = f"{DOI_PREFIX}/{bildid}"
-    url = f"https://api.datacite.org/dois/{doi}/citations"
+    url = _CITATION_URLS["datacite"](bildid)
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(url, timeout=30)
         if response.status_code != 200:
             return None
-        records = response.json().get("data", None)
-        if records is None:
-            return None
-        for record in records:
-            titles = record.get("attributes", {}).get("titles", [])
-            record["title"] = titles[0]["title"] if titles else None
+        records = _parse_datacite_citations(response.json())
+        if records:
+            _remember_titles((r.get("attributes", {}).get("doi"), r["title"]) for r in records)
         return records
     except requests.exceptions.RequestException:
         return None
@@ -495,22 +866,18 @@ def _get_citations_from_datacite(bildid="act-bag"):
 
 def _get_citations_from_opencitations(bildid="act-bag"):
     """Returns list of citing works from OpenCitations, or None on failure."""
-    doi = f"{DOI_PREFIX}/{bildid}"
-    url = f"https://opencitations.net/index/coci/api/v1/citations/{doi}"
+    url = _CITATION_URLS["opencitations"](bildid)
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(url, timeout=30)
         if response.status_code != 200:
             return None
         records = response.json()
         if not records:
             return records
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            futures = {
-                executor.submit(_get_title_for_doi, record.get("citing", "")): i
-                for i, record in enumerate(records)
-            }
-            for future in as_completed(futures):
-                records[futures[future]]["title"] = future.result()
+        titles = _get_titles_for_dois(record.get("citing", "") for record in records)
+        for record in records:
+            citing = record.get("citing", "")
+            record["title"] = titles.get(normalize_doi(citing)) if citing else None
         return records
     except requests.exceptions.RequestException:
         return None
@@ -518,36 +885,124 @@ def _get_citations_from_opencitations(bildid="act-bag"):
 
 def _get_citations_from_crossref(bildid="act-bag"):
     """Returns list of citing works from Crossref, or None on failure."""
-    doi = f"{DOI_PREFIX}/{bildid}"
-    url = f"https://api.crossref.org/works?filter=cites:{doi}"
     try:
-        response = requests.get(url, timeout=30)
-        if response.status_code != 200:
-            return None
-        items = response.json().get("message", {}).get("items", None)
-        if items is None:
-            return None
-        for item in items:
-            titles = item.get("title", [])
-            item["title"] = titles[0] if titles else None
-        return items
-    except (KeyError, TypeError, requests.exceptions.RequestException):
+        return list(iter_citations(bildid=bildid, source="crossref"))
+    except (KeyError, TypeError, ValueError, requests.exceptions.RequestException):
         return None
 
 
 def _get_citations_from_semanticscholar(bildid="act-bag"):
     """Returns list of citing works from Semantic Scholar, or None on failure."""
-    doi = f"{DOI_PREFIX}/{bildid}"
-    url = f"https://api.semanticscholar.org/graph/v1/paper/DOI:{doi}/citations?fields=title,authors,year,externalIds"
     try:
-        response = requests.get(url, timeout=30)
-        if response.status_code != 200:
-            return None
-        records = response.json().get("data", None)
-        if records is None:
-            return None
-        for record in records:
-            record["title"] = record.get("citingPaper", {}).get("title")
-        return records
-    except (KeyError, TypeError, requests.exceptions.RequestException):
+        return list(iter_citations(bildid=bildid, source="semanticscholar"))
+    except (KeyError, TypeError, ValueError, requests.exceptions.RequestException):
+        return None
+
+
+def _crossref_citation_page(bildid, cursor):
+    """Returns one page of Crossref citing works and the cursor of the next, if any."""
+    params = {
+        "filter": f"cites:{DOI_PREFIX}/{bildid}",
+        "rows": CROSSREF_PAGE_SIZE,
+        "cursor": cursor,
+    }
+    response = get_client().get(f"{CROSSREF_API}/works", params=params, timeout=60)
+    response.raise_for_status()
+    payload = response.json()
+    items = _parse_crossref_citations(payload)
+    if items is None:
+        raise ValueError(f"Crossref returned no items for {bildid}")
+    _remember_titles((item.get("DOI"), item["title"]) for item in items)
+    next_cursor = payload["message"].get("next-cursor")
+    if len(items) < CROSSREF_PAGE_SIZE or not next_cursor:
+        return items, None
+    return items, next_cursor
+
+
+def _semanticscholar_citation_page(bildid, offset):
+    """Returns one page of Semantic Scholar citing works and the next offset, if any."""
+    params = {
+        "fields": "title,authors,year,externalIds",
+        "offset": offset,
+        "limit": SEMANTICSCHOLAR_PAGE_SIZE,
+    }
+    url = f"{SEMANTICSCHOLAR_API}/paper/DOI:{DOI_PREFIX}/{bildid}/citations"
+    response = get_client().get(url, params=params, timeout=60)
+    response.raise_for_status()
+    payload = response.json()
+    records = _parse_semanticscholar_citations(payload)
+    if records is None:
+        raise ValueError(f"Semantic Scholar returned no data for {bildid}")
+    _remember_titles(
+        (((r.get("citingPaper") or {}).get("externalIds") or {}).get("DOI"), r["title"])
+        for r in records
+    )
+    return records, payload.get("next")
+
+
+_CITATION_PAGES = {
+    "crossref": (_crossref_citation_page, "*"),
+    "semanticscholar": (_semanticscholar_citation_page, 0),
+}
+
+
+# URL builders and response parsers shared with :mod:`brainimagelibrary.aio`.
+
+
+def _datacite_url(bildid):
+    return f"{DATACITE_API}/dois/{DOI_PREFIX}/{bildid}"
+
+
+_CITATION_URLS = {
+    "datacite": lambda bildid: f"{DATACITE_API}/dois/{DOI_PREFIX}/{bildid}/citations",
+    "opencitations": lambda bildid: f"{OPENCITATIONS_API}/citations/{DOI_PREFIX}/{bildid}",
+    "crossref": lambda bildid: f"{CROSSREF_API}/works?filter=cites:{DOI_PREFIX}/{bildid}",
+    "semanticscholar": lambda bildid: (
+        f"{SEMANTICSCHOLAR_API}/paper/DOI:{DOI_PREFIX}/{bildid}/citations"
+        "?fields=title,authors,year,externalIds"
+    ),
+}
+
+
+def _parse_crossref_title(payload):
+    titles = payload.get("message", {}).get("title", [])
+    return titles[0] if titles else None
+
+
+def _parse_datacite_citations(payload):
+    records = payload.get("data", None)
+    if records is None:
+        return None
+    for record in records:
+        titles = record.get("attributes", {}).get("titles", [])
+        record["title"] = titles[0]["title"] if titles else None
+    return records
+
+
+def _parse_crossref_titles(payload):
+    titles = {}
+    for item in payload.get("message", {}).get("items", []):
+        doi = item.get("DOI")
+        if doi:
+            found = item.get("title") or []
+            titles[normalize_doi(doi)] = found[0] if found else None
+    return titles
+
+
+def _parse_crossref_citations(payload):
+    items = payload.get("message", {}).get("items", None)
+    if items is None:
+        return None
+    for item in items:
+        titles = item.get("title", [])
+        item["title"] = titles[0] if titles else None
+    return items
+
+
+def _parse_semanticscholar_citations(payload):
+    records = payload.get("data", None)
+    if records is None:
         return None
+    for record in records:
+        record["title"] = record.get("citingPaper", {}).get("title")
+    return records
@@ -0,0 +1,199 @@
+"""Persistent SQLite cache of DOI metadata shared by the citation functions."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from .codec import loads
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DOICache", "get_doi_cache", "set_doi_cache"]
+
+DEFAULT_PATH = os.path.join("~", ".cache", "brainimagelibrary", "doi.sqlite")
+
+DEFAULT_TTL = 30 * 24 * 3600  # 30 days
+
+# DOIs a source did not know are retried sooner than found ones.
+DEFAULT_MISSING_TTL = 24 * 3600  # 1 day
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dois (
+    doi TEXT PRIMARY KEY,
+    record TEXT,
+    fetched REAL NOT NULL
+);
+"""
+
+# SQLite's default limit on host parameters in one statement is 999.
+_CHUNK = 500
+
+
+def normalize_doi(doi: str) -> str:
+    """Returns *doi* lower-cased and without a ``doi.org`` URL prefix."""
+    doi = doi.strip()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "doi:"):
+        if doi.lower().startswith(prefix):
+            doi = doi[len(prefix) :]
+            break
+    return doi.lower()
+
+
+class DOICache:
+    """
+    A SQLite table of DOI metadata with a time-to-live.
+
+    Citing papers are looked up once and then reused across datasets, calls
+    and processes: a large atlas paper that cites dozens of BIL datasets is
+    fetched from Crossref once a month instead of once per dataset per call.
+    Each record is a small dict such as ``{"title": ...}``; None records that
+    the DOI was looked up and not found.
+
+    Args:
+        path (str, optional): SQLite file. Defaults to
+            ``~/.cache/brainimagelibrary/doi.sqlite``.
+        ttl (float, optional): Seconds a found record stays valid.
+            Defaults to 30 days.
+        missing_ttl (float, optional): Seconds a "not found" result stays
+            valid. Defaults to 1 day.
+
+    Example:
+        >>> from brainimagelibrary.doicache import DOICache, set_doi_cache
+        >>> set_doi_cache(DOICache("/tmp/doi.sqlite", ttl=7 * 24 * 3600))
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        ttl: float = DEFAULT_TTL,
+        missing_ttl: float = DEFAULT_MISSING_TTL,
+    ) -> None:
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._counts = {"hits": 0, "misses": 0, "stores": 0}
+
+    def get_many(self, dois: Iterable[str]) -> dict:
+        """
+        Returns the fresh records for *dois*.
+
+        Returns:
+            dict: ``{doi: record}`` for every DOI with an unexpired entry,
+                keyed by normalized DOI. DOIs that must be fetched are absent.
+        """
+        keys = list(dict.fromkeys(normalize_doi(d) for d in dois if d))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _CHUNK):
+                chunk = keys[i : i + _CHUNK]
+                rows = self._db.execute(
+                    f"SELECT doi, record, fetched FROM dois WHERE doi IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for doi, record, fetched in rows:
+                    value = loads(record) if record is not None else None
+                    ttl = self.ttl if value is not None else self.missing_ttl
+                    if fetched + ttl > now:
+                        found[doi] = value
+            self._counts["hits"] += len(found)
+            self._counts["misses"] += len(keys) - len(found)
+        return found
+
+    def get(self, doi: str, default=None):
+        """Returns the fresh record for *doi*, or *default* if it must be fetched."""
+        return self.get_many([doi]).get(normalize_doi(doi), default)
+
+    def put_many(self, records: dict) -> None:
+        """Stores ``{doi: record}`` pairs; a None record means "not found"."""
+        now = time.time()
+        rows = [
+            (normalize_doi(doi), json.dumps(record) if record is not None else None, now)
+            for doi, record in records.items()
+            if doi
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO dois VALUES (?, ?, ?)", rows)
+            self._db.execute("COMMIT")
+            self._counts["stores"] += len(rows)
+
+    def put(self, doi: str, record: Optional[dict]) -> None:
+        """Stores one record. See :meth:`put_many`."""
+        self.put_many({doi: record})
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._lock:
+            self._db.execute("DELETE FROM dois")
+
+    def stats(self) -> dict:
+        """
+        Returns cache counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``stores`` and the number of ``entries``.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            counts["entries"] = self._db.execute("SELECT COUNT(*) FROM dois").fetchone()[0]
+        return counts
+
+    def close(self) -> None:
+        """Closes the database."""
+        with self._lock:
+            self._db.close()
+
+
+_cache: Optional[DOICache] = None
+_cache_lock = threading.Lock()
+_disabled = False
+
+
+def get_doi_cache() -> Optional[DOICache]:
+    """
+    Returns the process-wide :class:`DOICache`, creating it on first use.
+
+    Returns:
+        DOICache | None: The cache, or None if caching was disabled with
+            ``set_doi_cache(None)`` or the default location is not writable.
+    """
+    global _cache, _disabled
+    if _cache is None and not _disabled:
+        with _cache_lock:
+            if _cache is None and not _disabled:
+                try:
+                    _cache = DOICache()
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning("DOI cache unavailable, continuing without it: %s", e)
+                    _disabled = True
+    return _cache
+
+
+def set_doi_cache(cache: Optional[DOICache]) -> Optional[DOICache]:
+    """
+    Replaces the process-wide :class:`DOICache`.
+
+    Args:
+        cache (DOICache | None): The cache to use, or None to disable caching.
+
+    Returns:
+        DOICache | None: The previously installed cache.
+    """
+    global _cache, _disabled
+    with _cache_lock:
+        previous, _cache = _cache, cache
+        _disabled = cache is None
+    return previous
@@ -0,0 +1,250 @@
+"""Cross-dataset file index built from every inventory manifest, stored as partitioned Parquet."""
+
+import logging
+import os
+import shutil
+import zlib
+from typing import Iterable, Optional
+
+import pandas as pd
+import requests
+from tqdm import tqdm
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without the extra
+    pa = ds = pq = None
+
+from ._api import DEFAULT_BATCH_WORKERS, _batch
+from .inventory import iter_manifest
+from .reports import get_all_bildids
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["build", "find"]
+
+DEFAULT_PATH = os.path.join("~", ".cache", "brainimagelibrary", "files")
+
+# Manifest fields kept in the index, with their Arrow types. ``bildid`` is the
+# partition key and is not stored in the files themselves.
+COLUMNS = {
+    "fullpath": "string",
+    "download_url": "string",
+    "extension": "string",
+    "mime_type": "string",
+    "size": "int64",
+    "md5": "string",
+    "sha256": "string",
+    "xxh64": "string",
+    "b2sum": "string",
+    "is_cell_by_gene": "bool_",
+}
+
+# Entries buffered per Parquet row group while an inventory streams in.
+_ROW_GROUP = 64 * 1024
+
+_PART = "part-0.parquet"
+
+
+def _require() -> None:
+    if pa is None:
+        raise ImportError(
+            "brainimagelibrary.files requires pyarrow. "
+            "Install it with: pip install brainimagelibrary[parquet]"
+        )
+
+
+def _schema() -> "pa.Schema":
+    return pa.schema([(name, getattr(pa, kind)()) for name, kind in COLUMNS.items()])
+
+
+def _partition(root: str, bildid: str) -> str:
+    return os.path.join(root, f"bildid={bildid}")
+
+
+def build(
+    path: str = DEFAULT_PATH,
+    bildids: Optional[Iterable[str]] = None,
+    refresh: bool = False,
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+) -> Optional[dict]:
+    """
+    Builds or updates the file index under *path*.
+
+    Every ``<bildid>.json.gz`` inventory is streamed once and its manifest
+    written to ``<path>/bildid=<bildid>/part-0.parquet`` with the columns in
+    :data:`COLUMNS`. Datasets already indexed are skipped unless *refresh*
+    is True, so an interrupted build resumes where it stopped.
+
+    Args:
+        path (str, optional): Index directory. Defaults to
+            ``~/.cache/brainimagelibrary/files``.
+        bildids (Iterable[str], optional): Datasets to index. Defaults to
+            every dataset; partitions of datasets no longer listed are then
+            removed.
+        refresh (bool, optional): Re-index datasets already in the index.
+            Defaults to False.
+        max_workers (int, optional): Inventories streamed concurrently.
+            Defaults to 8.
+
+    Returns:
+        dict | None: Counts of datasets ``indexed``, ``skipped``, ``failed``
+            and ``removed``, plus the number of ``files`` written, or None if
+            the list of datasets could not be retrieved.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+
+    Example:
+        >>> from brainimagelibrary import files
+        >>> files.build()  # doctest: +SKIP
+        {'indexed': 5123, 'skipped': 0, 'failed': 3, 'removed': 0, 'files': 48211937}
+    """
+    _require()
+    root = os.path.expanduser(path)
+    os.makedirs(root, exist_ok=True)
+
+    prune = bildids is None
+    if bildids is None:
+        try:
+            bildids = get_all_bildids()
+        except (TypeError, ValueError) as e:
+            logger.error("Could not list datasets to index: %s", e)
+            return None
+    bildids = list(dict.fromkeys(b for b in bildids if b))
+
+    counts = {"indexed": 0, "skipped": 0, "failed": 0, "removed": 0, "files": 0}
+    todo = []
+    for bildid in bildids:
+        if not refresh and os.path.exists(os.path.join(_partition(root, bildid), _PART)):
+            counts["skipped"] += 1
+        else:
+            todo.append(bildid)
+
+    results = _batch(lambda bildid: _index(root, bildid), todo, max_workers=max_workers, stream=True)
+    for bildid, rows in tqdm(results, total=len(todo), desc="Files", disable=not todo):
+        if isinstance(rows, int):
+            counts["indexed"] += 1
+            counts["files"] += rows
+        else:
+            counts["failed"] += 1
+
+    if prune:
+        listed = {_partition(root, bildid) for bildid in bildids}
+        for name in os.listdir(root):
+            partition = os.path.join(root, name)
+            if name.startswith("bildid=") and partition not in listed:
+                shutil.rmtree(partition, ignore_errors=True)
+                counts["removed"] += 1
+    return counts
+
+
+def _index(root: str, bildid: str) -> Optional[int]:
+    """Writes the partition of *bildid* and returns its row count, or None on failure."""
+    entries = iter_manifest(bildid=bildid)
+    if entries is None:
+        return None
+
+    schema = _schema()
+    partition = _partition(root, bildid)
+    os.makedirs(partition, exist_ok=True)
+    tmp = os.path.join(partition, f".{_PART}.tmp")
+    rows = 0
+    try:
+        with pq.ParquetWriter(tmp, schema) as writer:
+            batch = []
+            for entry in entries:
+                batch.append(_row(entry))
+                if len(batch) == _ROW_GROUP:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                rows += len(batch)
+    except (ValueError, zlib.error, pa.ArrowException, requests.exceptions.RequestException) as e:
+        logger.error("Could not index %s: %s", bildid, e)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    os.replace(tmp, os.path.join(partition, _PART))
+    return rows
+
+
+def _row(entry: dict) -> dict:
+    row = {name: entry.get(name) for name in COLUMNS}
+    size = row["size"]
+    if size is not None and not isinstance(size, int):
+        try:
+            row["size"] = int(size)
+        except (TypeError, ValueError):
+            row["size"] = None
+    if row["is_cell_by_gene"] is not None:
+        row["is_cell_by_gene"] = bool(row["is_cell_by_gene"])
+    for name, kind in COLUMNS.items():
+        if kind == "string" and row[name] is not None and not isinstance(row[name], str):
+            row[name] = str(row[name])
+    return row
+
+
+def find(
+    path: str = DEFAULT_PATH,
+    columns: Optional[list] = None,
+    **filters,
+) -> pd.DataFrame:
+    """
+    Returns the indexed files that match every filter.
+
+    Each keyword names a column of the index (``bildid`` or any of
+    :data:`COLUMNS`). A scalar value must match exactly; a list, tuple or set
+    matches any of its values. Filters on ``bildid`` only open the matching
+    partitions, and the rest are evaluated on the Parquet row groups, so a
+    query over the whole archive takes seconds.
+
+    Args:
+        path (str, optional): Index directory built by :func:`build`.
+            Defaults to ``~/.cache/brainimagelibrary/files``.
+        columns (list, optional): Columns to return. Defaults to all.
+        **filters: ``column=value`` conditions.
+
+    Returns:
+        pandas.DataFrame: One row per matching file, with a ``bildid`` column.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        FileNotFoundError: If no index exists at *path*.
+        ValueError: If a filter names an unknown column.
+
+    Example:
+        >>> from brainimagelibrary import files
+        >>> files.find(extension="h5ad")  # doctest: +SKIP
+        >>> files.find(is_cell_by_gene=True, columns=["bildid", "fullpath"])  # doctest: +SKIP
+    """
+    _require()
+    root = os.path.expanduser(path)
+    if not os.path.isdir(root):
+        raise FileNotFoundError(f"No file index at {root}; run files.build() first.")
+
+    unknown = set(filters) - set(COLUMNS) - {"bildid"}
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+
+    expression = None
+    for name, value in filters.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            condition = ds.field(name).isin(list(value))
+        else:
+            condition = ds.field(name) == value
+        expression = condition if expression is None else expression & condition
+
+    dataset = ds.dataset(
+        root,
+        schema=_schema().insert(0, pa.field("bildid", pa.string())),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("bildid", pa.string())]), flavor="hive"),
+    )
+    if columns is None:
+        columns = ["bildid", *COLUMNS]
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
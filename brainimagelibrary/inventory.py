@@ -4,17 +4,46 @@ import logging
 import requests
 import pandas as pd
 import gzip
-import io
-import json
-import ast
 import os
-from typing import Optional, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import zlib
+from typing import Iterable, Iterator, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from tqdm import tqdm
 
+from . import _ingest
+from ._api import DEFAULT_BATCH_WORKERS, DOWNLOAD_BASE, _iter_batch
+from ._download import (
+    DEFAULT_REFETCH,
+    LOCAL_MODES,
+    DEFAULT_SEGMENT_SIZE,
+    DEFAULT_SEGMENT_THRESHOLD,
+    DEFAULT_SEGMENTS,
+    cheapest_checksum,
+    copy_local,
+    fetch,
+    new_hasher,
+)
+from ._stream import gunzip, iter_object
+from .client import get_client
+from .manifest import Manifest
+
 logger = logging.getLogger(__name__)
 
-__all__ = ["summary", "DatasetInventory", "to_manifest", "exists", "has", "get"]
+__all__ = [
+    "summary",
+    "DatasetInventory",
+    "to_manifest",
+    "exists",
+    "has",
+    "get",
+    "get_many",
+    "iter_manifest",
+]
+
+_INVENTORY_BASE = f"{DOWNLOAD_BASE}/inventory/datasets/JSON"
+
+_CHUNK_SIZE = 1024 * 1024
 
 
 def summary(bildid: Optional[str] = None) -> Optional[dict]:
@@ -49,15 +78,14 @@ def summary(bildid: Optional[str] = None) -> Optional[dict]:
         ['frequencies', 'types', 'sizes']
     """
     metadata = get(bildid=bildid)
-    manifest = metadata["manifest"]
-    df = pd.DataFrame(manifest)
+    df = metadata["manifest"].to_frame(columns=["extension", "size"])
 
     data = {}
     data["pretty_size"] = metadata["pretty_size"]
     data["size"] = metadata["size"]
     data["number_of_files"] = metadata["number_of_files"]
 
-    grouped_data = df.groupby("extension")["size"].sum()
+    grouped_data = df.groupby("extension", observed=True)["size"].sum()
     data["files"] = {
         "frequencies": metadata["frequencies"],
         "types": metadata["file_types"],
@@ -73,12 +101,39 @@ class DatasetInventory(dict):
 
     Provides convenient methods for exporting and downloading dataset files
     without needing to call module-level functions separately.
+
+    The ``manifest`` entry is stored as a columnar
+    :class:`~brainimagelibrary.manifest.Manifest`; it can still be indexed and
+    iterated like the list of dicts it was built from, but it is not a
+    ``list``. Use :meth:`to_dict` where the inventory has to be serialized,
+    e.g. with :func:`json.dumps`.
     """
 
     def __init__(self, data: dict, bildid: str) -> None:
         super().__init__(data)
+        manifest = self.get("manifest")
+        if manifest is not None and not isinstance(manifest, Manifest):
+            self["manifest"] = Manifest.from_records(manifest)
         self._bildid = bildid
 
+    def to_dict(self) -> dict:
+        """
+        Returns the inventory as a plain, JSON-serializable dict.
+
+        The ``manifest`` entry is converted back to a list of per-file dicts
+        with :meth:`Manifest.to_list`.
+
+        Example:
+            >>> import json
+            >>> from brainimagelibrary import inventory
+            >>> text = json.dumps(inventory.get(bildid="act-bag").to_dict())
+        """
+        data = dict(self)
+        manifest = data.get("manifest")
+        if isinstance(manifest, Manifest):
+            data["manifest"] = manifest.to_list()
+        return data
+
     def to_manifest(self, checksum: str = "md5") -> Optional[str]:
         """
         Writes a manifest file for this dataset.
@@ -112,7 +167,7 @@ class DatasetInventory(dict):
             logger.error("No manifest entries found for dataset '%s'.", self._bildid)
             return None
 
-        df = pd.DataFrame(manifest)
+        df = manifest.to_frame(columns=["download_url", checksum])
         if checksum not in df.columns:
             df[checksum] = ""
 
@@ -162,6 +217,12 @@ class DatasetInventory(dict):
         self,
         n: int = 2,
         extensions: Optional[Union[str, list]] = None,
+        segments: int = DEFAULT_SEGMENTS,
+        segment_threshold: int = DEFAULT_SEGMENT_THRESHOLD,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        verify: Optional[str] = "auto",
+        refetch: int = DEFAULT_REFETCH,
+        local: Optional[str] = "copy",
     ) -> Optional[str]:
         """
         Downloads files in this dataset's manifest to a local folder.
@@ -171,10 +232,52 @@ class DatasetInventory(dict):
         Partial downloads (``.part`` files) are resumed automatically using
         HTTP range requests when the server supports it.
 
+        Files whose manifest ``size`` is at least ``segment_threshold`` bytes
+        are split into ``segment_size`` byte ranges that are fetched over
+        ``segments`` concurrent connections into a preallocated ``.part``
+        file. Completed ranges are recorded in a ``.part.segments`` sidecar,
+        so an interrupted download resumes segment by segment. Up to
+        ``n * segments`` connections may be open at once; raise the
+        :class:`~brainimagelibrary.client.Client` ``pool_maxsize`` to match.
+
+        Each file is hashed with the ``verify`` algorithm as its chunks are
+        written and compared with the matching manifest column; by default
+        the cheapest checksum the manifest carries is used. A file whose
+        checksum does not match is downloaded again up to ``refetch`` times
+        and is never renamed into place. The outcome for every file is
+        written to ``<bildid>.verification.tsv`` inside the download folder,
+        with columns ``URL``, ``algorithm``, ``expected``, ``actual`` and
+        ``status``.
+
+        On BIL compute nodes the manifest ``fullpath`` (under ``/bil/data``)
+        is usually readable. Such files are staged according to ``local``
+        instead of being downloaded: ``'copy'`` uses a reflink,
+        ``copy_file_range`` or ``sendfile`` so data never passes through
+        Python, ``'hardlink'`` links the file (copying across filesystems)
+        and ``'symlink'`` points at the original. A local file whose size
+        differs from the manifest is downloaded instead. Local files are not
+        hashed; their report status is ``local``.
+
         Args:
             n (int): Number of concurrent downloads. Defaults to 2.
             extensions (list | str | None): File extension(s) to filter downloads,
                 e.g. ``'png'`` or ``['png', 'tif']``. If None, all files are downloaded.
+            segments (int): Concurrent range requests per large file. 1 disables
+                segmented downloads. Defaults to 4.
+            segment_threshold (int): Minimum file size in bytes for a segmented
+                download. Defaults to 256 MiB.
+            segment_size (int): Size in bytes of each range. Defaults to 64 MiB.
+            verify (str | None): Checksum to verify. One of ``'md5'``,
+                ``'sha256'``, ``'xxh64'`` (fastest; requires ``xxhash``) or
+                ``'b2sum'``. ``'auto'`` picks the fastest one present in the
+                manifest, preferring ``'xxh64'`` when ``xxhash`` is
+                installed, then ``'b2sum'``, ``'md5'`` and ``'sha256'``. None
+                disables verification. Defaults to ``'auto'``.
+            refetch (int): Times a file with a mismatched checksum is
+                downloaded again. Defaults to 1.
+            local (str | None): How to stage files whose ``fullpath`` is
+                readable: ``'copy'``, ``'hardlink'`` or ``'symlink'``. None
+                always downloads over HTTPS. Defaults to ``'copy'``.
 
         Returns:
             str: Path to the download folder.
@@ -187,11 +290,29 @@ class DatasetInventory(dict):
             'act-bag'
             >>> folder = dataset.download(n=4, extensions='png')
             >>> folder = dataset.download(n=4, extensions=['png', 'tif'])
+            >>> folder = dataset.download(n=1, segments=16)
+            >>> folder = dataset.download(n=4, verify="xxh64")
+            >>> folder = dataset.download(n=8, local="hardlink")
         """
+        if local is not None and local not in LOCAL_MODES:
+            logger.error("local must be one of %s, got '%s'.", LOCAL_MODES, local)
+            return None
+        if verify is not None and verify != "auto":
+            try:
+                new_hasher(verify)
+            except (ValueError, ImportError) as e:
+                logger.error("%s", e)
+                return None
+
         manifest = self.get("manifest", [])
         if not manifest:
             logger.error("No manifest entries found for dataset '%s'.", self._bildid)
             return None
+        # With verify="auto" the report is written even if the manifest has
+        # no checksum, so staged and failed files are still listed.
+        write_report = verify is not None
+        if verify == "auto":
+            verify = cheapest_checksum(manifest.columns)
 
         folder = self._bildid
         os.makedirs(folder, exist_ok=True)
@@ -201,99 +322,113 @@ class DatasetInventory(dict):
                 extensions = [extensions]
             extensions = {ext.lstrip(".").lower() for ext in extensions}
 
-        urls = [
-            entry.get("download_url")
-            for entry in manifest
-            if entry.get("download_url")
+        columns = ["download_url", "size", "fullpath"] + ([verify] if verify else [])
+        files = manifest.to_frame(columns=columns)
+        if "size" in files.columns:
+            sizes = pd.to_numeric(files["size"], errors="coerce")
+        else:
+            sizes = [None] * len(files)
+        checksums = files[verify] if verify in files.columns else [None] * len(files)
+        fullpaths = files["fullpath"] if local and "fullpath" in files.columns else [None] * len(files)
+        downloads = [
+            (
+                url,
+                None if pd.isna(size) else int(size),
+                expected if isinstance(expected, str) else None,
+                fullpath if isinstance(fullpath, str) else None,
+            )
+            for url, size, expected, fullpath in zip(
+                files.get("download_url", ()), sizes, checksums, fullpaths
+            )
+            if isinstance(url, str)
+            and url
             and (
                 extensions is None
-                or os.path.splitext(entry.get("download_url", ""))[1]
-                .lstrip(".")
-                .lower()
-                in extensions
+                or os.path.splitext(url)[1].lstrip(".").lower() in extensions
             )
         ]
-        if not urls:
+        if not downloads:
             logger.error("No download URLs found for dataset '%s'.", self._bildid)
             return folder
 
-        results = {"ok": 0, "skipped": 0, "failed": 0}
+        results = {"ok": 0, "local": 0, "skipped": 0, "failed": 0, "mismatch": 0}
+        report = []
 
-        def _download_one(url):
+        def _download_one(url, size, expected, fullpath):
             path_part = url.split("://", 1)[-1].split("/", 1)[-1]
             dest = os.path.join(folder, path_part)
-            part = dest + ".part"
-
-            if os.path.exists(dest):
-                return "skipped", url
-
-            os.makedirs(os.path.dirname(dest), exist_ok=True)
-
-            # Determine resume offset from an existing .part file
-            resume_offset = os.path.getsize(part) if os.path.exists(part) else 0
-            headers = {"Range": f"bytes={resume_offset}-"} if resume_offset else {}
+            if fullpath is not None and _is_local(fullpath, size):
+                try:
+                    return copy_local(fullpath, dest, mode=local), url, expected, None
+                except OSError as e:
+                    logger.info("Could not stage %s locally (%s), downloading.", fullpath, e)
+            status, actual = fetch(
+                url,
+                dest,
+                size=size,
+                segments=segments,
+                segment_threshold=segment_threshold,
+                segment_size=segment_size,
+                algorithm=verify,
+                expected=expected,
+                refetch=refetch,
+            )
+            return status, url, expected, actual
 
-            try:
-                resp = requests.get(url, stream=True, timeout=60, headers=headers)
-
-                # 416 = range not satisfiable → server thinks file is complete
-                if resp.status_code == 416:
-                    os.rename(part, dest)
-                    return "ok", url
-
-                if resp.status_code not in (200, 206):
-                    return "failed", url
-
-                resuming = resp.status_code == 206
-                total = int(resp.headers.get("Content-Length", 0))
-                if resuming:
-                    total += resume_offset
-
-                mode = "ab" if resuming else "wb"
-                label = os.path.basename(dest)
-                with tqdm(
-                    total=total if total else None,
-                    initial=resume_offset if resuming else 0,
-                    unit="B",
-                    unit_scale=True,
-                    unit_divisor=1024,
-                    desc=label,
-                    leave=False,
-                ) as pbar:
-                    with open(part, mode) as f:
-                        for chunk in resp.iter_content(chunk_size=1024 * 1024):
-                            f.write(chunk)
-                            pbar.update(len(chunk))
-
-                os.rename(part, dest)
-                return "ok", url
-
-            except requests.exceptions.RequestException as e:
-                logger.warning("Failed to download %s: %s", url, e)
-                return "failed", url
-
-        with tqdm(total=len(urls), desc="Overall", unit="file") as overall:
+        with tqdm(total=len(downloads), desc="Overall", unit="file") as overall:
             with ThreadPoolExecutor(max_workers=n) as executor:
-                futures = {executor.submit(_download_one, url): url for url in urls}
+                futures = {
+                    executor.submit(_download_one, *download): download[0]
+                    for download in downloads
+                }
                 for future in as_completed(futures):
-                    status, url = future.result()
+                    status, url, expected, actual = future.result()
                     results[status] += 1
+                    report.append((url, verify, expected, actual, status))
                     overall.set_postfix(
                         ok=results["ok"],
+                        local=results["local"],
                         skipped=results["skipped"],
                         failed=results["failed"],
+                        mismatch=results["mismatch"],
                     )
                     overall.update(1)
 
         logger.info(
-            "Download complete: %d downloaded, %d skipped, %d failed.",
+            "Download complete: %d downloaded, %d staged locally, %d skipped, "
+            "%d failed, %d checksum mismatches.",
             results["ok"],
+            results["local"],
             results["skipped"],
             results["failed"],
+            results["mismatch"],
         )
+        if write_report:
+            _write_verification_report(
+                report, os.path.join(folder, f"{self._bildid}.verification.tsv")
+            )
         return folder
 
 
+def _is_local(path: str, size: Optional[int]) -> bool:
+    """Returns True if *path* is a readable file matching the manifest *size*."""
+    try:
+        if not os.path.isfile(path) or not os.access(path, os.R_OK):
+            return False
+        return size is None or os.path.getsize(path) == size
+    except OSError:
+        return False
+
+
+def _write_verification_report(rows: list, path: str) -> None:
+    """Writes the per-file outcome of a verified download as TSV."""
+    df = pd.DataFrame(rows, columns=["URL", "algorithm", "expected", "actual", "status"])
+    try:
+        df.sort_values("URL").to_csv(path, sep="\t", index=False)
+    except OSError as e:
+        logger.warning("Could not write verification report '%s': %s", path, e)
+
+
 def to_manifest(bildid: Optional[str] = None, checksum: str = "md5") -> Optional[str]:
     """
     Writes a manifest file for a dataset.
@@ -350,10 +485,10 @@ def exists(bildid: Optional[str] = None) -> bool:
     if bildid is None:
         return False
 
-    url = f"https://download.brainimagelibrary.org/inventory/datasets/JSON/{bildid}.json.gz"
+    url = _url(bildid)
 
     try:
-        resp = requests.head(url, timeout=30)
+        resp = get_client().head(url, timeout=30)
         return resp.status_code == 200
     except requests.exceptions.RequestException:
         return False
@@ -363,9 +498,10 @@ def has(bildid: Optional[str] = None, option: Optional[str] = None) -> Optional[
     """
     Checks whether a dataset contains files of a given type.
 
-    First verifies the dataset exists via :func:`exists`, then retrieves its
-    inventory and checks whether ``option`` appears in the ``file_types``
-    field. If ``option`` is ``'cell_by_gene'``, returns True if any manifest
+    Retrieves the dataset's inventory and checks whether ``option`` appears
+    in the ``file_types`` field. :func:`exists` is only consulted when the
+    inventory cannot be retrieved, to tell a missing dataset from a failed
+    download. If ``option`` is ``'cell_by_gene'``, returns True if any manifest
     entry has ``is_cell_by_gene`` set to True.
 
     Args:
@@ -386,30 +522,38 @@ def has(bildid: Optional[str] = None, option: Optional[str] = None) -> Optional[
         >>> inventory.has(bildid="nonexistent", option="tif")
         None
     """
-    if not exists(bildid=bildid):
-        return None
-
     data = get(bildid=bildid)
     if data is None:
-        return False
+        return False if exists(bildid=bildid) else None
 
     if option == "cell_by_gene":
-        manifest = data.get("manifest", [])
-        return any(entry.get("is_cell_by_gene") is True for entry in manifest)
+        column = data["manifest"].column("is_cell_by_gene") if "manifest" in data else None
+        return column is not None and bool((column == True).any())  # noqa: E712
 
     file_types = data.get("file_types", {})
     return option in file_types
 
 
-def get(bildid: Optional[str] = None) -> Optional["DatasetInventory"]:
+def get(bildid: Optional[str] = None, stream: bool = False) -> Optional["DatasetInventory"]:
     """
     Retrieves inventory information for a dataset by its ID from a compressed JSON (.json.gz).
 
+    By default the whole compressed file is downloaded, decompressed and then
+    parsed. With ``stream=True`` the response is decompressed as it arrives
+    and the manifest array is parsed entry by entry, so neither the compressed
+    body nor the decompressed JSON text is ever held in memory in full. Use
+    this for datasets with millions of manifest entries.
+
     Args:
         bildid (str, optional): The unique identifier for the dataset. Defaults to None.
+        stream (bool, optional): Parse the inventory incrementally while it
+            downloads. Defaults to False.
 
     Returns:
-        dict | None: Dataset inventory information if successful, otherwise None.
+        DatasetInventory | None: Dataset inventory information if successful,
+            otherwise None. Its ``manifest`` entry is a
+            :class:`~brainimagelibrary.manifest.Manifest` rather than a list;
+            call :meth:`DatasetInventory.to_dict` for a JSON-serializable copy.
 
     Example:
         >>> from brainimagelibrary import inventory
@@ -425,30 +569,231 @@ def get(bildid: Optional[str] = None) -> Optional["DatasetInventory"]:
         logger.error("bildid must be provided.")
         return None
 
-    filename = f"{bildid}.json.gz"
-    url = f"https://download.brainimagelibrary.org/inventory/datasets/JSON/{filename}"
+    if stream:
+        try:
+            return _get_streaming(bildid)
+        except ValueError as e:
+            # e.g. inventories written as Python literals rather than JSON
+            logger.info("Inventory for '%s' is not streamable (%s), retrying.", bildid, e)
+
+    content = _download_inventory(bildid)
+    if content is None:
+        return None
+    return _parse(content, bildid)
+
+
+def _url(bildid: str) -> str:
+    """Returns the download URL of the compressed inventory for *bildid*."""
+    return f"{_INVENTORY_BASE}/{bildid}.json.gz"
+
 
+def _parse(content: bytes, bildid: str) -> Optional["DatasetInventory"]:
+    """Decompresses and parses a ``.json.gz`` inventory payload."""
     try:
-        resp = requests.get(url, timeout=30)
-        if resp.status_code != 200:
-            logger.error("Received status code %d for %s.", resp.status_code, url)
-            return None
+        return DatasetInventory(_ingest.decode(content), bildid)
+    except gzip.BadGzipFile:
+        logger.error("Response is not a valid gzip file.")
+        return None
+    except (ValueError, SyntaxError) as e:
+        logger.error("Decompressed content could not be parsed: %s", e)
+        return None
 
-        try:
-            with gzip.GzipFile(fileobj=io.BytesIO(resp.content)) as gz:
-                raw = gz.read()
-            try:
-                data = json.loads(raw)
-            except json.JSONDecodeError:
-                data = ast.literal_eval(raw.decode("utf-8"))
-            return DatasetInventory(data, bildid)
-        except gzip.BadGzipFile:
-            logger.error("Response is not a valid gzip file.")
+
+def get_many(
+    bildids: Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    processes: Optional[int] = None,
+    stream: bool = False,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Retrieves the inventories of many datasets, parsing them on all cores.
+
+    Downloads run on ``max_workers`` threads, while decompression, JSON (or
+    Python-literal) parsing and building each columnar
+    :class:`~brainimagelibrary.manifest.Manifest` run in a pool of
+    ``processes`` worker processes, so they no longer serialize on the GIL.
+    Workers hand the finished manifest columns back through shared memory
+    rather than pickling per-file dicts. Duplicate and empty IDs are dropped,
+    and a dataset whose inventory cannot be retrieved or parsed yields None.
+
+    Args:
+        bildids (Iterable[str]): The dataset IDs to load.
+        max_workers (int, optional): Concurrent downloads, which also bounds
+            the number of compressed inventories held in memory at once.
+            Defaults to 8.
+        processes (int, optional): Parser processes. 0 parses in the
+            download threads instead. Defaults to the number of CPUs, or 0
+            on a single-CPU machine.
+        stream (bool, optional): When True, return an iterator yielding
+            ``(bildid, inventory)`` pairs as each completes. Defaults to False.
+
+    Returns:
+        list: ``(bildid, DatasetInventory | None)`` pairs in the order the
+            IDs were first given.
+        Iterator[tuple]: The same pairs in completion order when ``stream``
+            is True.
+
+    Example:
+        >>> from brainimagelibrary import inventory, reports
+        >>> for bildid, inv in inventory.get_many(reports.get_all_bildids(), stream=True):
+        ...     print(bildid, inv and inv["number_of_files"])
+    """
+    keys = list(dict.fromkeys(b for b in bildids if b))
+    if processes is None:
+        cpus = os.cpu_count() or 1
+        processes = cpus if cpus > 1 else 0
+    if processes and len(keys) > 1:
+        iterator = _iter_many_in_processes(keys, max_workers, min(processes, len(keys)))
+    else:
+        iterator = _iter_many_in_threads(keys, max_workers)
+    if stream:
+        return iterator
+    results = dict(iterator)
+    return [(key, results[key]) for key in keys]
+
+
+def _iter_many_in_threads(keys: list, max_workers: int) -> Iterator[tuple]:
+    for bildid, result in _iter_batch(get, keys, max_workers):
+        yield bildid, None if isinstance(result, Exception) else result
+
+
+def _iter_many_in_processes(keys: list, max_workers: int, processes: int) -> Iterator[tuple]:
+    try:
+        pool = ProcessPoolExecutor(max_workers=processes, mp_context=_ingest.mp_context())
+    except (OSError, NotImplementedError, ValueError) as e:
+        logger.warning("Cannot start parser processes (%s); parsing in threads.", e)
+        yield from _iter_many_in_threads(keys, max_workers)
+        return
+
+    def _load(bildid):
+        content = _download_inventory(bildid)
+        if content is None:
             return None
-        except (ValueError, SyntaxError) as e:
-            logger.error("Decompressed content could not be parsed: %s", e)
+        try:
+            result = pool.submit(_ingest.parse_in_worker, content).result()
+        except BrokenProcessPool as e:
+            logger.warning("Parser process failed (%s); parsing '%s' in this process.", e, bildid)
+            return _parse(content, bildid)
+        try:
+            fields, manifest = _ingest.receive(result)
+        except ValueError as e:
+            logger.error("Inventory for '%s' could not be parsed: %s", bildid, e)
             return None
+        if manifest is not None:
+            fields["manifest"] = manifest
+        return DatasetInventory(fields, bildid)
+
+    with pool:
+        for bildid, result in _iter_batch(_load, keys, max_workers):
+            yield bildid, None if isinstance(result, Exception) else result
+
 
+def _download_inventory(bildid: str) -> Optional[bytes]:
+    """Returns the compressed inventory of *bildid*, or None on failure."""
+    url = _url(bildid)
+    try:
+        resp = get_client().get(url, timeout=30)
     except requests.exceptions.RequestException as e:
         logger.error("Error making API request: %s", e)
         return None
+    if resp.status_code != 200:
+        logger.error("Received status code %d for %s.", resp.status_code, url)
+        return None
+    return resp.content
+
+
+def iter_manifest(bildid: Optional[str] = None) -> Optional[Iterator[dict]]:
+    """
+    Streams the manifest entries of a dataset's inventory one at a time.
+
+    The compressed inventory is decompressed and parsed incrementally while it
+    downloads, so memory use stays flat regardless of the number of files.
+
+    Args:
+        bildid (str, optional): The unique identifier for the dataset. Defaults to None.
+
+    Returns:
+        Iterator[dict] | None: An iterator over manifest entries, or None if the
+            inventory cannot be retrieved.
+
+    Raises:
+        ValueError: While iterating, if the inventory is not valid JSON.
+        zlib.error: While iterating, if the inventory is not valid gzip.
+        requests.exceptions.RequestException: While iterating, if the
+            connection fails mid-download.
+
+    Example:
+        >>> from brainimagelibrary import inventory
+        >>> entries = inventory.iter_manifest(bildid="act-bag")
+        >>> tifs = sum(1 for entry in entries if entry["extension"] == "tif")
+    """
+    if bildid is None:
+        logger.error("bildid must be provided.")
+        return None
+
+    resp = _open_stream(bildid)
+    if resp is None:
+        return None
+
+    def _entries():
+        with resp:
+            for event in iter_object(gunzip(resp.iter_content(_CHUNK_SIZE)), "manifest"):
+                if event[0] == "item":
+                    yield event[1]
+
+    return _entries()
+
+
+def _open_stream(bildid: str) -> Optional[requests.Response]:
+    """Opens a streamed GET for the inventory of *bildid*, or returns None on failure."""
+    url = _url(bildid)
+    try:
+        resp = get_client().get(url, stream=True, timeout=30)
+    except requests.exceptions.RequestException as e:
+        logger.error("Error making API request: %s", e)
+        return None
+    if resp.status_code != 200:
+        logger.error("Received status code %d for %s.", resp.status_code, url)
+        resp.close()
+        return None
+    return resp
+
+
+def _get_streaming(bildid: str) -> Optional["DatasetInventory"]:
+    """
+    Builds a :class:`DatasetInventory` while the inventory downloads.
+
+    Raises:
+        ValueError: If the inventory is not JSON, so the caller can fall back
+            to the buffered parser.
+    """
+    resp = _open_stream(bildid)
+    if resp is None:
+        return None
+
+    data = {}
+
+    def _entries(events):
+        # Top-level fields are collected as a side effect, so the manifest can
+        # be built column by column without a list of entries in between.
+        for event in events:
+            if event[0] == "item":
+                data.setdefault("manifest", None)
+                yield event[1]
+            else:
+                data[event[1]] = event[2]
+
+    try:
+        with resp:
+            events = iter_object(gunzip(resp.iter_content(_CHUNK_SIZE)), "manifest")
+            manifest = Manifest.from_records(_entries(events))
+    except zlib.error:
+        logger.error("Response is not a valid gzip file.")
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.error("Error making API request: %s", e)
+        return None
+
+    if data.get("manifest") is None:
+        data["manifest"] = manifest
+    return DatasetInventory(data, bildid)
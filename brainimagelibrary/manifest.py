@@ -0,0 +1,392 @@
+"""Columnar, memory-compact storage for dataset inventory manifests."""
+
+import logging
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Manifest"]
+
+# String columns with at most this fraction of distinct values are stored as
+# pandas Categoricals (e.g. extension, mime_type).
+_CATEGORICAL_RATIO = 0.5
+
+_MISSING = object()
+
+# Fields stored as an interned directory prefix plus a basename. Other string
+# fields are only treated as paths when their first value is a URL or an
+# absolute path, so that e.g. ``mime_type`` ("image/tiff") stays categorical.
+_PATH_FIELDS = frozenset(("fullpath", "download_url"))
+
+
+def _looks_like_path(value: str) -> bool:
+    return value.startswith("/") or "://" in value
+
+
+class _PathColumn:
+    """Strings split at the last ``/`` into an interned prefix and a basename."""
+
+    __slots__ = ("prefixes", "codes", "names")
+
+    def __init__(self, prefixes: list, codes: np.ndarray, names: np.ndarray) -> None:
+        self.prefixes = prefixes
+        self.codes = codes
+        self.names = names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, i: int) -> str:
+        return self.prefixes[self.codes[i]] + self.names[i]
+
+    def materialize(self) -> np.ndarray:
+        prefixes = np.array(self.prefixes, dtype=object)
+        return prefixes[self.codes] + self.names
+
+
+class _ColumnBuilder:
+    """Accumulates one manifest column, interning strings as they arrive."""
+
+    def __init__(self, missing_rows: int, path: bool = False) -> None:
+        self.path = path
+        self.values = [_MISSING] * missing_rows
+        self.kind = None  # "path", "str" or "other"
+        self.table = {}  # interned strings or path prefixes -> code
+        self.codes = []
+        self.names = []
+
+    def append(self, value) -> None:
+        if self.kind is None and value is not _MISSING:
+            if isinstance(value, str):
+                is_path = "/" in value and (self.path or _looks_like_path(value))
+                self.kind = "path" if is_path else "str"
+            else:
+                self.kind = "other"
+            # Replay rows that were missing before the first value.
+            missing, self.values = len(self.values), []
+            for _ in range(missing):
+                self._append_typed(_MISSING)
+        if self.kind is None:
+            self.values.append(value)
+            return
+        self._append_typed(value)
+
+    def _append_typed(self, value) -> None:
+        kind = self.kind
+        if kind == "path":
+            if isinstance(value, str) and "/" in value:
+                prefix, _, name = value.rpartition("/")
+                self.codes.append(self.table.setdefault(prefix + "/", len(self.table)))
+                self.names.append(name)
+                return
+            if value is not _MISSING:
+                self._demote()
+                self._append_typed(value)
+                return
+            self.codes.append(-1)
+            self.names.append(None)
+        elif kind == "str":
+            if isinstance(value, str):
+                self.codes.append(self.table.setdefault(value, len(self.table)))
+                return
+            if value is not _MISSING:
+                self._demote()
+                self._append_typed(value)
+                return
+            self.codes.append(-1)
+        else:
+            self.values.append(value)
+
+    def _demote(self) -> None:
+        """Falls back to storing plain Python values."""
+        values = self._decode()
+        self.kind = "other"
+        self.values = values
+        self.table, self.codes, self.names = {}, [], []
+
+    def _decode(self) -> list:
+        if self.kind == "other":
+            return self.values
+        lookup = list(self.table)
+        if self.kind == "str":
+            return [lookup[c] if c >= 0 else _MISSING for c in self.codes]
+        return [
+            lookup[c] + n if c >= 0 else _MISSING for c, n in zip(self.codes, self.names)
+        ]
+
+    def finish(self):
+        """Returns ``(column, present)`` where *present* is None if no row is missing."""
+        if self.kind == "path":
+            codes = np.array(self.codes, dtype=np.int32)
+            present = codes >= 0
+            prefixes = list(self.table) + [""]
+            names = np.array([n if n is not None else "" for n in self.names], dtype=object)
+            codes[~present] = len(prefixes) - 1
+            column = _PathColumn(prefixes, codes, names)
+            return column, (None if present.all() else present)
+
+        if self.kind == "str":
+            codes = np.array(self.codes, dtype=np.int32)
+            present = codes >= 0
+            categories = list(self.table)
+            if len(categories) <= max(1, len(codes) * _CATEGORICAL_RATIO):
+                column = pd.Categorical.from_codes(codes, categories=categories)
+            else:
+                lookup = np.array(categories + [None], dtype=object)
+                column = lookup[codes]
+            return column, (None if present.all() else present)
+
+        values = self.values
+        present = np.fromiter((v is not _MISSING for v in values), dtype=bool, count=len(values))
+        filled = [None if v is _MISSING else v for v in values]
+        return _to_array(filled, present), (None if present.all() else present)
+
+
+def _to_array(values: list, present: np.ndarray) -> np.ndarray:
+    """Converts *values* to the most compact NumPy dtype that holds them exactly."""
+    observed = [v for v, p in zip(values, present) if p]
+    if observed and all(type(v) is bool for v in observed):
+        return np.array([bool(v) if v is not None else False for v in values], dtype=bool)
+    if observed and all(type(v) is int for v in observed):
+        try:
+            return np.array([v if v is not None else 0 for v in values], dtype=np.int64)
+        except OverflowError:
+            pass
+    if observed and all(type(v) in (int, float) for v in observed):
+        return np.array([v if v is not None else np.nan for v in values], dtype=np.float64)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _all_strings(values: np.ndarray) -> bool:
+    return all(v is None or type(v) is str for v in values)
+
+
+def _encode_strings(values) -> Optional[np.ndarray]:
+    """
+    Joins strings (None as empty) with NUL into one ``uint8`` buffer.
+
+    Returns None if a value itself contains NUL, so the caller can fall back
+    to plain Python objects.
+    """
+    joined = "\0".join(v if v is not None else "" for v in values)
+    if joined.count("\0") != max(len(values) - 1, 0):
+        return None
+    return np.frombuffer(joined.encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_strings(blob: np.ndarray, length: int) -> np.ndarray:
+    """Inverse of :func:`_encode_strings`."""
+    array = np.empty(length, dtype=object)
+    if length:
+        array[:] = blob.tobytes().decode("utf-8").split("\0")
+    return array
+
+
+class Manifest(Sequence):
+    """
+    The file manifest of a dataset inventory, stored column by column.
+
+    Each manifest field is held once as a single column: numbers and flags
+    as NumPy arrays, low-cardinality strings such as ``extension`` and
+    ``mime_type`` as :class:`pandas.Categorical`, and path-like strings such
+    as ``fullpath`` and ``download_url`` as an interned directory prefix plus
+    a basename. For large inventories this takes a fraction of the memory of
+    a list of per-file dicts.
+
+    A :class:`Manifest` still behaves like the list of dicts it replaces:
+    ``len()``, indexing and iteration return one dict per file. Analyses
+    should prefer :meth:`to_frame` or :meth:`column`, which never build
+    per-row dicts and cache the result.
+
+    Example:
+        >>> from brainimagelibrary import inventory
+        >>> manifest = inventory.get(bildid="act-bag")["manifest"]
+        >>> len(manifest)
+        42
+        >>> manifest.to_frame(columns=["extension", "size"]).groupby("extension")["size"].sum()
+    """
+
+    def __init__(self, columns: dict, present: dict, length: int) -> None:
+        self._columns = columns
+        self._present = present
+        self._length = length
+        self._series = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "Manifest":
+        """
+        Builds a manifest from an iterable of per-file dicts.
+
+        *records* is consumed once, so a generator (for example
+        :func:`brainimagelibrary.inventory.iter_manifest`) can be used
+        without materializing the list.
+        """
+        builders = {}
+        length = 0
+        for record in records:
+            for key, builder in builders.items():
+                builder.append(record.get(key, _MISSING))
+            for key in record:
+                if key not in builders:
+                    builder = builders[key] = _ColumnBuilder(length, path=key in _PATH_FIELDS)
+                    builder.append(record[key])
+            length += 1
+
+        columns = {}
+        present = {}
+        for key, builder in builders.items():
+            columns[key], mask = builder.finish()
+            if mask is not None:
+                present[key] = mask
+        return cls(columns, present, length)
+
+    @property
+    def columns(self) -> list:
+        """Names of the fields present in at least one entry."""
+        return list(self._columns)
+
+    def column(self, name: str) -> Optional[pd.Series]:
+        """
+        Returns one field as a :class:`pandas.Series`, or None if it is absent.
+
+        Missing values are NaN/None. The series is built once and cached.
+        """
+        if name not in self._columns:
+            return None
+        series = self._series.get(name)
+        if series is None:
+            column = self._columns[name]
+            if isinstance(column, _PathColumn):
+                column = column.materialize()
+            series = pd.Series(column, name=name, copy=False)
+            mask = self._present.get(name)
+            if mask is not None:
+                series = series.where(mask)
+            self._series[name] = series
+        return series
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Returns the manifest as a :class:`pandas.DataFrame`.
+
+        Args:
+            columns (Sequence[str], optional): Fields to include. Requesting
+                only the fields you need avoids materializing path columns.
+                Fields absent from the manifest are omitted. Defaults to all.
+
+        Returns:
+            pd.DataFrame: One row per file.
+        """
+        names = self.columns if columns is None else [c for c in columns if c in self._columns]
+        return pd.DataFrame({name: self.column(name) for name in names}, index=pd.RangeIndex(self._length))
+
+    def to_list(self) -> list:
+        """
+        Returns the manifest as a plain list of per-file dicts.
+
+        Use it where a JSON-serializable value is needed, e.g.
+        ``json.dumps(manifest.to_list())``; the dicts hold only Python
+        scalars.
+        """
+        return [self._row(i) for i in range(self._length)]
+
+    def _export(self) -> tuple:
+        """
+        Splits the manifest into flat NumPy buffers and a small description.
+
+        Returns ``(layout, arrays)``. *arrays* are contiguous numeric or
+        ``uint8`` arrays, suitable for copying into shared memory; *layout*
+        holds everything else (column kinds, categories, path prefixes) and
+        refers to *arrays* by index. Strings are joined into one UTF-8
+        buffer, so no per-value Python objects cross a process boundary.
+        :meth:`_restore` is the inverse.
+        """
+        layout, arrays = [], []
+
+        def add(array) -> int:
+            arrays.append(np.ascontiguousarray(array))
+            return len(arrays) - 1
+
+        for name, column in self._columns.items():
+            if isinstance(column, _PathColumn):
+                blob = _encode_strings(column.names)
+                if blob is None:
+                    kind, meta, refs = "object", list(column.materialize()), []
+                else:
+                    kind, meta, refs = "path", column.prefixes, [add(column.codes), add(blob)]
+            elif isinstance(column, pd.Categorical):
+                kind, meta, refs = "categorical", list(column.categories), [add(column.codes)]
+            elif column.dtype != object:
+                kind, meta, refs = "array", None, [add(column)]
+            else:
+                blob = _encode_strings(column) if _all_strings(column) else None
+                if blob is None:
+                    kind, meta, refs = "object", list(column), []
+                else:
+                    kind, meta, refs = "strings", None, [add(blob)]
+            mask = self._present.get(name)
+            layout.append((name, kind, meta, refs, None if mask is None else add(mask)))
+        return (self._length, layout), arrays
+
+    @classmethod
+    def _restore(cls, layout: tuple, arrays: list) -> "Manifest":
+        """Rebuilds a manifest from the output of :meth:`_export`."""
+        length, columns_layout = layout
+        columns, present = {}, {}
+        for name, kind, meta, refs, mask in columns_layout:
+            if kind == "path":
+                column = _PathColumn(meta, arrays[refs[0]], _decode_strings(arrays[refs[1]], length))
+            elif kind == "categorical":
+                column = pd.Categorical.from_codes(arrays[refs[0]], categories=meta)
+            elif kind == "array":
+                column = arrays[refs[0]]
+            elif kind == "strings":
+                column = _decode_strings(arrays[refs[0]], length)
+            else:
+                column = np.empty(length, dtype=object)
+                column[:] = meta
+            if mask is not None:
+                present[name] = arrays[mask]
+                if kind == "strings":
+                    column[~arrays[mask]] = None
+            columns[name] = column
+        return cls(columns, present, length)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("manifest index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self._length):
+            yield self._row(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Manifest, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<Manifest: {self._length} entries, columns={self.columns}>"
+
+    def _row(self, i: int) -> dict:
+        row = {}
+        for name, column in self._columns.items():
+            mask = self._present.get(name)
+            if mask is not None and not mask[i]:
+                continue
+            value = column[i]
+            row[name] = value.item() if isinstance(value, np.generic) else value
+        return row
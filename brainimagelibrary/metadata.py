@@ -5,6 +5,8 @@ from typing import Optional
 
 import requests
 
+from .client import get_client
+
 logger = logging.getLogger(__name__)
 
 __all__ = ["get"]
@@ -47,7 +49,7 @@ def get(
     api_url = f"https://api.brainimagelibrary.org/retrieve?bildid={bildid}"
 
     try:
-        response = requests.get(api_url, params=params, headers=headers)
+        response = get_client().get(api_url, params=params, headers=headers)
         response = response.json()
         if (
             "message" in response.keys()
@@ -0,0 +1,373 @@
+"""Per-request instrumentation of the HTTP clients: events, histograms and Prometheus export."""
+
+import logging
+import math
+import re
+import threading
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Metrics", "RequestEvent", "Histogram"]
+
+#: Upper bounds, in seconds, of the request latency buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+#: Upper bounds, in bytes, of the response size buckets.
+SIZE_BUCKETS = tuple(4**i * 256 for i in range(12))  # 256 B .. 1 GiB
+
+_DOI = re.compile(r"10\.\d{4,9}/[^/?#]+")
+
+_DOWNLOAD_HOST = "download.brainimagelibrary.org"
+
+
+def endpoint(url: str) -> tuple:
+    """
+    Returns ``(host, endpoint)`` for *url*.
+
+    The endpoint is the URL path with DOIs replaced by ``{doi}`` and file
+    names on the download server by ``{file}``, so that metrics are grouped
+    per API route rather than per dataset.
+
+    Example:
+        >>> endpoint("https://api.datacite.org/dois/10.35077/act-bag/citations")
+        ('api.datacite.org', '/dois/{doi}/citations')
+    """
+    parts = urlsplit(url)
+    path = _DOI.sub("{doi}", parts.path) or "/"
+    if parts.hostname == _DOWNLOAD_HOST:
+        head, _, _ = path.rpartition("/")
+        path = f"{head}/{{file}}" if head.startswith("/inventory") else "/{file}"
+    return parts.hostname or "", path
+
+
+class RequestEvent:
+    """
+    One request sent through an instrumented client.
+
+    Coalesced and retried requests produce one event each, as seen by the
+    caller: ``seconds`` includes retries and back-off, and ``retries`` counts
+    the extra attempts. For streamed responses ``seconds`` ends when the
+    headers arrive and ``bytes`` is the announced ``Content-Length``.
+
+    Attributes:
+        method (str): HTTP method.
+        url (str): Requested URL, without ``params``.
+        host (str): Host name.
+        endpoint (str): Path template, see :func:`endpoint`.
+        status (int | None): Response status, None if the request failed.
+        bytes (int): Response body size.
+        seconds (float): Wall time from call to response.
+        retries (int): Attempts after the first.
+        cache (str | None): ``"hit"`` when the body was served from the
+            coalescer or revalidated from the disk cache, ``"miss"`` when a
+            cacheable request went to the server, None otherwise.
+        error (str | None): Exception name if the request failed.
+    """
+
+    __slots__ = (
+        "method",
+        "url",
+        "host",
+        "endpoint",
+        "status",
+        "bytes",
+        "seconds",
+        "retries",
+        "cache",
+        "error",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status: Optional[int],
+        bytes: int,
+        seconds: float,
+        retries: int = 0,
+        cache: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.host, self.endpoint = endpoint(url)
+        self.status = status
+        self.bytes = bytes
+        self.seconds = seconds
+        self.retries = retries
+        self.cache = cache
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestEvent({self.method} {self.host}{self.endpoint} status={self.status} "
+            f"bytes={self.bytes} seconds={self.seconds:.3f} retries={self.retries} "
+            f"cache={self.cache} error={self.error})"
+        )
+
+
+class Histogram:
+    """
+    A fixed-bucket histogram with Prometheus semantics.
+
+    Args:
+        buckets (tuple): Sorted upper bounds. An implicit ``+Inf`` bucket
+            holds everything larger.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        lo, hi = 0, len(self.buckets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if value <= self.buckets[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        self.counts[lo] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list:
+        """Returns ``[(upper_bound, count <= bound), ...]`` ending with ``+Inf``."""
+        total, out = 0, []
+        for bound, n in zip((*self.buckets, math.inf), self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates the *q* quantile by linear interpolation within a bucket,
+        like PromQL's ``histogram_quantile``. Returns None when empty.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower, below = 0.0, 0
+        for bound, total in self.cumulative():
+            if total >= rank:
+                if math.isinf(bound):
+                    return self.buckets[-1] if self.buckets else None
+                inside = total - below
+                return lower + (bound - lower) * ((rank - below) / inside if inside else 0)
+            lower, below = bound, total
+        return None
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _Series:
+    """Aggregates of one ``(host, endpoint)`` pair."""
+
+    __slots__ = ("statuses", "errors", "retries", "bytes", "cache", "latency", "size")
+
+    def __init__(self) -> None:
+        self.statuses = {}
+        self.errors = {}
+        self.retries = 0
+        self.bytes = 0
+        self.cache = {"hit": 0, "miss": 0}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+
+
+class Metrics:
+    """
+    A thread-safe registry of request metrics and event callbacks.
+
+    Attach one to a :class:`~brainimagelibrary.client.Client` and every
+    request it sends is recorded: counts per status, errors, retries, bytes,
+    cache hits and misses, and latency and size histograms, grouped by host
+    and endpoint. Callbacks registered with :meth:`subscribe` receive each
+    :class:`RequestEvent` as well, for tracing or custom sinks.
+
+    Clients without metrics (the default) skip instrumentation entirely, so
+    there is no cost unless it is enabled.
+
+    Example:
+        >>> import brainimagelibrary
+        >>> from brainimagelibrary import client
+        >>> from brainimagelibrary.metrics import Metrics
+        >>> metrics = Metrics()
+        >>> client.set_client(client.Client(metrics=metrics))
+        >>> brainimagelibrary.query.by_id("act-bag")  # doctest: +SKIP
+        >>> brainimagelibrary.stats()["metrics"]["requests"]  # doctest: +SKIP
+        1
+        >>> print(metrics.to_prometheus())  # doctest: +SKIP
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series = {}
+        self._callbacks = []
+
+    def subscribe(self, callback: Callable[[RequestEvent], None]) -> None:
+        """Calls *callback* with every :class:`RequestEvent` recorded from now on."""
+        with self._lock:
+            self._callbacks = [*self._callbacks, callback]
+
+    def unsubscribe(self, callback: Callable[[RequestEvent], None]) -> None:
+        """Stops calling *callback*."""
+        with self._lock:
+            self._callbacks = [c for c in self._callbacks if c != callback]
+
+    def record(self, event: RequestEvent) -> None:
+        """Adds *event* to the aggregates and passes it to every subscriber."""
+        key = (event.host, event.endpoint)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            if event.error is not None:
+                series.errors[event.error] = series.errors.get(event.error, 0) + 1
+            else:
+                series.statuses[event.status] = series.statuses.get(event.status, 0) + 1
+                series.size.observe(event.bytes)
+            series.retries += event.retries
+            series.bytes += event.bytes
+            if event.cache is not None:
+                series.cache[event.cache] += 1
+            series.latency.observe(event.seconds)
+            callbacks = self._callbacks
+
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning("Metrics callback %r failed: %s", callback, e)
+
+    def reset(self) -> None:
+        """Discards every aggregate. Subscribers are kept."""
+        with self._lock:
+            self._series = {}
+
+    def snapshot(self) -> dict:
+        """
+        Returns the aggregates recorded so far.
+
+        Returns:
+            dict: Totals of ``requests``, ``errors``, ``retries``, ``bytes``
+                and ``cache`` hits and misses, and ``endpoints``: for each
+                ``"<host><endpoint>"`` the same counts plus ``statuses``,
+                error names, and ``latency`` and ``size`` histogram summaries
+                (``count``, ``sum``, ``p50``, ``p95``, ``p99``).
+        """
+        endpoints = {}
+        with self._lock:
+            for (host, path), series in sorted(self._series.items()):
+                endpoints[f"{host}{path}"] = {
+                    "host": host,
+                    "endpoint": path,
+                    "requests": series.latency.count,
+                    "statuses": dict(series.statuses),
+                    "errors": dict(series.errors),
+                    "retries": series.retries,
+                    "bytes": series.bytes,
+                    "cache": dict(series.cache),
+                    "latency": series.latency.snapshot(),
+                    "size": series.size.snapshot(),
+                }
+        return {
+            "requests": sum(e["requests"] for e in endpoints.values()),
+            "errors": sum(sum(e["errors"].values()) for e in endpoints.values()),
+            "retries": sum(e["retries"] for e in endpoints.values()),
+            "bytes": sum(e["bytes"] for e in endpoints.values()),
+            "cache": {
+                kind: sum(e["cache"][kind] for e in endpoints.values()) for kind in ("hit", "miss")
+            },
+            "endpoints": endpoints,
+        }
+
+    def to_prometheus(self, prefix: str = "brainimagelibrary") -> str:
+        """
+        Renders the aggregates in the Prometheus text exposition format.
+
+        Suitable for the node_exporter textfile collector or for serving
+        from an HTTP endpoint scraped by Prometheus.
+
+        Args:
+            prefix (str, optional): Metric name prefix. Defaults to
+                ``"brainimagelibrary"``.
+
+        Returns:
+            str: ``<prefix>_requests_total``, ``<prefix>_request_errors_total``,
+                ``<prefix>_request_retries_total``,
+                ``<prefix>_response_bytes_total``, ``<prefix>_cache_total``,
+                and the ``<prefix>_request_duration_seconds`` and
+                ``<prefix>_response_size_bytes`` histograms, all labelled
+                with ``host`` and ``endpoint``.
+        """
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+            family("requests_total", "counter", "Requests by response status.")
+            for (host, path), s in series:
+                for status, n in sorted(s.statuses.items()):
+                    lines.append(f"{prefix}_requests_total{_labels(host, path, status=status)} {n}")
+
+            family("request_errors_total", "counter", "Requests that failed without a response.")
+            for (host, path), s in series:
+                for error, n in sorted(s.errors.items()):
+                    lines.append(f"{prefix}_request_errors_total{_labels(host, path, error=error)} {n}")
+
+            family("request_retries_total", "counter", "Attempts after the first.")
+            for (host, path), s in series:
+                lines.append(f"{prefix}_request_retries_total{_labels(host, path)} {s.retries}")
+
+            family("response_bytes_total", "counter", "Response body bytes.")
+            for (host, path), s in series:
+                lines.append(f"{prefix}_response_bytes_total{_labels(host, path)} {s.bytes}")
+
+            family("cache_total", "counter", "Cacheable requests by result.")
+            for (host, path), s in series:
+                for result, n in s.cache.items():
+                    lines.append(f"{prefix}_cache_total{_labels(host, path, result=result)} {n}")
+
+            for name, attribute, help_text in (
+                ("request_duration_seconds", "latency", "Request latency including retries."),
+                ("response_size_bytes", "size", "Response body size."),
+            ):
+                family(name, "histogram", help_text)
+                for (host, path), s in series:
+                    histogram = getattr(s, attribute)
+                    for bound, total in histogram.cumulative():
+                        le = "+Inf" if math.isinf(bound) else _number(bound)
+                        lines.append(f"{prefix}_{name}_bucket{_labels(host, path, le=le)} {total}")
+                    lines.append(f"{prefix}_{name}_sum{_labels(host, path)} {_number(histogram.sum)}")
+                    lines.append(f"{prefix}_{name}_count{_labels(host, path)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(host: str, path: str, **extra) -> str:
+    pairs = {"host": host, "endpoint": path, **extra}
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items()) + "}"
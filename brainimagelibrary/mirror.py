@@ -0,0 +1,469 @@
+"""Local SQLite mirror of every dataset's /retrieve metadata, with an offline query layer."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from tqdm import tqdm
+
+from ._api import DEFAULT_BATCH_WORKERS
+from .codec import loads
+from .retrieve import by_ids as _retrieve_by_ids
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Mirror", "get_mirror", "set_mirror"]
+
+DEFAULT_PATH = os.path.join("~", ".cache", "brainimagelibrary", "mirror.sqlite")
+
+# Normalized tables: (metadata section, indexed columns). Every row also keeps
+# its full section entry as JSON in ``record``.
+_TABLES = {
+    "submission": ("Submission", ("metadata", "bildate", "project", "consortium")),
+    "contributors": ("Contributors", ("contributorname", "affiliation")),
+    "funders": ("Funders", ("funder", "award_number")),
+    "dataset": ("Dataset", ("bildirectory", "generalmodality", "technique", "title", "abstract")),
+    "specimen": ("Specimen", ("species", "ncbitaxonomy", "genotype", "samplelocalid")),
+}
+
+# Full-text index columns: (metadata section, keys whose values are indexed).
+# The first seven mirror the fields of the daily report.
+_SEARCH_FIELDS = {
+    "project": (("Submission", ("project", "consortium")),),
+    "contributor": (("Contributors", ("contributorname",)),),
+    "affiliation": (("Contributors", ("affiliation",)),),
+    "species": (("Specimen", ("species",)),),
+    "technique": (("Dataset", ("technique",)),),
+    "modality": (("Dataset", ("generalmodality",)),),
+    "genotype": (("Specimen", ("genotype",)),),
+    "description": (
+        ("Dataset", ("title", "abstract", "methods", "technicalnotes")),
+        ("Submission", ("title", "description")),
+    ),
+}
+
+_SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(
+    bildid UNINDEXED,
+    {", ".join(_SEARCH_FIELDS)},
+    tokenize = 'porter unicode61'
+);
+"""
+
+_FIELD_TERM = re.compile(rf"^({'|'.join(_SEARCH_FIELDS)}):(.+)$")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS datasets (
+        bildid TEXT PRIMARY KEY,
+        body TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        fetched REAL NOT NULL
+    );
+    """
+    + "".join(
+        f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        bildid TEXT NOT NULL REFERENCES datasets(bildid) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        {", ".join(f"{column} TEXT" for column in columns)},
+        record TEXT,
+        PRIMARY KEY (bildid, position)
+    );
+    """
+        for table, (_, columns) in _TABLES.items()
+    )
+    + """
+    CREATE INDEX IF NOT EXISTS contributors_affiliation ON contributors(affiliation COLLATE NOCASE);
+    CREATE INDEX IF NOT EXISTS dataset_bildirectory ON dataset(bildirectory);
+    CREATE INDEX IF NOT EXISTS submission_metadata ON submission(metadata);
+    """
+)
+
+
+class Mirror:
+    """
+    A local copy of the Brain Image Library metadata.
+
+    :meth:`sync` downloads the ``/retrieve`` response of every dataset listed
+    by :func:`~brainimagelibrary.reports.get_all_bildids` into a SQLite file
+    and splits it into ``submission``, ``contributors``, ``funders``,
+    ``dataset`` and ``specimen`` tables. Later syncs only fetch datasets that
+    are new or older than ``max_age``, and drop datasets that were withdrawn.
+
+    The query methods answer the same questions as
+    :mod:`brainimagelibrary.query` from the local file, and return the same
+    ``{"retjson": [...]}`` layout, so ``query.by_id(..., offline=True)`` and
+    friends can be used in loops without touching the network.
+
+    Args:
+        path (str, optional): SQLite file. Defaults to
+            ``~/.cache/brainimagelibrary/mirror.sqlite``.
+
+    Example:
+        >>> from brainimagelibrary.mirror import get_mirror
+        >>> get_mirror().sync()  # doctest: +SKIP
+        {'added': 5123, 'updated': 0, 'unchanged': 0, 'removed': 0, 'failed': 2}
+        >>> from brainimagelibrary import query
+        >>> query.by_affiliation("Allen Institute", offline=True)  # doctest: +SKIP
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.executescript(_SEARCH_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning("SQLite lacks FTS5 (%s); offline text search will scan metadata.", e)
+            self._fts = False
+        if self._fts and self._count("search") != self._count("datasets"):
+            self.reindex()
+
+    # --- synchronization ---
+
+    def sync(
+        self,
+        bildids: Optional[Iterable[str]] = None,
+        refresh: bool = False,
+        max_age: Optional[float] = None,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+    ) -> Optional[dict]:
+        """
+        Brings the mirror up to date with the live API.
+
+        Args:
+            bildids (Iterable[str], optional): Datasets to sync. Defaults to
+                every dataset; datasets no longer listed are then removed.
+            refresh (bool, optional): Re-fetch datasets that are already
+                mirrored. Defaults to False.
+            max_age (float, optional): Re-fetch mirrored datasets older than
+                this many seconds. Defaults to None (never).
+            max_workers (int, optional): Concurrent ``/retrieve`` requests.
+                Defaults to 8.
+
+        Returns:
+            dict | None: Counts of datasets ``added``, ``updated``,
+                ``unchanged``, ``removed`` and ``failed``, or None if the list
+                of datasets could not be retrieved.
+        """
+        prune = bildids is None
+        if bildids is None:
+            from .reports import get_all_bildids  # reports imports query, which imports this module
+
+            try:
+                bildids = get_all_bildids()
+            except (TypeError, ValueError) as e:
+                logger.error("Could not list datasets to mirror: %s", e)
+                return None
+        bildids = list(dict.fromkeys(b for b in bildids if b))
+
+        with self._lock:
+            known = dict(self._db.execute("SELECT bildid, fetched FROM datasets").fetchall())
+        now = time.time()
+        todo = [
+            bildid
+            for bildid in bildids
+            if refresh
+            or bildid not in known
+            or (max_age is not None and known[bildid] + max_age <= now)
+        ]
+
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        results = _retrieve_by_ids(todo, max_workers=max_workers, stream=True)
+        for bildid, response in tqdm(results, total=len(todo), desc="Mirror", disable=not todo):
+            if response == {}:
+                # The API's "no entry found", as reported by _api._fetch.
+                counts["removed"] += self._delete([bildid])
+            elif not isinstance(response, dict) or not response.get("retjson"):
+                # Exceptions, failed requests and error payloads such as
+                # {"success": False, "message": ...} keep the mirrored copy.
+                counts["failed"] += 1
+            else:
+                counts[self._store(bildid, response)] += 1
+
+        if prune:
+            listed = set(bildids)
+            counts["removed"] += self._delete([b for b in known if b not in listed])
+        return counts
+
+    def _store(self, bildid: str, response: dict) -> str:
+        body = json.dumps(response, sort_keys=True)
+        digest = hashlib.sha1(body.encode()).hexdigest()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest FROM datasets WHERE bildid = ?", (bildid,)
+            ).fetchone()
+            self._db.execute("BEGIN")
+            try:
+                if row is not None and row[0] == digest:
+                    self._db.execute(
+                        "UPDATE datasets SET fetched = ? WHERE bildid = ?", (time.time(), bildid)
+                    )
+                    status = "unchanged"
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?)",
+                        (bildid, body, digest, time.time()),
+                    )
+                    self._write_tables(bildid, response)
+                    self._write_search(bildid, response)
+                    status = "added" if row is None else "updated"
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+        return status
+
+    def _write_tables(self, bildid: str, response: dict) -> None:
+        record = response["retjson"][0]
+        for table, (section, columns) in _TABLES.items():
+            self._db.execute(f"DELETE FROM {table} WHERE bildid = ?", (bildid,))
+            rows = [
+                (bildid, i, *(_text(entry.get(column)) for column in columns), json.dumps(entry))
+                for i, entry in enumerate(_entries(record, section))
+            ]
+            placeholders = ", ".join("?" * (len(columns) + 3))
+            self._db.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+    def _write_search(self, bildid: str, response: dict) -> None:
+        if not self._fts:
+            return
+        record = response["retjson"][0]
+        values = [
+            " ".join(
+                _text(entry.get(key))
+                for section, keys in sources
+                for entry in _entries(record, section)
+                for key in keys
+                if entry.get(key)
+            )
+            for sources in _SEARCH_FIELDS.values()
+        ]
+        self._db.execute("DELETE FROM search WHERE bildid = ?", (bildid,))
+        placeholders = ", ".join("?" * (len(values) + 1))
+        self._db.execute(f"INSERT INTO search VALUES ({placeholders})", (bildid, *values))
+
+    def reindex(self) -> None:
+        """Rebuilds the full-text index from the mirrored metadata."""
+        if not self._fts:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM search")
+            for bildid, body in self._db.execute("SELECT bildid, body FROM datasets").fetchall():
+                self._write_search(bildid, loads(body))
+            self._db.execute("COMMIT")
+
+    def _delete(self, bildids: list) -> int:
+        if not bildids:
+            return 0
+        removed = 0
+        with self._lock:
+            self._db.execute("BEGIN")
+            for bildid in bildids:
+                removed += self._db.execute(
+                    "DELETE FROM datasets WHERE bildid = ?", (bildid,)
+                ).rowcount
+                if self._fts:
+                    self._db.execute("DELETE FROM search WHERE bildid = ?", (bildid,))
+            self._db.execute("COMMIT")
+        return removed
+
+    # --- queries ---
+
+    def by_id(self, bildid: str) -> dict:
+        """Returns the mirrored ``/retrieve`` response for *bildid*, or {} if absent."""
+        with self._lock:
+            row = self._db.execute("SELECT body FROM datasets WHERE bildid = ?", (bildid,)).fetchone()
+        return loads(row[0]) if row else {}
+
+    def by_directory(self, directory: str) -> dict:
+        """Returns the datasets stored in *directory*, or {} if none."""
+        return self._select(
+            "SELECT DISTINCT bildid FROM dataset WHERE bildirectory IN (?, ?)",
+            (directory.rstrip("/"), directory.rstrip("/") + "/"),
+        )
+
+    def by_affiliation(self, affiliation: str) -> dict:
+        """Returns the datasets with a contributor whose affiliation contains *affiliation*."""
+        return self._select(
+            "SELECT DISTINCT bildid FROM contributors WHERE affiliation LIKE ? ESCAPE '\\'",
+            (f"%{_escape_like(affiliation)}%",),
+        )
+
+    def search(self, text: str, limit: Optional[int] = None) -> list:
+        """
+        Returns the IDs of the datasets matching *text*, best match first.
+
+        Datasets are ranked with BM25 over the ``project``, ``contributor``,
+        ``affiliation``, ``species``, ``technique``, ``modality``,
+        ``genotype`` and ``description`` fields. Words are stemmed and all
+        of them must match. The query may use the SQLite FTS5 syntax:
+        ``OR`` and ``NOT``, parentheses, ``"quoted phrases"``, ``prefix*``
+        and field filters such as ``species:mouse``. Text that is not
+        valid FTS5 syntax (e.g. ``H19.28.012``) is searched as plain words.
+
+        Args:
+            text (str): The query.
+            limit (int, optional): Maximum number of IDs. Defaults to all.
+
+        Returns:
+            list[str]: Matching dataset IDs.
+
+        Example:
+            >>> from brainimagelibrary.mirror import get_mirror
+            >>> get_mirror().search("species:mouse (cortex OR hippocampus) NOT rabies")  # doctest: +SKIP
+            ['ace-cat', 'act-bag']
+        """
+        if not text.strip():
+            return []
+        if not self._fts:
+            return self._scan(text)[:limit]
+        sql = "SELECT bildid FROM search WHERE search MATCH ? ORDER BY rank"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            try:
+                rows = self._db.execute(sql, (text,)).fetchall()
+            except sqlite3.OperationalError:
+                rows = self._db.execute(sql, (_quote_terms(text),)).fetchall()
+        return [row[0] for row in rows]
+
+    def by_text(self, text: str) -> dict:
+        """Returns the datasets matching *text*, best match first; see :meth:`search`."""
+        return self._combine(self.search(text))
+
+    def _scan(self, text: str) -> list:
+        """Returns the datasets whose metadata contains every word of *text*."""
+        words = text.split()
+        where = " AND ".join(["body LIKE ? ESCAPE '\\'"] * len(words))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT bildid FROM datasets WHERE {where} ORDER BY bildid",
+                [f"%{_escape_like(word)}%" for word in words],
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def by_version(self, version: str = "2.0") -> list:
+        """Returns the IDs of the datasets described with metadata *version*."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT bildid FROM submission WHERE metadata = ? ORDER BY bildid", (version,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def bildids(self) -> list:
+        """Returns the IDs of every mirrored dataset."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT bildid FROM datasets ORDER BY bildid")]
+
+    def _select(self, sql: str, params) -> dict:
+        """Returns ``{"retjson": [...]}`` for the bildids selected by *sql*, or {}."""
+        with self._lock:
+            bildids = [row[0] for row in self._db.execute(sql, params)]
+        return self._combine(bildids)
+
+    def _combine(self, bildids: list) -> dict:
+        records = []
+        for bildid in bildids:
+            records.extend(self.by_id(bildid).get("retjson", []))
+        return {"retjson": records} if records else {}
+
+    def _count(self, table: str) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def stats(self) -> dict:
+        """
+        Returns the size and age of the mirror.
+
+        Returns:
+            dict: Number of ``datasets``, rows per normalized table, and the
+                ``oldest`` and ``newest`` fetch times (epoch seconds or None).
+        """
+        with self._lock:
+            count, oldest, newest = self._db.execute(
+                "SELECT COUNT(*), MIN(fetched), MAX(fetched) FROM datasets"
+            ).fetchone()
+            stats = {"datasets": count}
+            for table in _TABLES:
+                stats[table] = self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        stats["oldest"] = oldest
+        stats["newest"] = newest
+        return stats
+
+    def close(self) -> None:
+        """Closes the database."""
+        with self._lock:
+            self._db.close()
+
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _entries(record: dict, section: str) -> list:
+    """Returns the entries of a metadata section; ``Submission`` is a single dict."""
+    entries = record.get(section) or []
+    if isinstance(entries, dict):
+        entries = [entries]
+    return [entry for entry in entries if isinstance(entry, dict)]
+
+
+def _quote_terms(text: str) -> str:
+    """Turns *text* into an FTS5 query that matches its words literally."""
+    terms = []
+    for word in text.split():
+        match = _FIELD_TERM.match(word)
+        field, word = (match.group(1) + ":", match.group(2)) if match else ("", word)
+        terms.append(field + '"' + word.replace('"', '""') + '"')
+    return " ".join(terms)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+_mirror: Optional[Mirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> Mirror:
+    """Returns the process-wide :class:`Mirror`, opening the default file on first use."""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = Mirror()
+    return _mirror
+
+
+def set_mirror(mirror: Optional[Mirror]) -> Optional[Mirror]:
+    """
+    Replaces the process-wide :class:`Mirror`.
+
+    Args:
+        mirror (Mirror | None): The mirror offline queries should use. None
+            reopens the default file on next use.
+
+    Returns:
+        Mirror | None: The previously installed mirror.
+    """
+    global _mirror
+    with _mirror_lock:
+        previous, _mirror = _mirror, mirror
+    return previous
@@ -1,13 +1,23 @@
 """Query dataset metadata from the Brain Image Library /query endpoint."""
 
 import logging
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
 
-from ._api import BIL_API_BASE, DOWNLOAD_BASE, _fetch
+from ._api import BIL_API_BASE, DEFAULT_BATCH_WORKERS, DOWNLOAD_BASE, _batch, _fetch
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["by_id", "by_directory", "by_url", "by_affiliation", "by_text", "by_version"]
+__all__ = [
+    "by_id",
+    "by_directory",
+    "by_url",
+    "by_ids",
+    "by_directories",
+    "by_urls",
+    "by_affiliation",
+    "by_text",
+    "by_version",
+]
 
 _ENDPOINT = f"{BIL_API_BASE}/query"
 
@@ -16,6 +26,7 @@ def by_id(
     bildid: Optional[str] = None,
     params: Optional[dict] = None,
     headers: Optional[dict] = None,
+    offline: bool = False,
 ) -> Optional[dict]:
     """
     Retrieves metadata for a dataset by its Brain Image Library ID.
@@ -28,6 +39,9 @@ def by_id(
             the function returns an empty dictionary.
         params (dict, optional): Query parameters to include in the API request. Defaults to None.
         headers (dict, optional): HTTP headers to include in the API request. Defaults to None.
+        offline (bool, optional): Answer from the local
+            :class:`~brainimagelibrary.mirror.Mirror` instead of the API;
+            *params* and *headers* are ignored. Defaults to False.
 
     Returns:
         dict: The metadata for the dataset if the request is successful.
@@ -47,6 +61,8 @@ def by_id(
     """
     if not bildid:
         return {}
+    if offline:
+        return _mirror().by_id(bildid)
     return _fetch(f"{_ENDPOINT}?bildid={bildid}", params=params, headers=headers)
 
 
@@ -54,6 +70,7 @@ def by_directory(
     directory: Optional[str] = None,
     params: Optional[dict] = None,
     headers: Optional[dict] = None,
+    offline: bool = False,
 ) -> Optional[dict]:
     """
     Retrieves metadata for a dataset by its directory path.
@@ -66,6 +83,9 @@ def by_directory(
             the function returns an empty dictionary.
         params (dict, optional): Query parameters to include in the API request. Defaults to None.
         headers (dict, optional): HTTP headers to include in the API request. Defaults to None.
+        offline (bool, optional): Answer from the local
+            :class:`~brainimagelibrary.mirror.Mirror` instead of the API;
+            *params* and *headers* are ignored. Defaults to False.
 
     Returns:
         dict: The metadata for the dataset if the request is successful.
@@ -85,10 +105,12 @@ def by_directory(
     """
     if not directory:
         return {}
+    if offline:
+        return _mirror().by_directory(directory)
     return _fetch(f"{_ENDPOINT}?bildirectory={directory}", params=params, headers=headers)
 
 
-def by_url(url: Optional[str] = None) -> Optional[dict]:
+def by_url(url: Optional[str] = None, offline: bool = False) -> Optional[dict]:
     """
     Retrieves metadata for a dataset by its download URL.
 
@@ -99,6 +121,7 @@ def by_url(url: Optional[str] = None) -> Optional[dict]:
         url (str, optional): The download URL of the dataset
             (e.g. ``"https://download.brainimagelibrary.org/2019/02/13/H19.28.012.MITU.01.05"``).
             If not provided, returns an empty dictionary.
+        offline (bool, optional): Answer from the local mirror. Defaults to False.
 
     Returns:
         dict: The metadata for the dataset if the request is successful.
@@ -116,13 +139,138 @@ def by_url(url: Optional[str] = None) -> Optional[dict]:
     if not url:
         return {}
     directory = url.replace(DOWNLOAD_BASE, "/bil/data")
+    if offline:
+        return by_directory(directory=directory, offline=True)
     return by_directory(directory=directory)
 
 
+def by_ids(
+    bildids: Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    stream: bool = False,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+    offline: bool = False,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Retrieves metadata for many datasets by their Brain Image Library IDs.
+
+    Duplicate and empty IDs are dropped, and the remaining lookups run
+    concurrently through :func:`by_id` with at most ``max_workers`` requests
+    in flight. A failing lookup yields ``None`` (or the raised exception) for
+    that ID rather than aborting the batch.
+
+    Args:
+        bildids (Iterable[str]): The dataset IDs to look up.
+        max_workers (int, optional): Maximum number of concurrent requests.
+            Defaults to 8.
+        stream (bool, optional): When True, return an iterator yielding
+            ``(bildid, result)`` pairs as each lookup completes. Defaults to False.
+        params (dict, optional): Query parameters to include in each API request. Defaults to None.
+        headers (dict, optional): HTTP headers to include in each API request. Defaults to None.
+        offline (bool, optional): Answer from the local mirror. Defaults to False.
+
+    Returns:
+        list: ``(bildid, result)`` pairs in the order the IDs were first given.
+        Iterator[tuple]: ``(bildid, result)`` pairs in completion order when
+            ``stream`` is True.
+
+    Example:
+        >>> from brainimagelibrary import query
+        >>> results = query.by_ids(["act-bag", "ace-and", "act-bag"])
+        >>> print([bildid for bildid, _ in results])
+        ['act-bag', 'ace-and']
+        >>> for bildid, metadata in query.by_ids(["act-bag", "ace-and"], stream=True):
+        ...     print(bildid, "retjson" in metadata)
+    """
+    if offline:
+        # Mirror lookups are local and serialized, so threads would not help.
+        return _batch(
+            lambda bildid: by_id(bildid=bildid, offline=True), bildids, max_workers=1, stream=stream
+        )
+    return _batch(
+        lambda bildid: by_id(bildid=bildid, params=params, headers=headers),
+        bildids,
+        max_workers=max_workers,
+        stream=stream,
+    )
+
+
+def by_directories(
+    directories: Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    stream: bool = False,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+    offline: bool = False,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Retrieves metadata for many datasets by their directory paths.
+
+    Batch counterpart of :func:`by_directory`; see :func:`by_ids` for the
+    deduplication, concurrency and error semantics.
+
+    Args:
+        directories (Iterable[str]): The dataset directory paths to look up.
+        max_workers (int, optional): Maximum number of concurrent requests.
+            Defaults to 8.
+        stream (bool, optional): When True, return an iterator yielding
+            ``(directory, result)`` pairs as each lookup completes. Defaults to False.
+        params (dict, optional): Query parameters to include in each API request. Defaults to None.
+        headers (dict, optional): HTTP headers to include in each API request. Defaults to None.
+        offline (bool, optional): Answer from the local mirror. Defaults to False.
+
+    Returns:
+        list | Iterator[tuple]: ``(directory, result)`` pairs.
+    """
+    if offline:
+        return _batch(
+            lambda directory: by_directory(directory=directory, offline=True),
+            directories,
+            max_workers=1,
+            stream=stream,
+        )
+    return _batch(
+        lambda directory: by_directory(directory=directory, params=params, headers=headers),
+        directories,
+        max_workers=max_workers,
+        stream=stream,
+    )
+
+
+def by_urls(
+    urls: Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    stream: bool = False,
+    offline: bool = False,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Retrieves metadata for many datasets by their download URLs.
+
+    Batch counterpart of :func:`by_url`; see :func:`by_ids` for the
+    deduplication, concurrency and error semantics.
+
+    Args:
+        urls (Iterable[str]): The dataset download URLs to look up.
+        max_workers (int, optional): Maximum number of concurrent requests.
+            Defaults to 8.
+        stream (bool, optional): When True, return an iterator yielding
+            ``(url, result)`` pairs as each lookup completes. Defaults to False.
+        offline (bool, optional): Answer from the local mirror. Defaults to False.
+
+    Returns:
+        list | Iterator[tuple]: ``(url, result)`` pairs.
+    """
+    if offline:
+        return _batch(lambda url: by_url(url=url, offline=True), urls, max_workers=1, stream=stream)
+    return _batch(by_url, urls, max_workers=max_workers, stream=stream)
+
+
 def by_affiliation(
     affiliation: str,
     params: Optional[dict] = None,
     headers: Optional[dict] = None,
+    offline: bool = False,
 ) -> Optional[dict]:
     """
     Retrieves datasets associated with a contributor's affiliation.
@@ -137,6 +285,9 @@ def by_affiliation(
             API request. Defaults to None.
         headers (dict, optional): HTTP headers to include in the API request.
             Defaults to None.
+        offline (bool, optional): Answer from the local
+            :class:`~brainimagelibrary.mirror.Mirror` instead of the API;
+            *params* and *headers* are ignored. Defaults to False.
 
     Returns:
         dict: The API response containing matching contributor/dataset records.
@@ -155,6 +306,8 @@ def by_affiliation(
         >>> print(len(results) > 0)
         True
     """
+    if offline:
+        return _mirror().by_affiliation(affiliation)
     return _fetch(f"{_ENDPOINT}?affiliation={affiliation}", params=params, headers=headers)
 
 
@@ -162,6 +315,7 @@ def by_text(
     text: str,
     params: Optional[dict] = None,
     headers: Optional[dict] = None,
+    offline: bool = False,
 ) -> Optional[dict]:
     """
     Performs a full-text search across Brain Image Library datasets.
@@ -175,6 +329,12 @@ def by_text(
             API request. Defaults to None.
         headers (dict, optional): HTTP headers to include in the API request.
             Defaults to None.
+        offline (bool, optional): Answer from the local
+            :class:`~brainimagelibrary.mirror.Mirror` instead of the API;
+            *params* and *headers* are ignored. Records are then ranked by
+            relevance, and *text* may use field filters and boolean
+            operators; see :meth:`~brainimagelibrary.mirror.Mirror.search`.
+            Defaults to False.
 
     Returns:
         dict: The API response containing matching dataset records.
@@ -193,10 +353,12 @@ def by_text(
         >>> print(len(results) > 0)
         True
     """
+    if offline:
+        return _mirror().by_text(text)
     return _fetch(f"{_ENDPOINT}/fulltext?text={text}", params=params, headers=headers)
 
 
-def by_version(version: str = "2.0") -> Optional[list]:
+def by_version(version: str = "2.0", offline: bool = False) -> Optional[list]:
     """
     Retrieves dataset IDs based on metadata version.
 
@@ -205,6 +367,7 @@ def by_version(version: str = "2.0") -> Optional[list]:
 
     Args:
         version (str, optional): The metadata version to query. Defaults to "2.0".
+        offline (bool, optional): Answer from the local mirror. Defaults to False.
 
     Returns:
         list: A list of dataset IDs (`bildids`) if the request is successful.
@@ -222,7 +385,15 @@ def by_version(version: str = "2.0") -> Optional[list]:
         >>> print(len(ids) > 0)
         True
     """
+    if offline:
+        return _mirror().by_version(version)
     data = _fetch(f"{_ENDPOINT}/submission?metadata={version}")
     if not data:
         return data  # None (request failed) or {} (not found)
     return data.get("bildids")
+
+
+def _mirror():
+    from .mirror import get_mirror  # mirror imports reports, which imports this module
+
+    return get_mirror()
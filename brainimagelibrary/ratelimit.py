@@ -0,0 +1,236 @@
+"""Per-host request rate and concurrency limits shared by every thread in the process."""
+
+import logging
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["RateLimiter", "TokenBucket", "AdaptiveConcurrency"]
+
+#: Responses that mean "slow down" and shrink a host's concurrency limit.
+THROTTLE_STATUSES = frozenset((429, 503))
+
+# Conservative defaults for the citation services. ``rate`` is requests per
+# second, ``burst`` the bucket size and ``concurrency`` the most requests in
+# flight at once. Hosts not listed here are not limited.
+DEFAULT_LIMITS = {
+    "api.datacite.org": {"rate": 10, "burst": 10, "concurrency": 8},
+    "api.crossref.org": {"rate": 5, "burst": 5, "concurrency": 3},
+    "opencitations.net": {"rate": 5, "burst": 5, "concurrency": 4},
+    "api.semanticscholar.org": {"rate": 1, "burst": 1, "concurrency": 2},
+}
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Tokens accrue at ``rate`` per second up to ``burst``. Each request takes
+    one token; when none is left the request is scheduled for the moment the
+    next token arrives, so waiting callers are served in arrival order.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (float, optional): Bucket capacity. Defaults to ``max(1, rate)``.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Blocks until a token is available. Returns the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveConcurrency:
+    """
+    A concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Every successful request raises the limit by ``1 / limit`` (about one per
+    round of requests); a throttled one multiplies it by ``decrease``. At
+    most one decrease happens per ``cooldown`` seconds, so a burst of 429s
+    from requests that were already in flight counts once.
+
+    Args:
+        maximum (int): Upper bound on requests in flight.
+        minimum (int, optional): Lower bound. Defaults to 1.
+        decrease (float, optional): Factor applied on throttling. Defaults to 0.5.
+        cooldown (float, optional): Minimum seconds between decreases.
+            Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        minimum: int = 1,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self.throttled = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """Blocks until a request may start. Returns the time spent waiting."""
+        start = time.monotonic()
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return time.monotonic() - start
+
+    def release(self, throttled: bool = False) -> None:
+        """Marks a request as finished and adapts the limit."""
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self._last_decrease = now
+                    self.limit = max(float(self.minimum), self.limit * self.decrease)
+                    logger.info("Throttled; concurrency limit lowered to %d.", int(self.limit))
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class _Host:
+    __slots__ = ("bucket", "concurrency", "requests", "waited")
+
+    def __init__(self, rate=None, burst=None, concurrency=None) -> None:
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.concurrency = AdaptiveConcurrency(concurrency) if concurrency else None
+        self.requests = 0
+        self.waited = 0.0
+
+
+class RateLimiter:
+    """
+    Request limits keyed by host, shared across every thread pool.
+
+    The :class:`~brainimagelibrary.client.Client` takes a slot from the
+    limiter before each request and returns it with the response status.
+    Each configured host gets a :class:`TokenBucket` for its request rate and
+    an :class:`AdaptiveConcurrency` limit that halves when the host answers
+    429 or 503 and creeps back up as requests succeed. Bulk jobs therefore
+    settle at the rate a service sustains instead of alternating between
+    bursts and bans, however many threads they use.
+
+    Args:
+        limits (dict, optional): ``{host: {"rate": ..., "burst": ...,
+            "concurrency": ...}}``; any key may be omitted. Defaults to
+            conservative limits for DataCite, Crossref, OpenCitations and
+            Semantic Scholar. Pass ``{}`` to disable limiting.
+
+    Example:
+        >>> from brainimagelibrary import client
+        >>> from brainimagelibrary.ratelimit import DEFAULT_LIMITS, RateLimiter
+        >>> limits = dict(DEFAULT_LIMITS)
+        >>> limits["api.crossref.org"] = {"rate": 10, "burst": 10, "concurrency": 3}
+        >>> client.set_client(client.Client(limiter=RateLimiter(limits)))
+    """
+
+    def __init__(self, limits: Optional[dict] = None) -> None:
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> Optional[_Host]:
+        host = urlsplit(url).hostname
+        if host not in self.limits:
+            return None
+        state = self._hosts.get(host)
+        if state is None:
+            with self._lock:
+                state = self._hosts.get(host)
+                if state is None:
+                    state = self._hosts[host] = _Host(**self.limits[host])
+        return state
+
+    def acquire(self, url: str) -> Optional[_Host]:
+        """
+        Waits until a request to *url* may be sent.
+
+        Returns:
+            An opaque slot to pass to :meth:`release`, or None if the host
+            is not limited.
+        """
+        state = self._host(url)
+        if state is None:
+            return None
+        waited = 0.0
+        if state.concurrency is not None:
+            waited += state.concurrency.acquire()
+        if state.bucket is not None:
+            waited += state.bucket.acquire()
+        with self._lock:
+            state.requests += 1
+            state.waited += waited
+        return state
+
+    def reserve(self, url: str) -> float:
+        """
+        Takes a rate token for *url* without blocking.
+
+        Used by the asyncio client, which sleeps for the returned number of
+        seconds on its event loop instead of blocking a thread.
+        """
+        state = self._host(url)
+        if state is None or state.bucket is None:
+            return 0.0
+        wait = state.bucket.reserve()
+        with self._lock:
+            state.requests += 1
+            state.waited += wait
+        return wait
+
+    def release(self, slot: Optional[_Host], status: Optional[int] = None) -> None:
+        """Returns a slot taken by :meth:`acquire`, with the response status if any."""
+        if slot is not None and slot.concurrency is not None:
+            slot.concurrency.release(throttled=status in THROTTLE_STATUSES)
+
+    def stats(self) -> dict:
+        """
+        Returns per-host limiter state.
+
+        Returns:
+            dict: For each host that has been contacted: ``requests`` sent,
+                seconds ``waited`` in total, current ``concurrency`` limit,
+                ``in_flight`` requests and ``throttled`` responses.
+        """
+        stats = {}
+        with self._lock:
+            for host, state in self._hosts.items():
+                entry = {"requests": state.requests, "waited": round(state.waited, 3)}
+                if state.concurrency is not None:
+                    entry["concurrency"] = int(state.concurrency.limit)
+                    entry["in_flight"] = state.concurrency.in_flight
+                    entry["throttled"] = state.concurrency.throttled
+                stats[host] = entry
+        return stats
@@ -7,42 +7,65 @@ and ``/bil/data/inventory/daily/`` when those paths are available.
 
 Public functions
 ----------------
-daily(option, overwrite)
+daily(option, overwrite, incremental)
     Return today's inventory report as a :class:`pandas.DataFrame`.
 get_all_bildids()
     Return all unique dataset IDs across metadata versions 1.0 and 2.0.
 
 Private helpers (not part of the public API)
 ---------------------------------------------
-_get_did(bildid)
+_get_did(bildid, metadata)
     Fetch combined metadata + inventory data for a single dataset.
-_create_daily_report(overwrite)
-    Build the daily report locally when the remote download fails.
+_create_daily_report(overwrite, incremental)
+    Build the daily report locally when the remote download fails, optionally
+    reusing unchanged rows from the previous report.
+_get_inventory_validators(bildids)
+    ``HEAD`` every inventory file and collect its ``ETag``/``Last-Modified``.
+_reusable_rows(previous, old, inventories, today)
+    Pick the rows of the previous report that are still current, re-checking
+    the metadata of a rotating share of them.
+_load_previous_report(today)
+    Load the most recent earlier report and its validators sidecar.
+_read_report(path)
+    Load a saved report, preferring its Parquet copy over the TSV.
 """
 
+import ast
+import hashlib
+import json
 import logging
 import requests
 from typing import Optional
 
+from ._api import _batch
+from .client import DEFAULT_POOL_MAXSIZE, get_client
 from .query import by_id, by_version
 from .inventory import get as inventory_get
+from .inventory import _url as inventory_url
 from tqdm import tqdm
 from pathlib import Path
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 __all__ = ["daily", "get_all_bildids"]
 
+# Metadata edits leave the inventory file alone, so rows reused by an
+# incremental report have their /retrieve metadata re-checked at least this
+# often, a rotating 1/METADATA_RECHECK_DAYS share of them on each run.
+METADATA_RECHECK_DAYS = 7
 
-def _get_did(bildid: str) -> dict:
+
+def _get_did(bildid: str, metadata: Optional[dict] = None) -> dict:
     """
     Retrieves detailed metadata for a dataset by its ID.
 
     Args:
         bildid (str): The unique identifier of the dataset.
+        metadata (dict, optional): The dataset's ``/retrieve`` response, when
+            the caller already has it. Fetched with :func:`by_id` otherwise.
 
     Returns:
         dict: A dictionary containing the dataset metadata, including:
@@ -72,7 +95,8 @@ def _get_did(bildid: str) -> dict:
         except (KeyError, IndexError, TypeError):
             return default
 
-    metadata = by_id(bildid=bildid)
+    if metadata is None:
+        metadata = by_id(bildid=bildid)
     metadata = metadata.get("retjson", [{}])[0]
 
     inv = inventory_get(bildid=bildid)
@@ -101,7 +125,9 @@ def _get_did(bildid: str) -> dict:
     }
 
 
-def daily(option: str = "simple", overwrite: bool = False) -> pd.DataFrame:
+def daily(
+    option: str = "simple", overwrite: bool = False, incremental: bool = False
+) -> pd.DataFrame:
     """
     Retrieve the daily inventory report from the Brain Image Library.
 
@@ -125,6 +151,10 @@ def daily(option: str = "simple", overwrite: bool = False) -> pd.DataFrame:
 
         overwrite (bool, optional): When ``True``, skip any cached file on disk
             and force a fresh download or regeneration.  Defaults to ``False``.
+        incremental (bool, optional): When the report has to be built locally,
+            start from the most recent previous report and only re-fetch
+            datasets that are new or whose inventory or metadata changed.  See
+            :func:`_create_daily_report`.  Defaults to ``False``.
 
     Returns:
         pd.DataFrame: A DataFrame containing the inventory data.
@@ -147,7 +177,7 @@ def daily(option: str = "simple", overwrite: bool = False) -> pd.DataFrame:
     def fetch_and_load_csv(url, file_path):
         """Helper function to download and load a TSV file as a DataFrame."""
         try:
-            response = requests.get(url, timeout=30)
+            response = get_client().get(url, timeout=30)
             if response.status_code == 200:
                 with open(file_path, "wb") as file:
                     file.write(response.content)
@@ -189,17 +219,19 @@ def daily(option: str = "simple", overwrite: bool = False) -> pd.DataFrame:
         logger.warning(
             "Cannot download daily report from %s. Building report from scratch...", url
         )
-        df = _create_daily_report(overwrite)
+        df = _create_daily_report(overwrite, incremental=incremental)
 
     return df
 
 
-def _create_daily_report(overwrite: bool = False) -> pd.DataFrame:
+def _create_daily_report(
+    overwrite: bool = False, incremental: bool = False
+) -> pd.DataFrame:
     """
     Create or load the daily inventory report from local storage.
 
-    Checks for an existing report (``<YYYYMMDD>.tsv``) in the following
-    locations, in order:
+    Checks for an existing report (``<YYYYMMDD>.parquet``, else
+    ``<YYYYMMDD>.tsv``) in the following locations, in order:
 
     1. ``/bil/data/inventory/daily/`` — BIL shared filesystem (preferred).
     2. ``reports/`` — local working-directory fallback.
@@ -207,68 +239,425 @@ def _create_daily_report(overwrite: bool = False) -> pd.DataFrame:
     If no cached file is found (or ``overwrite`` is ``True`` for the BIL path
     check), the report is generated by iterating over all datasets in metadata
     versions 1.0 and 2.0 via :func:`__get_did`, deduplicating on ``bildid``,
-    and saving the result as a tab-separated file to both ``reports/`` and, if
-    the path exists, ``/bil/data/inventory/daily/``.
+    and saving the result as a tab-separated file, plus a Parquet copy when
+    pyarrow is installed (see :func:`_save_report`), to both ``reports/`` and,
+    if the path exists, ``/bil/data/inventory/daily/``.
+
+    A ``<YYYYMMDD>.validators.json`` sidecar is written alongside each
+    report, recording for every dataset the ``ETag``/``Last-Modified`` of its
+    inventory file (one ``HEAD`` request each), a digest of its ``/retrieve``
+    metadata and the date that digest was taken.  In incremental mode the
+    most recent earlier report and its sidecar are loaded and rows whose
+    inventory is unchanged are carried over; see :func:`_reusable_rows` for
+    how their metadata is kept current.  Only datasets that are new, changed
+    or missing from the previous report are fetched with :func:`__get_did`,
+    each with a single ``/retrieve`` request.  Without a previous report the
+    full build is performed.
 
     Args:
         overwrite (bool, optional): When ``True``, skip the BIL filesystem
             cache check and regenerate the report from scratch.
             Defaults to ``False``.
+        incremental (bool, optional): When ``True``, reuse rows from the
+            previous report for datasets that are unchanged.
+            Defaults to ``False``.
 
     Returns:
         pd.DataFrame: The daily inventory report as a DataFrame.
 
     Side Effects:
-        - Reads ``<YYYYMMDD>.tsv`` from disk when a cached copy exists.
+        - Reads ``<YYYYMMDD>.parquet`` or ``<YYYYMMDD>.tsv`` from disk when a
+          cached copy exists.
         - Creates the ``reports/`` directory if it does not already exist.
-        - Writes ``reports/<YYYYMMDD>.tsv`` after generating a new report.
-        - Writes ``/bil/data/inventory/daily/<YYYYMMDD>.tsv`` when that
-          directory is available on the BIL shared filesystem.
+        - Writes ``reports/<YYYYMMDD>.tsv`` (and ``.parquet``) after
+          generating a new report.
+        - Writes ``/bil/data/inventory/daily/<YYYYMMDD>.tsv`` (and
+          ``.parquet``) when that directory is available on the BIL shared
+          filesystem.
+        - Writes a ``<YYYYMMDD>.validators.json`` sidecar next to each report.
     """
     today = datetime.today().strftime("%Y%m%d")
 
     if not overwrite:
-        bil_path = Path(f"/bil/data/inventory/daily/{today}.tsv")
-        if bil_path.exists():
-            logger.info("Daily report %s found on disk.", bil_path)
-            return pd.read_csv(bil_path, sep="\t")
-
-        local_path = Path(f"reports/{today}.tsv")
-        if local_path.exists():
-            logger.info("Daily report %s found on disk.", local_path)
-            return pd.read_csv(local_path, sep="\t")
+        for directory in (Path("/bil/data/inventory/daily"), Path("reports")):
+            df = _read_report(directory / f"{today}.tsv")
+            if df is not None:
+                logger.info("Daily report for %s found in %s.", today, directory)
+                return df
 
     all_datasets = get_all_bildids()
+    # Inventory validators are taken before fetching so that a dataset changed
+    # mid-build is picked up by the next incremental run.
+    inventories = _get_inventory_validators(all_datasets)
+
+    previous = pd.DataFrame()
+    validators = {}
+    prefetched = {}
+    if incremental:
+        previous, previous_validators = _load_previous_report(today)
+        previous, validators, prefetched = _reusable_rows(
+            previous, previous_validators, inventories, today
+        )
+        logger.info("Reusing %d unchanged datasets from the previous report.", len(previous))
+
+    reused = set(previous["bildid"]) if not previous.empty else set()
+    to_fetch = [bildid for bildid in all_datasets if bildid not in reused]
 
-    logger.info("Processing %d unique datasets in parallel.", len(all_datasets))
+    def build(bildid):
+        metadata = prefetched.get(bildid)
+        if metadata is None:
+            metadata = by_id(bildid=bildid)
+        return _get_did(bildid, metadata=metadata), _metadata_digest(metadata)
+
+    logger.info("Processing %d unique datasets in parallel.", len(to_fetch))
     data = []
-    with ThreadPoolExecutor() as executor:
-        futures = {
-            executor.submit(_get_did, dataset): dataset for dataset in all_datasets
-        }
-        for future in tqdm(as_completed(futures), total=len(futures)):
-            try:
-                result = future.result()
-                if result is not None:
-                    data.append(result)
-            except Exception as e:
-                bildid = futures[future]
-                logger.warning("Failed to fetch dataset %s: %s", bildid, e)
-
-    df = pd.DataFrame(data).drop_duplicates(subset=["bildid"])
+    results = _batch(build, to_fetch, max_workers=DEFAULT_POOL_MAXSIZE, stream=True)
+    for bildid, result in tqdm(results, total=len(to_fetch)):
+        if isinstance(result, Exception):
+            logger.warning("Failed to fetch dataset %s: %s", bildid, result)
+            continue
+        row, digest = result
+        if row is None:
+            continue
+        data.append(row)
+        if bildid in inventories:
+            validators[bildid] = {"inventory": inventories[bildid], "metadata": digest, "checked": today}
+
+    frames = [frame for frame in (previous, pd.DataFrame(data)) if not frame.empty]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if not df.empty:
+        order = {bildid: i for i, bildid in enumerate(all_datasets)}
+        df = (
+            df.drop_duplicates(subset=["bildid"], keep="last")
+            .sort_values("bildid", key=lambda col: col.map(order))
+            .reset_index(drop=True)
+        )
+    # Only record validators for rows that made it into the report, so failed
+    # datasets are retried next time.
+    fetched = set(df["bildid"]) if not df.empty else set()
+    validators = {k: v for k, v in validators.items() if k in fetched}
 
     reports_dir = Path("reports")
     reports_dir.mkdir(exist_ok=True)
-    df.to_csv(reports_dir / f"{today}.tsv", sep="\t", index=False)
+    _save_report(df, validators, reports_dir, today)
 
     # save to BIL shared filesystem
     bil_dir = Path("/bil/data/inventory/daily")
     if bil_dir.exists():
-        df.to_csv(bil_dir / f"{today}.tsv", sep="\t", index=False)
+        _save_report(df, validators, bil_dir, today)
+
+    return df
+
+
+def _save_report(df: pd.DataFrame, validators: dict, directory: Path, date: str) -> None:
+    """
+    Writes ``<date>.tsv`` and its ``<date>.validators.json`` sidecar to *directory*.
+
+    When pyarrow is installed a ``<date>.parquet`` copy is written as well,
+    typed by :func:`_report_schema`, which :func:`_read_report` prefers. The
+    TSV is kept for readers without pyarrow.
+    """
+    df.to_csv(directory / f"{date}.tsv", sep="\t", index=False)
+    _write_parquet(df, directory / f"{date}.parquet")
+    with open(directory / f"{date}.validators.json", "w") as f:
+        json.dump(validators, f)
+
+
+def _arrow() -> Optional[tuple]:
+    """Returns ``(pyarrow, pyarrow.parquet)``, or None if pyarrow is not installed."""
+    try:
+        # deferred: optional, and slow to import for callers that never touch Parquet
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pa, pq
+
+
+def _report_schema(pa) -> dict:
+    """
+    Returns the Arrow type of each column written by :func:`_get_did`.
+
+    Low-cardinality text is dictionary-encoded and read back as pandas
+    Categoricals; the inventory summaries keep their list and map structure
+    instead of becoming ``"{'tif': 2}"`` strings as they do in the TSV.
+    """
+    category = pa.dictionary(pa.int32(), pa.string())
+    counts = pa.map_(pa.string(), pa.int64())
+    return {
+        "metadata_version": category,
+        "bildid": pa.string(),
+        "bildate": pa.string(),
+        "contributor": pa.string(),
+        "affiliation": category,
+        "award_number": pa.string(),
+        "project": category,
+        "consortium": category,
+        "bildirectory": pa.string(),
+        "generalmodality": category,
+        "technique": category,
+        "species": category,
+        "taxonomy": category,
+        "genotype": category,
+        "samplelocalid": pa.string(),
+        "number_of_files": pa.int64(),
+        "size": pa.int64(),
+        "file_types": pa.list_(pa.string()),
+        "frequencies": counts,
+        "mime_types": counts,
+    }
+
+
+def _missing(value) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value)
+
+
+def _nested(value):
+    """Returns a list or dict cell as such, parsing the repr a TSV round trip leaves."""
+    if isinstance(value, str):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return None
+    return None if _missing(value) else value
+
+
+def _text(value, version: bool = False) -> Optional[str]:
+    """
+    Returns *value* as report text.
 
+    Reading a TSV back turns numeric-looking columns into floats, so an
+    ``award_number`` of ``10090`` comes back as ``10090.0``; whole floats are
+    written as integers again. Version numbers keep their decimals: ``2.0``
+    is how fresh rows spell ``metadata_version``.
+    """
+    if _missing(value):
+        return None
+    if isinstance(value, float) and value.is_integer() and not version:
+        return str(int(value))
+    return str(value)
+
+
+def _column(pa, values: pd.Series, type_, version: bool = False):
+    """Converts *values* to an Arrow array of *type_*, coercing loosely typed cells."""
+    if pa.types.is_dictionary(type_) or pa.types.is_string(type_):
+        array = pa.array([_text(v, version) for v in values], pa.string())
+        return array.dictionary_encode() if pa.types.is_dictionary(type_) else array
+    if pa.types.is_integer(type_):
+        return pa.array([None if _missing(v) else int(v) for v in values], type_)
+    if pa.types.is_map(type_):
+        cells = (_nested(v) for v in values)
+        return pa.array(
+            [{str(k): int(n) for k, n in c.items()} if isinstance(c, dict) else None for c in cells],
+            type_,
+        )
+    cells = (_nested(v) for v in values)
+    return pa.array(
+        [[str(x) for x in c] if isinstance(c, (list, tuple)) else None for c in cells], type_
+    )
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Writes *df* to *path* with :func:`_report_schema`; a no-op without pyarrow."""
+    arrow = _arrow()
+    if arrow is None:
+        return
+    pa, pq = arrow
+    schema = _report_schema(pa)
+    try:
+        arrays = [
+            _column(pa, df[name], schema[name], version=name == "metadata_version")
+            if name in schema
+            else pa.array(df[name], from_pandas=True)
+            for name in df.columns
+        ]
+        pq.write_table(pa.Table.from_arrays(arrays, names=[str(c) for c in df.columns]), path)
+    except (pa.ArrowException, ValueError, TypeError, OSError) as e:
+        logger.warning("Could not write %s, keeping the TSV only: %s", path, e)
+
+
+def _read_parquet(path: Path) -> Optional[pd.DataFrame]:
+    """Reads a report written by :func:`_write_parquet`, or returns None."""
+    if not path.exists():
+        return None
+    arrow = _arrow()
+    if arrow is None:
+        logger.debug("pyarrow is not installed, ignoring %s.", path)
+        return None
+    pa, pq = arrow
+    try:
+        table = pq.read_table(path)
+    except (pa.ArrowException, OSError) as e:
+        logger.warning("%s is unreadable, falling back to the TSV: %s", path, e)
+        return None
+    df = table.to_pandas()
+    for field in table.schema:
+        if pa.types.is_map(field.type) or pa.types.is_list(field.type):
+            cells = table.column(field.name).to_pylist()
+            if pa.types.is_map(field.type):
+                cells = [None if c is None else dict(c) for c in cells]
+            df[field.name] = pd.Series(cells, index=df.index, dtype=object)
     return df
 
 
+def _read_report(path: Path) -> Optional[pd.DataFrame]:
+    """
+    Loads the report saved at *path* (a ``.tsv``).
+
+    The Parquet copy next to it is preferred; the TSV is read when there is
+    none, it cannot be read, or pyarrow is not installed.
+
+    Returns:
+        pd.DataFrame | None: The report, or None if neither file exists.
+    """
+    df = _read_parquet(path.with_suffix(".parquet"))
+    if df is not None:
+        return df
+    if path.exists():
+        return pd.read_csv(path, sep="\t")
+    return None
+
+
+def _get_inventory_validators(bildids: list) -> dict:
+    """
+    Returns ``{bildid: validator}`` for every inventory file that exists.
+
+    The validator is the ``ETag`` and ``Last-Modified`` header pair returned
+    by a ``HEAD`` request, which changes whenever the inventory is rewritten.
+    """
+
+    def head(bildid):
+        resp = get_client().head(inventory_url(bildid), timeout=30)
+        if resp.status_code != 200:
+            return None
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return None
+        return f"{etag or ''}|{last_modified or ''}"
+
+    results = _batch(head, bildids, max_workers=DEFAULT_POOL_MAXSIZE)
+    return {
+        bildid: validator
+        for bildid, validator in results
+        if isinstance(validator, str)
+    }
+
+
+def _metadata_digest(metadata) -> Optional[str]:
+    """Returns a digest of a ``/retrieve`` response, or None if it holds no record."""
+    if not isinstance(metadata, dict) or not metadata.get("retjson"):
+        return None
+    return hashlib.sha1(json.dumps(metadata, sort_keys=True).encode()).hexdigest()
+
+
+def _recheck_due(bildid: str, validator: dict, today: str) -> bool:
+    """
+    Tells whether the metadata of a reused row should be re-checked *today*.
+
+    Each dataset is assigned one day of a :data:`METADATA_RECHECK_DAYS` cycle
+    by a hash of its ID, spreading the requests evenly over daily runs; rows
+    last checked a full cycle ago are re-checked whatever the day, which
+    covers skipped runs.
+    """
+    checked = validator.get("checked")
+    if not validator.get("metadata") or not checked:
+        return True
+    day = datetime.strptime(today, "%Y%m%d")
+    try:
+        if day - datetime.strptime(checked, "%Y%m%d") >= timedelta(days=METADATA_RECHECK_DAYS):
+            return True
+    except ValueError:
+        return True
+    slot = int(hashlib.sha1(bildid.encode()).hexdigest(), 16) % METADATA_RECHECK_DAYS
+    return slot == day.toordinal() % METADATA_RECHECK_DAYS
+
+
+def _load_previous_report(today: str) -> tuple:
+    """
+    Loads the most recent report dated before *today*.
+
+    Both ``/bil/data/inventory/daily/`` and ``reports/`` are searched; when
+    the same date exists in both, the BIL filesystem copy wins. Within a
+    directory the Parquet copy is preferred (see :func:`_read_report`).
+
+    Returns:
+        tuple: ``(DataFrame, validators)``; an empty DataFrame and dict when no
+            previous report exists.
+    """
+    candidates = {}
+    for directory in (Path("reports"), Path("/bil/data/inventory/daily")):
+        if not directory.exists():
+            continue
+        for suffix in (".tsv", ".parquet"):
+            for path in directory.glob("[0-9]" * 8 + suffix):
+                if path.stem < today:
+                    candidates[path.stem] = path.with_suffix(".tsv")
+
+    if not candidates:
+        return pd.DataFrame(), {}
+
+    path = candidates[max(candidates)]
+    logger.info("Loading previous daily report %s.", path)
+    df = _read_report(path)
+
+    sidecar = path.with_suffix(".validators.json")
+    validators = {}
+    if sidecar.exists():
+        with open(sidecar) as f:
+            validators = json.load(f)
+    return df, validators
+
+
+def _reusable_rows(previous: pd.DataFrame, old: dict, inventories: dict, today: str) -> tuple:
+    """
+    Selects the rows of *previous* that can be carried over into *today*'s report.
+
+    A row is a candidate when its inventory validator is unchanged. The
+    metadata of the candidates that :func:`_recheck_due` picks is fetched and
+    compared with the stored digest; rows whose metadata changed are dropped,
+    and the response is handed back so the rebuild does not fetch it again.
+    A failed re-check keeps the row and tries again on the next run.
+
+    Args:
+        previous (pd.DataFrame): The previous report.
+        old (dict): Its validators sidecar.
+        inventories (dict): ``{bildid: validator}`` from
+            :func:`_get_inventory_validators`.
+        today (str): The report date, ``YYYYMMDD``.
+
+    Returns:
+        tuple: ``(rows, validators, metadata)``: the reusable rows, their
+            validators for the new sidecar, and ``{bildid: response}`` for the
+            datasets whose metadata changed.
+    """
+    if previous.empty or "bildid" not in previous.columns:
+        return pd.DataFrame(), {}, {}
+    candidates = {
+        bildid: validator
+        for bildid, validator in old.items()
+        if isinstance(validator, dict)
+        and validator.get("inventory") is not None
+        and validator.get("inventory") == inventories.get(bildid)
+    }
+    candidates = {b: v for b, v in candidates.items() if b in set(previous["bildid"])}
+
+    due = [bildid for bildid, validator in candidates.items() if _recheck_due(bildid, validator, today)]
+    validators = dict(candidates)
+    changed = {}
+    for bildid, metadata in _batch(by_id, due, max_workers=DEFAULT_POOL_MAXSIZE):
+        digest = _metadata_digest(metadata)
+        if digest is None:
+            continue
+        if digest == candidates[bildid]["metadata"]:
+            validators[bildid] = dict(candidates[bildid], checked=today)
+        else:
+            del validators[bildid]
+            changed[bildid] = metadata
+    logger.info("Re-checked the metadata of %d datasets, %d changed.", len(due), len(changed))
+    return previous[previous["bildid"].isin(validators)], validators, changed
+
+
 def get_all_bildids() -> list:
     """
     Retrieve all dataset IDs from the Brain Image Library across metadata versions.
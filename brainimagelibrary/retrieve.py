@@ -1,13 +1,21 @@
 """Retrieve dataset metadata from the Brain Image Library /retrieve endpoint."""
 
 import logging
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
 
-from ._api import BIL_API_BASE, DOWNLOAD_BASE, _fetch
+from ._api import BIL_API_BASE, DEFAULT_BATCH_WORKERS, DOWNLOAD_BASE, _batch, _fetch
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["by_id", "by_directory", "by_url", "by_affiliation"]
+__all__ = [
+    "by_id",
+    "by_directory",
+    "by_url",
+    "by_ids",
+    "by_directories",
+    "by_urls",
+    "by_affiliation",
+]
 
 _ENDPOINT = f"{BIL_API_BASE}/retrieve"
 
@@ -119,6 +127,108 @@ def by_url(url: Optional[str] = None) -> Optional[dict]:
     return by_directory(directory=directory)
 
 
+def by_ids(
+    bildids: Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    stream: bool = False,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Retrieves metadata for many datasets by their Brain Image Library IDs.
+
+    Duplicate and empty IDs are dropped, and the remaining lookups run
+    concurrently through :func:`by_id` with at most ``max_workers`` requests
+    in flight. A failing lookup yields ``None`` (or the raised exception) for
+    that ID rather than aborting the batch.
+
+    Args:
+        bildids (Iterable[str]): The dataset IDs to look up.
+        max_workers (int, optional): Maximum number of concurrent requests.
+            Defaults to 8.
+        stream (bool, optional): When True, return an iterator yielding
+            ``(bildid, result)`` pairs as each lookup completes. Defaults to False.
+        params (dict, optional): Query parameters to include in each API request. Defaults to None.
+        headers (dict, optional): HTTP headers to include in each API request. Defaults to None.
+
+    Returns:
+        list: ``(bildid, result)`` pairs in the order the IDs were first given.
+        Iterator[tuple]: ``(bildid, result)`` pairs in completion order when
+            ``stream`` is True.
+
+    Example:
+        >>> from brainimagelibrary.metadata import retrieve
+        >>> results = retrieve.by_ids(["act-bag", "ace-and", "act-bag"])
+        >>> print([bildid for bildid, _ in results])
+        ['act-bag', 'ace-and']
+        >>> for bildid, metadata in retrieve.by_ids(["act-bag", "ace-and"], stream=True):
+        ...     print(bildid, "retjson" in metadata)
+    """
+    return _batch(
+        lambda bildid: by_id(bildid=bildid, params=params, headers=headers),
+        bildids,
+        max_workers=max_workers,
+        stream=stream,
+    )
+
+
+def by_directories(
+    directories: Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    stream: bool = False,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Retrieves metadata for many datasets by their directory paths.
+
+    Batch counterpart of :func:`by_directory`; see :func:`by_ids` for the
+    deduplication, concurrency and error semantics.
+
+    Args:
+        directories (Iterable[str]): The dataset directory paths to look up.
+        max_workers (int, optional): Maximum number of concurrent requests.
+            Defaults to 8.
+        stream (bool, optional): When True, return an iterator yielding
+            ``(directory, result)`` pairs as each lookup completes. Defaults to False.
+        params (dict, optional): Query parameters to include in each API request. Defaults to None.
+        headers (dict, optional): HTTP headers to include in each API request. Defaults to None.
+
+    Returns:
+        list | Iterator[tuple]: ``(directory, result)`` pairs.
+    """
+    return _batch(
+        lambda directory: by_directory(directory=directory, params=params, headers=headers),
+        directories,
+        max_workers=max_workers,
+        stream=stream,
+    )
+
+
+def by_urls(
+    urls: Iterable[str],
+    max_workers: int = DEFAULT_BATCH_WORKERS,
+    stream: bool = False,
+) -> Union[list, Iterator[tuple]]:
+    """
+    Retrieves metadata for many datasets by their download URLs.
+
+    Batch counterpart of :func:`by_url`; see :func:`by_ids` for the
+    deduplication, concurrency and error semantics.
+
+    Args:
+        urls (Iterable[str]): The dataset download URLs to look up.
+        max_workers (int, optional): Maximum number of concurrent requests.
+            Defaults to 8.
+        stream (bool, optional): When True, return an iterator yielding
+            ``(url, result)`` pairs as each lookup completes. Defaults to False.
+
+    Returns:
+        list | Iterator[tuple]: ``(url, result)`` pairs.
+    """
+    return _batch(by_url, urls, max_workers=max_workers, stream=stream)
+
+
 def by_affiliation(
     affiliation: str,
     params: Optional[dict] = None,
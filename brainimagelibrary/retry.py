@@ -0,0 +1,155 @@
+"""Retry policy shared by the synchronous and asyncio HTTP clients."""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["RetryPolicy"]
+
+DEFAULT_ATTEMPTS = 4
+
+DEFAULT_STATUSES = (429, 500, 502, 503, 504)
+
+# Only these statuses carry a Retry-After header worth honouring.
+_RETRY_AFTER_STATUSES = frozenset((429, 503))
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is sent again.
+
+    Only idempotent methods are retried. A request is retried when the
+    connection fails or times out, or when the server answers with one of
+    ``statuses``. The wait before retry *n* (counting from 0) is drawn
+    uniformly from ``[0, min(max_backoff, backoff * 2**n)]`` ("full
+    jitter"), so many threads retrying at once spread out instead of
+    hitting the server together. A ``Retry-After`` header on a 429 or 503
+    response takes precedence, capped at ``max_retry_after``.
+
+    The policy counts every retry it schedules; see :meth:`stats`.
+
+    Args:
+        attempts (int, optional): Total attempts per request, including the
+            first. 1 disables retries. Defaults to 4.
+        backoff (float, optional): Base delay in seconds. Defaults to 0.5.
+        max_backoff (float, optional): Upper bound on a computed delay in
+            seconds. Defaults to 30.
+        max_retry_after (float, optional): Upper bound in seconds on a
+            server-provided ``Retry-After``. Defaults to 120.
+        statuses (Iterable[int], optional): Response codes that are retried.
+            Defaults to 429, 500, 502, 503 and 504.
+        methods (Iterable[str], optional): HTTP methods that are retried.
+            Defaults to GET and HEAD.
+
+    Example:
+        >>> from brainimagelibrary import client
+        >>> from brainimagelibrary.retry import RetryPolicy
+        >>> client.set_client(client.Client(retry=RetryPolicy(attempts=6, backoff=1)))
+        >>> client.get_client().stats()["retries"]["retries"]
+        0
+    """
+
+    def __init__(
+        self,
+        attempts: int = DEFAULT_ATTEMPTS,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        max_retry_after: float = 120,
+        statuses: Iterable[int] = DEFAULT_STATUSES,
+        methods: Iterable[str] = ("GET", "HEAD"),
+    ) -> None:
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self._lock = threading.Lock()
+        self._counts = {"retries": 0, "gave_up": 0, "reasons": {}, "hosts": {}}
+
+    def allows(self, method: str) -> bool:
+        """Returns True if requests with *method* may be retried."""
+        return self.attempts > 1 and method.upper() in self.methods
+
+    def should_retry(self, attempt: int, status: Optional[int] = None) -> bool:
+        """
+        Returns True if another attempt should follow attempt number *attempt*.
+
+        Args:
+            attempt (int): The attempt that just finished, counting from 0.
+            status (int, optional): Its response code, or None if it raised.
+        """
+        if status is not None and status not in self.statuses:
+            return False
+        return attempt + 1 < self.attempts
+
+    def delay(self, attempt: int, headers=None, status: Optional[int] = None) -> float:
+        """Returns the number of seconds to wait before retrying *attempt*."""
+        if headers is not None and status in _RETRY_AFTER_STATUSES:
+            retry_after = _parse_retry_after(
+                headers.get("Retry-After") or headers.get("retry-after")
+            )
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def record(self, url: str, reason: str, gave_up: bool = False) -> None:
+        """
+        Counts a retry of *url* (or a request that ran out of attempts).
+
+        Args:
+            url (str): The request URL.
+            reason (str): The status code or exception name that caused it.
+            gave_up (bool, optional): True when no attempts are left.
+        """
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            if gave_up:
+                self._counts["gave_up"] += 1
+                return
+            self._counts["retries"] += 1
+            reasons = self._counts["reasons"]
+            reasons[reason] = reasons.get(reason, 0) + 1
+            hosts = self._counts["hosts"]
+            hosts[host] = hosts.get(host, 0) + 1
+
+    def stats(self) -> dict:
+        """
+        Returns retry counters.
+
+        Returns:
+            dict: ``retries`` (retries scheduled), ``gave_up`` (requests that
+                still failed after the last attempt), ``reasons`` (retries per
+                status code or exception name) and ``hosts`` (retries per host).
+        """
+        with self._lock:
+            return {
+                "retries": self._counts["retries"],
+                "gave_up": self._counts["gave_up"],
+                "reasons": dict(self._counts["reasons"]),
+                "hosts": dict(self._counts["hosts"]),
+            }
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a ``Retry-After`` value given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Optional
 
 from . import reports
+from .client import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,10 @@ def load(date: str) -> Optional[pd.DataFrame]:
 
     Follows a two-step lookup strategy:
 
-    1. Read ``/bil/data/inventory/daily/<date>.tsv`` from the BIL shared
-       filesystem if it exists.
+    1. Read ``/bil/data/inventory/daily/<date>.parquet`` (when pyarrow is
+       installed), else ``<date>.tsv``, from the BIL shared filesystem if it
+       exists. The Parquet copy keeps column types, including the
+       ``file_types``/``frequencies`` lists and dicts.
     2. Otherwise download the file from
        ``https://download.brainimagelibrary.org/inventory/daily/<date>.tsv``
        and cache it under ``/tmp/``.
@@ -45,15 +48,15 @@ def load(date: str) -> Optional[pd.DataFrame]:
         >>> df_missing = summary.load("19000101")
         Data for 19000101 is unavailable.
     """
-    bil_path = Path(f"/bil/data/inventory/daily/{date}.tsv")
-    if bil_path.exists():
-        return pd.read_csv(bil_path, sep="\t")
+    df = reports._read_report(Path(f"/bil/data/inventory/daily/{date}.tsv"))
+    if df is not None:
+        return df
 
     url = f"https://download.brainimagelibrary.org/inventory/daily/{date}.tsv"
     tmp_path = f"/tmp/{date}.tsv"
 
     try:
-        response = requests.get(url, timeout=30)
+        response = get_client().get(url, timeout=30)
         if response.status_code == 200:
             with open(tmp_path, "wb") as f:
                 f.write(response.content)
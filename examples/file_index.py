@@ -0,0 +1,40 @@
+# Copyright (C) 2026  Ivan Cao-Berg
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+file_index.py — Find cell-by-gene and h5ad files across all BIL datasets.
+
+Builds (or updates) the local Parquet file index with one streamed pass over
+every inventory, then answers both questions from the index. Replaces the two
+inventory passes made by cell_by_gene.py and cell_by_gene_files.py.
+
+Requires the parquet extra: pip install "brainimagelibrary[parquet]"
+
+Usage:
+    python examples/file_index.py
+"""
+
+from brainimagelibrary import files
+
+counts = files.build()
+print(f"Index: {counts}")
+
+cell_by_gene = files.find(is_cell_by_gene=True, columns=["bildid", "fullpath"])
+cell_by_gene.sort_values(["bildid", "fullpath"]).to_csv(
+    "cell_by_gene.files.tsv", sep="\t", index=False
+)
+print(f"{cell_by_gene['bildid'].nunique()} datasets, {len(cell_by_gene)} cell-by-gene files")
+
+h5ad = files.find(extension="h5ad", columns=["bildid", "fullpath", "size"])
+print(f"{len(h5ad)} h5ad files, {h5ad['size'].sum() / 1e12:.2f} TB")
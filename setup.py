@@ -27,6 +27,12 @@ setup(
         "tqdm>=4.65",
         "humanize>=4.0",
     ],
+    extras_require={
+        "aio": ["aiohttp>=3.8"],
+        "xxhash": ["xxhash>=3.0"],
+        "parquet": ["pyarrow>=10"],
+        "fastjson": ["orjson>=3.9", "msgspec>=0.18"],
+    },
     packages=find_packages(),
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,245 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from brainimagelibrary import aio, doicache
+from brainimagelibrary.aio import AsyncResponse
+from brainimagelibrary.inventory import DatasetInventory
+
+
+VALID_RESPONSE = {"retjson": [{"bildid": "act-bag", "title": "Test Dataset"}]}
+NOT_FOUND_RESPONSE = {"message": "GET failure, no entry found"}
+
+
+class FakeAsyncClient:
+    """Serves canned responses keyed by a URL substring."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    async def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        for fragment, (status, body) in self.routes.items():
+            if fragment in url:
+                if isinstance(body, Exception):
+                    raise body
+                content = body if isinstance(body, bytes) else json.dumps(body).encode()
+                return AsyncResponse(status, {}, content, url)
+        return AsyncResponse(404, {}, b"{}", url)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request("HEAD", url, **kwargs)
+
+
+def run(coro_fn, routes):
+    fake = FakeAsyncClient(routes)
+
+    async def main():
+        aio.set_client(fake)
+        return await coro_fn()
+
+    return asyncio.run(main()), fake
+
+
+@pytest.fixture(autouse=True)
+def doi_cache(tmp_path):
+    cache = doicache.DOICache(str(tmp_path / "doi.sqlite"))
+    previous = doicache.set_doi_cache(cache)
+    yield cache
+    doicache.set_doi_cache(previous)
+    cache.close()
+
+
+# --- query / retrieve ---
+
+def test_query_by_id_returns_metadata():
+    result, fake = run(lambda: aio.query.by_id(bildid="act-bag"), {"bildid=act-bag": (200, VALID_RESPONSE)})
+    assert result == VALID_RESPONSE
+    assert "/query?" in fake.calls[0][1]
+
+
+def test_query_by_id_returns_empty_dict_when_no_bildid():
+    assert asyncio.run(aio.query.by_id()) == {}
+
+
+def test_query_by_id_returns_empty_dict_when_not_found():
+    result, _ = run(lambda: aio.query.by_id(bildid="missing"), {"bildid=missing": (200, NOT_FOUND_RESPONSE)})
+    assert result == {}
+
+
+def test_query_by_id_returns_none_on_client_error():
+    import aiohttp
+    result, _ = run(lambda: aio.query.by_id(bildid="act-bag"), {"act-bag": (0, aiohttp.ClientError("boom"))})
+    assert result is None
+
+
+def test_retrieve_by_directory_hits_retrieve_endpoint():
+    result, fake = run(
+        lambda: aio.retrieve.by_directory(directory="/bil/data/2019/02/13/H19"),
+        {"bildirectory=": (200, VALID_RESPONSE)},
+    )
+    assert result == VALID_RESPONSE
+    assert "/retrieve?" in fake.calls[0][1]
+
+
+def test_many_lookups_share_one_loop():
+    async def main():
+        return await asyncio.gather(*(aio.query.by_id(bildid=f"id-{i}") for i in range(50)))
+
+    results, fake = run(main, {"bildid=": (200, VALID_RESPONSE)})
+    assert len(results) == 50
+    assert len(fake.calls) == 50
+
+
+# --- inventory ---
+
+def test_inventory_exists_uses_head():
+    result, fake = run(lambda: aio.inventory.exists(bildid="act-bag"), {"act-bag.json.gz": (200, b"")})
+    assert result is True
+    assert fake.calls[0][0] == "HEAD"
+
+
+def test_inventory_get_parses_gzip_payload():
+    payload = gzip.compress(json.dumps({"number_of_files": 1, "manifest": []}).encode())
+    result, _ = run(lambda: aio.inventory.get(bildid="act-bag"), {"act-bag.json.gz": (200, payload)})
+    assert isinstance(result, DatasetInventory)
+    assert result["number_of_files"] == 1
+
+
+def test_inventory_get_parses_off_the_event_loop(monkeypatch):
+    import threading
+
+    from brainimagelibrary.aio import inventory as aio_inventory
+
+    threads = []
+
+    def parse(content, bildid):
+        threads.append(threading.current_thread())
+        return {"bildid": bildid}
+
+    monkeypatch.setattr(aio_inventory, "_parse", parse)
+    result, _ = run(lambda: aio.inventory.get(bildid="act-bag"), {"act-bag.json.gz": (200, b"gz")})
+    assert result == {"bildid": "act-bag"}
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_inventory_get_returns_none_on_non_200():
+    result, _ = run(lambda: aio.inventory.get(bildid="missing"), {})
+    assert result is None
+
+
+# --- datecite ---
+
+def test_get_citations_returns_none_keys_when_doi_missing():
+    result, _ = run(lambda: aio.datecite.dataset.get_citations(bildid="missing"), {})
+    assert result == {"datacite": None, "opencitations": None, "crossref": None, "semanticscholar": None}
+
+
+def test_get_citations_fans_out_and_enriches_titles():
+    routes = {
+        "/dois/10.35077/act-bag/citations": (200, {"data": [{"attributes": {"titles": [{"title": "A"}]}}]}),
+        "/dois/10.35077/act-bag": (200, {"data": {}}),
+        "/citations/10.35077/act-bag": (200, [{"citing": "10.1/x"}]),
+        "filter=cites:": (200, {"message": {"items": [{"title": ["B"]}]}}),
+        "/paper/DOI:": (200, {"data": [{"citingPaper": {"title": "C"}}]}),
+        "api.crossref.org/works": (200, {"message": {"items": [{"DOI": "10.1/x", "title": ["Citing paper"]}]}}),
+    }
+    result, _ = run(lambda: aio.datecite.dataset.get_citations(bildid="act-bag"), routes)
+    assert list(result) == ["datacite", "opencitations", "crossref", "semanticscholar"]
+    assert result["datacite"][0]["title"] == "A"
+    assert result["opencitations"][0]["title"] == "Citing paper"
+    assert result["crossref"][0]["title"] == "B"
+    assert result["semanticscholar"][0]["title"] == "C"
+
+
+def test_opencitations_titles_use_doi_cache_and_batches(doi_cache):
+    doi_cache.put("10.1/cached", {"title": "Cached paper"})
+    routes = {
+        "/citations/10.35077/act-bag": (
+            200,
+            [{"citing": "10.1/cached"}, {"citing": "10.1/x"}, {"citing": "10.1/y"}, {"citing": "10.1/a,b"}],
+        ),
+        "/works/10.1/a,b": (200, {"message": {"title": ["Comma paper"]}}),
+        "api.crossref.org/works": (200, {"message": {"items": [{"DOI": "10.1/X", "title": ["X paper"]}]}}),
+    }
+    result, fake = run(lambda: aio.datecite._get_citations("opencitations", "act-bag"), routes)
+    assert [r["title"] for r in result] == ["Cached paper", "X paper", None, "Comma paper"]
+    assert [url for _, url in fake.calls].count("https://api.crossref.org/works") == 1
+    assert doi_cache.get("10.1/x") == {"title": "X paper"}
+    assert doi_cache.get("10.1/y", "unset") is None
+
+    result, fake = run(lambda: aio.datecite._get_title_for_doi("https://doi.org/10.1/X"), {})
+    assert result == "X paper"
+    assert fake.calls == []
+
+
+def test_doi_cache_is_used_off_the_event_loop(doi_cache, monkeypatch):
+    import threading
+
+    threads = []
+    get_many = doi_cache.get_many
+
+    def spy(dois):
+        threads.append(threading.current_thread())
+        return get_many(dois)
+
+    monkeypatch.setattr(doi_cache, "get_many", spy)
+    run(lambda: aio.datecite._get_title_for_doi("10.1/x"), {})
+    assert threads and threads[0] is not threading.main_thread()
+
+
+# --- client lifecycle ---
+
+def test_close_releases_the_default_client():
+    async def main():
+        client = aio.get_client()
+        session = client._get_session()
+        await aio.close()
+        return client, session, aio.get_client()
+
+    client, session, replacement = asyncio.run(main())
+    assert session.closed
+    assert client._session is None
+    assert replacement is not client
+
+
+def test_async_client_closes_as_a_context_manager():
+    async def main():
+        async with aio.AsyncClient() as client:
+            session = client._get_session()
+        return session
+
+    assert asyncio.run(main()).closed
+
+
+# --- metrics ---
+
+def test_async_client_records_metrics(monkeypatch):
+    from brainimagelibrary.metrics import Metrics
+    from brainimagelibrary.ratelimit import RateLimiter
+    from brainimagelibrary.retry import RetryPolicy
+
+    statuses = iter([503, 200])
+
+    async def send(self, method, url, **kwargs):
+        return AsyncResponse(next(statuses), {}, b'{"ok": true}', url)
+
+    monkeypatch.setattr(aio.AsyncClient, "_send", send)
+    metrics = Metrics()
+    events = []
+    metrics.subscribe(events.append)
+
+    async def main():
+        client = aio.AsyncClient(retry=RetryPolicy(backoff=0), limiter=RateLimiter({}), metrics=metrics)
+        return await client.get("https://api.crossref.org/works/10.1038/nature")
+
+    assert asyncio.run(main()).status_code == 200
+    assert [(e.status, e.bytes, e.retries, e.endpoint) for e in events] == [(200, 12, 1, "/works/{doi}")]
@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+RUN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "run.py")
+
+
+def test_quick_benchmarks_run_against_the_fake_server(tmp_path):
+    out = tmp_path / "results.json"
+    subprocess.run(
+        [sys.executable, RUN, "--quick", "--error-rate", "0.05", "--json", str(out)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+        timeout=300,
+    )
+    report = json.loads(out.read_text())
+    assert set(report["results"]) == {
+        "inventory.get",
+        "inventory.get_many",
+        "inventory.download",
+        "reports.daily",
+        "citations.report",
+        "citations.records",
+    }
+    for result in report["results"].values():
+        assert result["seconds"] > 0
+        assert result["requests"] > 0
+    assert report["results"]["inventory.get"]["amount"] == 2000
+    assert sorted(os.listdir(tmp_path)) == ["results.json"]
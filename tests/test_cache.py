@@ -0,0 +1,132 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from brainimagelibrary.cache import ResponseCache
+from brainimagelibrary.client import Client
+from brainimagelibrary.coalesce import Coalescer
+
+
+BODY = b"inventory-bytes"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    sent_bodies = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        type(self).sent_bodies += 1
+        self.send_response(200)
+        if self.path != "/no-validator":
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "application/gzip")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.sent_bodies = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# --- ResponseCache ---
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = ResponseCache(str(tmp_path), hosts=None)
+    assert cache.store("https://x/a", b"abc", {"ETag": '"1"', "Content-Type": "text/plain"})
+    body, headers = cache.load("https://x/a")
+    assert body == b"abc"
+    assert headers == {"ETag": '"1"', "Content-Type": "text/plain"}
+    assert cache.validators("https://x/a") == {"If-None-Match": '"1"'}
+
+
+def test_store_skips_responses_without_validators(tmp_path):
+    cache = ResponseCache(str(tmp_path), hosts=None)
+    assert cache.store("https://x/a", b"abc", {}) is False
+    assert cache.load("https://x/a") is None
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    cache = ResponseCache(str(tmp_path), hosts=None)
+    cache.store("https://x/a", b"same", {"ETag": '"1"'})
+    cache.store("https://x/b", b"same", {"ETag": '"2"'})
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["size"] == 4
+    assert len(list((tmp_path / "objects").rglob("*"))) == 2  # one shard dir + one file
+
+
+def test_lru_eviction_respects_max_size(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_size=10, hosts=None)
+    cache.store("https://x/a", b"aaaa", {"ETag": '"a"'})
+    cache.store("https://x/b", b"bbbb", {"ETag": '"b"'})
+    cache.load("https://x/a")  # a is now more recently used than b
+    cache.store("https://x/c", b"cccc", {"ETag": '"c"'})
+    assert cache.load("https://x/b") is None
+    assert cache.load("https://x/a") is not None
+    assert cache.load("https://x/c") is not None
+    assert cache.size() <= 10
+
+
+def test_accepts_filters_by_host(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.accepts("https://download.brainimagelibrary.org/inventory/x.json.gz")
+    assert cache.accepts("https://api.brainimagelibrary.org/retrieve?bildid=x")
+    assert not cache.accepts("https://api.crossref.org/works/x")
+
+
+def test_clear_removes_everything(tmp_path):
+    cache = ResponseCache(str(tmp_path), hosts=None)
+    cache.store("https://x/a", b"abc", {"ETag": '"1"'})
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert cache.load("https://x/a") is None
+
+
+# --- Client integration ---
+
+def test_client_revalidates_and_serves_from_cache(server, tmp_path):
+    with Client(
+        cache=ResponseCache(str(tmp_path), hosts=None), coalesce=Coalescer(ttl=0)
+    ) as c:
+        first = c.get(f"{server}/act-bag.json.gz")
+        second = c.get(f"{server}/act-bag.json.gz")
+        stats = c.stats()
+    assert first.content == second.content == BODY
+    assert second.status_code == 200
+    assert getattr(second, "from_cache", False) is True
+    assert second.headers["Content-Type"] == "application/gzip"
+    assert _Handler.sent_bodies == 1
+    assert stats["cache"]["hits"] == 1
+
+
+def test_client_does_not_cache_without_validators(server, tmp_path):
+    with Client(
+        cache=ResponseCache(str(tmp_path), hosts=None), coalesce=Coalescer(ttl=0)
+    ) as c:
+        c.get(f"{server}/no-validator")
+        c.get(f"{server}/no-validator")
+    assert _Handler.sent_bodies == 2
+
+
+def test_client_bypasses_cache_for_streamed_requests(server, tmp_path):
+    with Client(cache=ResponseCache(str(tmp_path), hosts=None)) as c:
+        c.get(f"{server}/file.tif", stream=True).close()
+        assert c.cache.stats()["entries"] == 0
@@ -0,0 +1,102 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from brainimagelibrary import client
+from brainimagelibrary.client import Client
+from brainimagelibrary.coalesce import Coalescer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(302)
+        self.send_header("Location", "/elsewhere")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def restore_client():
+    previous = client.set_client(None)
+    yield
+    client.set_client(previous)
+
+
+# --- get_client / set_client ---
+
+def test_get_client_returns_singleton(restore_client):
+    assert client.get_client() is client.get_client()
+
+
+def test_set_client_swaps_and_returns_previous(restore_client):
+    first = client.get_client()
+    custom = Client(pool_maxsize=4)
+    assert client.set_client(custom) is first
+    assert client.get_client() is custom
+
+
+def test_modules_route_through_installed_client(restore_client):
+    from unittest.mock import MagicMock
+    from brainimagelibrary import query
+
+    fake = MagicMock()
+    fake.get.return_value.json.return_value = {"retjson": []}
+    client.set_client(fake)
+    assert query.by_id(bildid="act-bag") == {"retjson": []}
+    fake.get.assert_called_once()
+
+
+# --- Client ---
+
+def test_client_reuses_connections(server):
+    with Client(coalesce=Coalescer(ttl=0)) as c:
+        for _ in range(5):
+            assert c.get(f"{server}/retrieve").json() == {"ok": True}
+        stats = c.stats()
+    assert stats["requests"] == 5
+    assert stats["connections"] == 1
+    assert stats["reused"] == 4
+    assert stats["hosts"]["127.0.0.1"]["requests"] == 5
+
+
+def test_client_head_does_not_follow_redirects(server):
+    with Client() as c:
+        resp = c.head(f"{server}/inventory")
+    assert resp.status_code == 302
+
+
+def test_client_stats_empty_before_first_request():
+    with Client() as c:
+        assert c.stats() == {
+            "connections": 0,
+            "requests": 0,
+            "reused": 0,
+            "hosts": {},
+            "retries": {"retries": 0, "gave_up": 0, "reasons": {}, "hosts": {}},
+            "limits": {},
+            "coalesce": {"hits": 0, "misses": 0, "coalesced": 0, "entries": 0},
+        }
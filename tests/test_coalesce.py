@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from brainimagelibrary import client, datecite
+from brainimagelibrary.client import Client
+from brainimagelibrary.coalesce import Coalescer, _request_key
+from brainimagelibrary.ratelimit import RateLimiter
+
+
+def make_response(status_code=200, body=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body if body is not None else {}).encode()
+    return response
+
+
+@pytest.fixture
+def restore_client():
+    previous = client.set_client(None)
+    yield
+    client.set_client(previous)
+
+
+# --- Coalescer ---
+
+def test_concurrent_calls_share_one_fetch():
+    coalescer = Coalescer()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait()
+        return make_response(body={"n": 1})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(coalescer.call, "k", fetch) for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r.json() == {"n": 1} for r in results)
+    assert len({id(r) for r in results}) == 8
+    assert coalescer.stats()["misses"] == 1
+
+
+def test_responses_expire_after_ttl():
+    coalescer = Coalescer(ttl=0.05)
+    fetch = lambda: make_response()  # noqa: E731
+    coalescer.call("k", fetch)
+    coalescer.call("k", fetch)
+    assert coalescer.stats()["hits"] == 1
+    time.sleep(0.06)
+    coalescer.call("k", fetch)
+    assert coalescer.stats()["misses"] == 2
+
+
+def test_errors_and_server_failures_are_not_kept():
+    coalescer = Coalescer()
+
+    def boom():
+        raise requests.exceptions.ConnectionError("down")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        coalescer.call("k", boom)
+    coalescer.call("k", lambda: make_response(503))
+    assert coalescer.call("k", lambda: make_response(200)).status_code == 200
+    assert coalescer.stats()["hits"] == 0
+
+
+def test_client_errors_are_shared_in_flight_but_not_kept():
+    coalescer = Coalescer()
+    release = threading.Event()
+    calls = []
+
+    def missing():
+        calls.append(1)
+        release.wait()
+        return make_response(404)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(coalescer.call, "k", missing) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        assert [f.result().status_code for f in futures] == [404] * 4
+    assert len(calls) == 1
+
+    assert coalescer.call("k", lambda: make_response(200)).status_code == 200
+    assert coalescer.call("k", lambda: make_response(500)).status_code == 200
+    assert coalescer.stats()["hits"] == 1
+
+
+def test_copies_do_not_share_headers():
+    coalescer = Coalescer()
+    response = make_response()
+    response.headers["ETag"] = "abc"
+    first = coalescer.call("k", lambda: response)
+    first.headers["ETag"] = "changed"
+    second = coalescer.call("k", lambda: make_response())
+    assert second.headers["ETag"] == "abc"
+    assert second.headers is not first.headers
+    assert isinstance(second.headers, requests.structures.CaseInsensitiveDict)
+
+
+def test_request_key_only_covers_plain_gets():
+    assert _request_key("GET", "https://x", {"timeout": 30}) == _request_key("GET", "https://x", {})
+    assert _request_key("GET", "https://x", {"stream": True}) is None
+    assert _request_key("HEAD", "https://x", {}) is None
+    assert _request_key("GET", "https://x", {"auth": ("u", "p")}) is None
+
+
+# --- Client integration ---
+
+def test_doi_lookups_share_one_request(restore_client):
+    client.set_client(Client(limiter=RateLimiter({})))
+    record = {"data": {"attributes": {"citationCount": 3}}}
+    with patch.object(Client, "_send", return_value=make_response(body=record)) as send:
+        assert datecite._doi_exists("act-bag") is True
+        assert datecite._get_number_of_citations_from_datacite("act-bag") == 3
+    assert send.call_count == 1
@@ -0,0 +1,134 @@
+import gzip
+import json
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from brainimagelibrary import codec
+from brainimagelibrary._ingest import decode as decode_inventory
+from brainimagelibrary.client import _Response
+
+DOCUMENT = {"retjson": [{"bildid": "act-bag", "size": 2**40, "title": "Ünïcode"}], "success": True}
+
+
+@pytest.fixture(params=codec.available_backends())
+def backend(request):
+    previous = codec.set_backend(request.param)
+    yield request.param
+    codec.set_backend(previous)
+
+
+# --- backend selection ---
+
+def test_default_backend_is_fastest_installed():
+    previous = codec.set_backend(None)
+    try:
+        assert codec.get_backend() == codec.available_backends()[0]
+    finally:
+        codec.set_backend(previous)
+    assert codec.available_backends()[-1] == "json"
+
+
+def test_set_backend_rejects_unknown_names():
+    with pytest.raises(ValueError, match="backend must be one of"):
+        codec.set_backend("simplejson")
+
+
+def test_set_backend_requires_installed_package(monkeypatch):
+    monkeypatch.setattr(codec, "msgspec", None)
+    with pytest.raises(ImportError, match="fastjson"):
+        codec.set_backend("msgspec")
+
+
+# --- loads ---
+
+def test_loads_matches_stdlib(backend):
+    text = json.dumps(DOCUMENT)
+    assert codec.loads(text.encode()) == DOCUMENT
+    assert codec.loads(text) == DOCUMENT
+    assert codec.loads(bytearray(text.encode())) == DOCUMENT
+
+
+def test_loads_falls_back_for_documents_only_stdlib_accepts(backend):
+    assert codec.loads(b'{"size": NaN, "big": 123456789012345678901234567890}')["big"] == (
+        123456789012345678901234567890
+    )
+    assert codec.loads('{"a": 1}'.encode("utf-16")) == {"a": 1}
+
+
+def test_loads_raises_stdlib_error(backend):
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b"{'not': 'json'}")
+
+
+def test_inventory_decode_uses_backend_and_literal_fallback(backend):
+    assert decode_inventory(gzip.compress(json.dumps(DOCUMENT).encode())) == DOCUMENT
+    assert decode_inventory(gzip.compress(repr(DOCUMENT).encode())) == DOCUMENT
+
+
+# --- client responses ---
+
+def _response(body: bytes) -> requests.Response:
+    response = _Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def test_client_response_json_uses_codec(backend, monkeypatch):
+    spy = MagicMock(side_effect=codec.loads)
+    monkeypatch.setattr("brainimagelibrary.client.loads", spy)
+    assert _response(json.dumps(DOCUMENT).encode()).json() == DOCUMENT
+    spy.assert_called_once()
+
+
+def test_client_response_json_keeps_requests_error(backend):
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        _response(b"<html>502 Bad Gateway</html>").json()
+
+
+# --- typed decoding ---
+
+def test_decode_requires_msgspec(monkeypatch):
+    monkeypatch.setattr(codec, "msgspec", None)
+    with pytest.raises(ImportError, match="msgspec"):
+        codec.decode(b"{}", dict)
+
+
+def _schemas():
+    msgspec = pytest.importorskip("msgspec")
+
+    class Entry(msgspec.Struct):
+        size: int
+        extension: Optional[str] = None
+
+    class Inventory(msgspec.Struct):
+        manifest: list[Entry] = []
+        frequencies: dict[str, int] = {}
+
+    return Entry, Inventory
+
+
+def test_decode_into_structs():
+    _, Inventory = _schemas()
+    payload = json.dumps(
+        {
+            "manifest": [{"size": 5, "extra": 1}, {"extension": "json", "size": 7}],
+            "frequencies": {"tif": 1, "json": 1},
+            "unknown": "ignored",
+        }
+    )
+    inventory = codec.decode(payload, Inventory)
+    assert [entry.size for entry in inventory.manifest] == [5, 7]
+    assert inventory.manifest[0].extension is None
+    assert inventory.frequencies == {"tif": 1, "json": 1}
+
+
+def test_decode_reports_the_invalid_field():
+    _, Inventory = _schemas()
+    with pytest.raises(ValueError, match=r"manifest\[1\]\.size"):
+        codec.decode(b'{"manifest": [{"size": 1}, {"size": "big"}]}', Inventory)
+    with pytest.raises(ValueError, match="not valid JSON"):
+        codec.decode(b"{", Inventory)
@@ -1,8 +1,10 @@
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock, call
 import requests
 
-from brainimagelibrary import datecite
+from brainimagelibrary import datecite, doicache
 
 
 DATACITE_RESPONSE = {
@@ -33,19 +35,19 @@ def make_mock_response(json_data=None, status_code=200):
 # --- _doi_exists ---
 
 def test_doi_exists_returns_true_on_200():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=200)
         assert datecite._doi_exists(bildid="act-bag") is True
 
 
 def test_doi_exists_returns_false_on_404():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         assert datecite._doi_exists(bildid="nonexistent") is False
 
 
 def test_doi_exists_returns_false_on_exception():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("timeout")
         assert datecite._doi_exists(bildid="act-bag") is False
 
@@ -53,7 +55,7 @@ def test_doi_exists_returns_false_on_exception():
 # --- _get_datacite_metadata ---
 
 def test_get_datacite_metadata_returns_dict_on_200():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(DATACITE_RESPONSE, status_code=200)
         result = datecite._get_datacite_metadata(bildid="act-bag")
     assert result == DATACITE_RESPONSE
@@ -61,7 +63,7 @@ def test_get_datacite_metadata_returns_dict_on_200():
 
 
 def test_get_datacite_metadata_returns_none_on_404():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         result = datecite._get_datacite_metadata(bildid="nonexistent")
     assert result is None
@@ -70,7 +72,7 @@ def test_get_datacite_metadata_returns_none_on_404():
 # --- Dataset.get ---
 
 def test_dataset_get_returns_metadata():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(DATACITE_RESPONSE, status_code=200)
         result = datecite.dataset.get(bildid="act-bag")
     assert result == DATACITE_RESPONSE
@@ -79,13 +81,13 @@ def test_dataset_get_returns_metadata():
 # --- Dataset.exists ---
 
 def test_dataset_exists_returns_true():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=200)
         assert datecite.dataset.exists(bildid="act-bag") is True
 
 
 def test_dataset_exists_returns_false():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         assert datecite.dataset.exists(bildid="nonexistent") is False
 
@@ -141,13 +143,13 @@ def test_get_citations_returns_dict_with_expected_keys():
 # --- Collection.exists ---
 
 def test_collection_exists_returns_true():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=200)
         assert datecite.collection.exists(bildid="act-bag") is True
 
 
 def test_collection_exists_returns_false():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         assert datecite.collection.exists(bildid="nonexistent") is False
 
@@ -230,14 +232,14 @@ def test_get_number_of_citations_from_datacite_returns_none_when_no_metadata():
 
 def test_get_number_of_citations_from_opencitations_parses_count():
     api_response = [{"count": "7"}]
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(api_response, status_code=200)
         result = datecite._get_number_of_citations_from_opencitations(bildid="act-bag")
     assert result == 7
 
 
 def test_get_number_of_citations_from_opencitations_returns_none_on_404():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         result = datecite._get_number_of_citations_from_opencitations(bildid="act-bag")
     assert result is None
@@ -245,14 +247,14 @@ def test_get_number_of_citations_from_opencitations_returns_none_on_404():
 
 def test_get_number_of_citations_from_crossref_parses_count():
     api_response = {"message": {"is-referenced-by-count": 12}}
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(api_response, status_code=200)
         result = datecite._get_number_of_citations_from_crossref(bildid="act-bag")
     assert result == 12
 
 
 def test_get_number_of_citations_from_crossref_returns_none_on_404():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         result = datecite._get_number_of_citations_from_crossref(bildid="act-bag")
     assert result is None
@@ -260,14 +262,171 @@ def test_get_number_of_citations_from_crossref_returns_none_on_404():
 
 def test_get_number_of_citations_from_semanticscholar_parses_count():
     api_response = {"citationCount": 9}
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(api_response, status_code=200)
         result = datecite._get_number_of_citations_from_semanticscholar(bildid="act-bag")
     assert result == 9
 
 
 def test_get_number_of_citations_from_semanticscholar_returns_none_on_404():
-    with patch("brainimagelibrary.datecite.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         result = datecite._get_number_of_citations_from_semanticscholar(bildid="act-bag")
     assert result is None
+
+
+# --- citation_report ---
+
+DOI_PAGES = [
+    {
+        "data": [
+            {"id": "10.35077/act-bag", "attributes": {"doi": "10.35077/act-bag", "citationCount": 5}},
+            {"id": "10.35077/ace-dog", "attributes": {"doi": "10.35077/ACE-DOG", "citationCount": 0}},
+        ],
+        "links": {"next": "https://api.datacite.org/dois?page%5Bcursor%5D=abc"},
+    },
+    {
+        "data": [{"id": "10.35077/ace-cat", "attributes": {"doi": "10.35077/ace-cat", "citationCount": 2}}],
+        "links": {},
+    },
+]
+
+
+def patch_counts(opencitations=1, crossref=2, semanticscholar=3):
+    return (
+        patch("brainimagelibrary.datecite._get_number_of_citations_from_opencitations", return_value=opencitations),
+        patch("brainimagelibrary.datecite._get_number_of_citations_from_crossref", return_value=crossref),
+        patch("brainimagelibrary.datecite._get_number_of_citations_from_semanticscholar", return_value=semanticscholar),
+    )
+
+
+def test_citation_report_pages_through_datacite():
+    oc, cr, ss = patch_counts()
+    with patch("brainimagelibrary.client.Client.get") as mock_get, oc, cr, ss:
+        mock_get.side_effect = [make_mock_response(page) for page in DOI_PAGES]
+        report = datecite.citation_report()
+    assert mock_get.call_args_list[0].kwargs["params"]["page[size]"] == 1000
+    assert mock_get.call_args_list[1].args[0] == DOI_PAGES[0]["links"]["next"]
+    assert list(report.index) == ["ace-cat", "ace-dog", "act-bag"]
+    assert report.loc["act-bag"].tolist() == [5, 1, 2, 3]
+    assert str(report["datacite"].dtype) == "Int64"
+
+
+def test_citation_report_skips_queries_for_datasets_without_doi():
+    oc, cr, ss = patch_counts()
+    with patch("brainimagelibrary.client.Client.get") as mock_get, oc as mock_oc, cr, ss:
+        mock_get.side_effect = [make_mock_response(page) for page in DOI_PAGES]
+        report = datecite.citation_report(bildids=["act-bag", "no-doi"], sources=["datacite", "opencitations"])
+    assert list(report.columns) == ["datacite", "opencitations"]
+    assert report.loc["no-doi"].isna().all()
+    mock_oc.assert_called_once_with(bildid="act-bag")
+
+
+def test_citation_report_resumes_from_existing_file(tmp_path):
+    path = tmp_path / "citations.tsv"
+    path.write_text("bildid\tdatacite\topencitations\tcrossref\tsemanticscholar\nact-bag\t5\t9\t9\t9\n")
+    oc, cr, ss = patch_counts()
+    with patch("brainimagelibrary.client.Client.get") as mock_get, oc as mock_oc, cr, ss:
+        mock_get.side_effect = [make_mock_response(page) for page in DOI_PAGES]
+        report = datecite.citation_report(path=str(path))
+    assert mock_oc.call_count == 2
+    assert report.loc["act-bag", "opencitations"] == 9
+    assert report.loc["ace-cat", "opencitations"] == 1
+    assert len(path.read_text().splitlines()) == 4
+
+
+def test_citation_report_requeries_failed_lookups_on_resume(tmp_path):
+    path = tmp_path / "citations.tsv"
+    oc, cr, ss = patch_counts(crossref=None)
+    with patch("brainimagelibrary.client.Client.get") as mock_get, oc, cr, ss:
+        mock_get.side_effect = [make_mock_response(page) for page in DOI_PAGES]
+        first = datecite.citation_report(path=str(path))
+    assert first["crossref"].isna().all()
+
+    oc, cr, ss = patch_counts(opencitations=7, crossref=4)
+    with patch("brainimagelibrary.client.Client.get") as mock_get, oc as mock_oc, cr as mock_cr, ss:
+        mock_get.side_effect = [make_mock_response(page) for page in DOI_PAGES]
+        report = datecite.citation_report(path=str(path))
+    assert mock_cr.call_count == 3
+    mock_oc.assert_not_called()
+    assert report["crossref"].tolist() == [4, 4, 4]
+    assert report["opencitations"].tolist() == [1, 1, 1]
+    assert len(report) == 3
+
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.side_effect = [make_mock_response(page) for page in DOI_PAGES]
+        again = datecite.citation_report(path=str(path))
+    assert again.equals(report)
+
+
+def test_citation_report_returns_none_when_listing_fails():
+    with patch("brainimagelibrary.client.Client.get", side_effect=requests.exceptions.ConnectionError("down")):
+        assert datecite.citation_report() is None
+
+
+# --- iter_citations ---
+
+@pytest.fixture
+def no_doi_cache():
+    previous = doicache.set_doi_cache(None)
+    yield
+    doicache.set_doi_cache(previous)
+
+
+def crossref_page(titles, next_cursor):
+    items = [{"DOI": f"10.1000/{t}", "title": [t]} for t in titles]
+    return {"message": {"items": items, "next-cursor": next_cursor}}
+
+
+def test_iter_citations_follows_crossref_cursor(no_doi_cache):
+    pages = [crossref_page(["a", "b"], "c1"), crossref_page(["c", "d"], "c2"), crossref_page(["e"], "c3")]
+    with patch("brainimagelibrary.datecite.CROSSREF_PAGE_SIZE", 2), \
+         patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.side_effect = [make_mock_response(page) for page in pages]
+        titles = [work["title"] for work in datecite.iter_citations("act-bag", source="crossref")]
+    assert titles == ["a", "b", "c", "d", "e"]
+    cursors = [c.kwargs["params"]["cursor"] for c in mock_get.call_args_list]
+    assert cursors == ["*", "c1", "c2"]
+    assert mock_get.call_args.kwargs["params"]["rows"] == 2
+
+
+def test_iter_citations_follows_semanticscholar_next(no_doi_cache):
+    pages = [
+        {"offset": 0, "next": 2, "data": [{"citingPaper": {"title": "A"}}, {"citingPaper": {"title": "B"}}]},
+        {"offset": 2, "data": [{"citingPaper": {"title": "C"}}]},
+    ]
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.side_effect = [make_mock_response(page) for page in pages]
+        titles = [work["title"] for work in datecite.iter_citations("act-bag", source="semanticscholar")]
+    assert titles == ["A", "B", "C"]
+    assert [c.kwargs["params"]["offset"] for c in mock_get.call_args_list] == [0, 2]
+
+
+def test_iter_citations_prefetches_next_page(no_doi_cache):
+    pages = [crossref_page(["a", "b"], "c1"), crossref_page(["c"], "c2")]
+    with patch("brainimagelibrary.datecite.CROSSREF_PAGE_SIZE", 2), \
+         patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.side_effect = [make_mock_response(page) for page in pages]
+        works = datecite.iter_citations("act-bag", source="crossref")
+        next(works)
+        for _ in range(100):
+            if mock_get.call_count == 2:
+                break
+            time.sleep(0.01)
+        assert mock_get.call_count == 2
+        assert [work["title"] for work in works] == ["b", "c"]
+
+
+def test_iter_citations_rejects_unpaginated_source():
+    with pytest.raises(ValueError):
+        next(datecite.iter_citations("act-bag", source="datacite"))
+
+
+def test_get_citations_from_crossref_returns_none_when_a_page_fails(no_doi_cache):
+    with patch("brainimagelibrary.datecite.CROSSREF_PAGE_SIZE", 1), \
+         patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.side_effect = [
+            make_mock_response(crossref_page(["a"], "c1")),
+            requests.exceptions.ConnectionError("down"),
+        ]
+        assert datecite._get_citations_from_crossref("act-bag") is None
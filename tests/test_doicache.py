@@ -0,0 +1,123 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from brainimagelibrary import datecite, doicache
+from brainimagelibrary.doicache import DOICache, normalize_doi
+
+
+def make_mock_response(json_data=None, status_code=200):
+    mock = MagicMock()
+    mock.status_code = status_code
+    if json_data is not None:
+        mock.json.return_value = json_data
+    return mock
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DOICache(str(tmp_path / "doi.sqlite"))
+    previous = doicache.set_doi_cache(cache)
+    yield cache
+    doicache.set_doi_cache(previous)
+    cache.close()
+
+
+# --- DOICache ---
+
+def test_normalize_doi_strips_prefix_and_case():
+    assert normalize_doi("https://doi.org/10.1000/ABC") == "10.1000/abc"
+    assert normalize_doi("doi:10.1000/Abc ") == "10.1000/abc"
+
+
+def test_cache_round_trip(cache):
+    cache.put_many({"10.1000/A": {"title": "A"}, "10.1000/b": None})
+    assert cache.get_many(["10.1000/a", "10.1000/b", "10.1000/c"]) == {
+        "10.1000/a": {"title": "A"},
+        "10.1000/b": None,
+    }
+    assert cache.stats() == {"hits": 2, "misses": 1, "stores": 2, "entries": 2}
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "doi.sqlite")
+    first = DOICache(path)
+    first.put("10.1000/a", {"title": "A"})
+    first.close()
+    second = DOICache(path)
+    assert second.get("10.1000/a") == {"title": "A"}
+    second.close()
+
+
+def test_cache_expires_entries(tmp_path):
+    cache = DOICache(str(tmp_path / "doi.sqlite"), ttl=60, missing_ttl=1)
+    cache.put_many({"10.1000/a": {"title": "A"}, "10.1000/b": None})
+    with patch("brainimagelibrary.doicache.time.time", return_value=time.time() + 30):
+        assert cache.get_many(["10.1000/a", "10.1000/b"]) == {"10.1000/a": {"title": "A"}}
+    cache.close()
+
+
+def test_set_doi_cache_none_disables_caching():
+    previous = doicache.set_doi_cache(None)
+    try:
+        assert doicache.get_doi_cache() is None
+    finally:
+        doicache.set_doi_cache(previous)
+
+
+# --- batched Crossref lookups ---
+
+def crossref_items(*pairs):
+    return {"message": {"items": [{"DOI": doi, "title": [title]} for doi, title in pairs]}}
+
+
+def test_titles_are_fetched_in_one_batch_and_cached(cache):
+    payload = crossref_items(("10.1000/A", "Paper A"), ("10.1000/b", "Paper B"))
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_mock_response(payload)
+        titles = datecite._get_titles_for_dois(["10.1000/a", "10.1000/b", "10.1000/missing"])
+        assert mock_get.call_count == 1
+        params = mock_get.call_args.kwargs["params"]
+        assert params["filter"] == "doi:10.1000/a,doi:10.1000/b,doi:10.1000/missing"
+        assert titles == {"10.1000/a": "Paper A", "10.1000/b": "Paper B", "10.1000/missing": None}
+
+        assert datecite._get_title_for_doi("10.1000/B") == "Paper B"
+        assert datecite._get_title_for_doi("10.1000/missing") is None
+        assert mock_get.call_count == 1
+
+
+def test_titles_are_split_into_batches(cache):
+    dois = [f"10.1000/{i}" for i in range(datecite.CROSSREF_BATCH_SIZE + 1)]
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_mock_response(crossref_items())
+        datecite._get_titles_for_dois(dois)
+        assert mock_get.call_count == 2
+
+
+def test_failed_lookups_are_not_cached(cache):
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_mock_response(status_code=503)
+        assert datecite._get_titles_for_dois(["10.1000/a"]) == {"10.1000/a": None}
+    assert cache.get_many(["10.1000/a"]) == {}
+
+
+def test_opencitations_titles_use_the_cache(cache):
+    cache.put("10.1000/a", {"title": "Cached"})
+    records = [{"citing": "10.1000/A"}, {"citing": "10.1000/b"}]
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.side_effect = [
+            make_mock_response(records),
+            make_mock_response(crossref_items(("10.1000/b", "Fetched"))),
+        ]
+        result = datecite._get_citations_from_opencitations("act-bag")
+    assert [r["title"] for r in result] == ["Cached", "Fetched"]
+    assert mock_get.call_args.kwargs["params"]["filter"] == "doi:10.1000/b"
+
+
+def test_crossref_citations_populate_the_cache(cache):
+    payload = crossref_items(("10.1000/a", "Citing A"))
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_mock_response(payload)
+        datecite._get_citations_from_crossref("act-bag")
+    assert cache.get("10.1000/a") == {"title": "Citing A"}
@@ -178,6 +178,9 @@ ENDPOINTS = [
     ("datecite._get_title_for_doi (Crossref works)",
      f"{CROSSREF}/works/{DOI}"),
 
+    ("datecite._get_titles_for_dois (Crossref batch)",
+     f"{CROSSREF}/works?filter=doi:{DOI}&rows=1&select=DOI,title"),
+
     ("datecite._get_citations_from_crossref",
      f"{CROSSREF}/works?filter=cites:{DOI}"),
 
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from brainimagelibrary import files
+
+
+MANIFESTS = {
+    "act-bag": [
+        {"fullpath": "/bil/data/act-bag/a.tif", "extension": "tif", "size": 512, "md5": "abc", "is_cell_by_gene": False},
+        {"fullpath": "/bil/data/act-bag/cells.h5ad", "extension": "h5ad", "size": "256", "is_cell_by_gene": True},
+    ],
+    "ace-cat": [
+        {"fullpath": "/bil/data/ace-cat/b.h5ad", "extension": "h5ad", "size": 10, "mime_type": "application/x-hdf5"},
+    ],
+    "empty": [],
+}
+
+
+def fake_iter_manifest(bildid=None):
+    if bildid not in MANIFESTS:
+        return None
+    return iter(MANIFESTS[bildid])
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "files")
+    with patch("brainimagelibrary.files.iter_manifest", side_effect=fake_iter_manifest):
+        counts = files.build(path, bildids=list(MANIFESTS) + ["missing"])
+    assert counts == {"indexed": 3, "skipped": 0, "failed": 1, "removed": 0, "files": 3}
+    return path
+
+
+def test_find_by_extension(index):
+    result = files.find(index, extension="h5ad")
+    assert sorted(result["bildid"]) == ["ace-cat", "act-bag"]
+    assert result.set_index("bildid").loc["act-bag", "size"] == 256
+
+
+def test_find_cell_by_gene_with_selected_columns(index):
+    result = files.find(index, is_cell_by_gene=True, columns=["bildid", "fullpath"])
+    assert result.to_dict("records") == [{"bildid": "act-bag", "fullpath": "/bil/data/act-bag/cells.h5ad"}]
+
+
+def test_find_with_list_filter_and_bildid(index):
+    assert len(files.find(index, bildid=["act-bag", "empty"])) == 2
+    assert len(files.find(index, bildid="ace-cat", extension=["tif", "h5ad"])) == 1
+
+
+def test_find_rejects_unknown_columns(index):
+    with pytest.raises(ValueError):
+        files.find(index, colour="red")
+
+
+def test_find_without_index_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        files.find(str(tmp_path / "nowhere"))
+
+
+def test_build_skips_indexed_datasets_and_prunes_withdrawn(index):
+    with patch("brainimagelibrary.files.iter_manifest", side_effect=fake_iter_manifest) as mock_iter, \
+         patch("brainimagelibrary.files.get_all_bildids", return_value=["act-bag", "empty"]):
+        counts = files.build(index)
+        mock_iter.assert_not_called()
+    assert counts["skipped"] == 2 and counts["removed"] == 1
+    assert "ace-cat" not in set(files.find(index)["bildid"])
+
+
+def test_build_discards_partial_partition_on_error(tmp_path):
+    def broken(bildid=None):
+        yield {"fullpath": "x", "size": 1}
+        raise ValueError("truncated inventory")
+
+    path = str(tmp_path / "files")
+    with patch("brainimagelibrary.files.iter_manifest", side_effect=broken):
+        counts = files.build(path, bildids=["act-bag"])
+    assert counts["failed"] == 1
+    assert files.find(path).empty
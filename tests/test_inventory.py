@@ -1,9 +1,13 @@
 import gzip
+import hashlib
 import io
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 from unittest.mock import patch, MagicMock, mock_open
 import requests
+import pandas as pd
 
 from brainimagelibrary import inventory
 from brainimagelibrary.inventory import DatasetInventory
@@ -50,19 +54,19 @@ def test_has_returns_false_when_no_bildid():
 
 
 def test_has_returns_true_when_head_200():
-    with patch("brainimagelibrary.inventory.requests.head") as mock_head:
+    with patch("brainimagelibrary.client.Client.head") as mock_head:
         mock_head.return_value = MagicMock(status_code=200)
         assert inventory.exists(bildid="act-bag") is True
 
 
 def test_has_returns_false_when_head_404():
-    with patch("brainimagelibrary.inventory.requests.head") as mock_head:
+    with patch("brainimagelibrary.client.Client.head") as mock_head:
         mock_head.return_value = MagicMock(status_code=404)
         assert inventory.exists(bildid="nonexistent") is False
 
 
 def test_has_returns_false_on_request_exception():
-    with patch("brainimagelibrary.inventory.requests.head") as mock_head:
+    with patch("brainimagelibrary.client.Client.head") as mock_head:
         mock_head.side_effect = requests.exceptions.RequestException("timeout")
         assert inventory.exists(bildid="act-bag") is False
 
@@ -75,7 +79,7 @@ def test_get_returns_none_when_no_bildid(capsys):
 
 
 def test_get_returns_dataset_inventory_on_success():
-    with patch("brainimagelibrary.inventory.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_gzip_response(SAMPLE_INVENTORY)
         result = inventory.get(bildid="act-bag")
     assert isinstance(result, DatasetInventory)
@@ -84,29 +88,37 @@ def test_get_returns_dataset_inventory_on_success():
     assert len(result["manifest"]) == 3
 
 
+def test_to_dict_is_json_serializable():
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_gzip_response(SAMPLE_INVENTORY)
+        result = inventory.get(bildid="act-bag")
+    assert json.loads(json.dumps(result.to_dict())) == SAMPLE_INVENTORY
+    assert isinstance(result.to_dict()["manifest"], list)
+
+
 def test_get_returns_none_on_non_200():
-    with patch("brainimagelibrary.inventory.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=404)
         result = inventory.get(bildid="nonexistent")
     assert result is None
 
 
 def test_get_returns_none_on_bad_gzip():
-    with patch("brainimagelibrary.inventory.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(status_code=200, content=b"not gzip data")
         result = inventory.get(bildid="act-bag")
     assert result is None
 
 
 def test_get_returns_none_on_request_exception():
-    with patch("brainimagelibrary.inventory.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("timeout")
         result = inventory.get(bildid="act-bag")
     assert result is None
 
 
 def test_get_requests_correct_url():
-    with patch("brainimagelibrary.inventory.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_gzip_response(SAMPLE_INVENTORY)
         inventory.get(bildid="act-bag")
     url = mock_get.call_args[0][0]
@@ -122,7 +134,7 @@ def test_to_manifest_returns_none_when_no_bildid(capsys):
 
 def test_to_manifest_writes_file(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
-    with patch("brainimagelibrary.inventory.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_gzip_response(SAMPLE_INVENTORY)
         path = inventory.to_manifest(bildid="act-bag", checksum="md5")
     assert path == "act-bag.manifest"
@@ -184,3 +196,335 @@ def test_summary_aggregates_sizes_by_extension():
     sizes = result["files"]["sizes"]
     assert sizes["tif"] == 768   # 512 + 256
     assert sizes["json"] == 256
+
+
+# --- streaming: iter_manifest() / get(stream=True) ---
+
+def make_stream_response(data, chunk_size=7, status_code=200, raw=None):
+    """Return a mock streamed response yielding the gzip payload in small chunks."""
+    payload = raw if raw is not None else gzip.compress(json.dumps(data).encode("utf-8"))
+    mock = MagicMock()
+    mock.status_code = status_code
+    mock.iter_content.side_effect = lambda size: (
+        payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)
+    )
+    mock.__enter__.return_value = mock
+    return mock
+
+
+def test_iter_manifest_yields_entries():
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_stream_response(SAMPLE_INVENTORY)
+        entries = list(inventory.iter_manifest(bildid="act-bag"))
+    assert entries == SAMPLE_INVENTORY["manifest"]
+    assert mock_get.call_args.kwargs["stream"] is True
+
+
+def test_iter_manifest_returns_none_on_non_200():
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_stream_response({}, status_code=404)
+        assert inventory.iter_manifest(bildid="missing") is None
+
+
+def test_get_stream_matches_buffered_parse():
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_stream_response(SAMPLE_INVENTORY, chunk_size=1)
+        result = inventory.get(bildid="act-bag", stream=True)
+    assert isinstance(result, DatasetInventory)
+    assert dict(result) == SAMPLE_INVENTORY
+
+
+def test_get_stream_handles_numbers_split_across_chunks():
+    data = {"size": 123456789, "manifest": [{"size": 98765}], "number_of_files": 1}
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_stream_response(data, chunk_size=1)
+        result = inventory.get(bildid="act-bag", stream=True)
+    assert result["size"] == 123456789
+    assert result["manifest"] == [{"size": 98765}]
+
+
+def test_get_stream_falls_back_for_python_literal_inventory():
+    literal = gzip.compress(repr({"number_of_files": 1, "manifest": [], "ok": True}).encode())
+    streamed = make_stream_response(None, raw=literal)
+    buffered = make_mock_response(status_code=200, content=literal)
+    with patch("brainimagelibrary.client.Client.get", side_effect=[streamed, buffered]):
+        result = inventory.get(bildid="act-bag", stream=True)
+    assert result["ok"] is True
+
+
+def _payload_by_url(payloads):
+    def _get(url, **kwargs):
+        for bildid, response in payloads.items():
+            if url.endswith(f"/{bildid}.json.gz"):
+                return response
+        return make_mock_response(status_code=404)
+
+    return _get
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_get_many_parses_every_inventory(processes):
+    other = dict(SAMPLE_INVENTORY, number_of_files=1, manifest=SAMPLE_INVENTORY["manifest"][:1])
+    literal = gzip.compress(repr({"number_of_files": 0, "manifest": [], "ok": True}).encode())
+    payloads = {
+        "act-bag": make_gzip_response(SAMPLE_INVENTORY),
+        "ace-and": make_gzip_response(other),
+        "literal": make_mock_response(content=literal),
+        "corrupt": make_mock_response(content=b"\x1f\x8b not gzip"),
+    }
+    with patch("brainimagelibrary.client.Client.get", side_effect=_payload_by_url(payloads)):
+        results = inventory.get_many(
+            ["act-bag", "ace-and", "act-bag", "literal", "corrupt", "missing", ""],
+            processes=processes,
+        )
+    assert [bildid for bildid, _ in results] == ["act-bag", "ace-and", "literal", "corrupt", "missing"]
+    found = dict(results)
+    assert isinstance(found["act-bag"], DatasetInventory)
+    assert dict(found["act-bag"]) == SAMPLE_INVENTORY
+    assert found["ace-and"]["manifest"] == other["manifest"]
+    assert found["literal"]["ok"] is True
+    assert found["corrupt"] is None
+    assert found["missing"] is None
+
+
+def test_get_many_streams_and_releases_shared_memory():
+    import os
+
+    before = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+    payloads = {b: make_gzip_response(SAMPLE_INVENTORY) for b in ("a", "b", "c")}
+    with patch("brainimagelibrary.client.Client.get", side_effect=_payload_by_url(payloads)):
+        results = list(inventory.get_many(["a", "b", "c"], processes=2, stream=True))
+    assert sorted(bildid for bildid, _ in results) == ["a", "b", "c"]
+    assert all(inv["manifest"] == SAMPLE_INVENTORY["manifest"] for _, inv in results)
+    after = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+    assert after <= before
+
+
+def test_get_stream_returns_none_on_bad_gzip():
+    bad = b"\x1f\x8b" + b"not really gzip"
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        mock_get.return_value = make_stream_response(None, raw=bad)
+        assert inventory.get(bildid="act-bag", stream=True) is None
+
+
+# --- DatasetInventory.download() ---
+
+BLOB = bytes(range(256)) * 40  # 10 KiB
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    support_ranges = True
+    ranges = []
+
+    def do_GET(self):
+        header = self.headers.get("Range")
+        if header and self.support_ranges:
+            start, _, end = header[len("bytes="):].partition("-")
+            start, end = int(start), int(end) if end else len(BLOB) - 1
+            type(self).ranges.append((start, end))
+            body = BLOB[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(BLOB)}")
+        else:
+            body = BLOB
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def blob_server():
+    _RangeHandler.support_ranges = True
+    _RangeHandler.ranges = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def blob_inventory(server, **checksums):
+    url = f"{server}/act-bag/big.tif"
+    entry = {"download_url": url, "size": len(BLOB), **checksums}
+    return DatasetInventory({"manifest": [entry]}, "act-bag")
+
+
+def test_download_fetches_large_files_in_segments(blob_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    blob_inventory(blob_server).download(segment_threshold=1024, segment_size=1024)
+    assert (tmp_path / "act-bag" / "act-bag" / "big.tif").read_bytes() == BLOB
+    assert sorted(_RangeHandler.ranges) == [(i, min(i + 1023, len(BLOB) - 1)) for i in range(0, len(BLOB), 1024)]
+    assert not (tmp_path / "act-bag" / "act-bag" / "big.tif.part.segments").exists()
+
+
+def test_download_resumes_only_missing_segments(blob_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dest = tmp_path / "act-bag" / "act-bag" / "big.tif"
+    dest.parent.mkdir(parents=True)
+    part = bytearray(len(BLOB))
+    part[:4096] = BLOB[:4096]
+    (dest.parent / "big.tif.part").write_bytes(bytes(part))
+    (dest.parent / "big.tif.part.segments").write_text(
+        json.dumps({"size": len(BLOB), "segment_size": 1024, "done": [0, 1, 2, 3]})
+    )
+    blob_inventory(blob_server).download(segment_threshold=1024, segment_size=1024)
+    assert dest.read_bytes() == BLOB
+    assert min(start for start, _ in _RangeHandler.ranges) == 4096
+
+
+def test_download_falls_back_without_range_support(blob_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _RangeHandler.support_ranges = False
+    blob_inventory(blob_server).download(segment_threshold=1024, segment_size=1024)
+    assert (tmp_path / "act-bag" / "act-bag" / "big.tif").read_bytes() == BLOB
+
+
+def read_report(tmp_path):
+    return pd.read_csv(tmp_path / "act-bag" / "act-bag.verification.tsv", sep="\t")
+
+
+def test_download_verifies_checksum_of_resumed_file(blob_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dest = tmp_path / "act-bag" / "act-bag" / "big.tif"
+    dest.parent.mkdir(parents=True)
+    (dest.parent / "big.tif.part").write_bytes(BLOB[:1000])
+    digest = hashlib.sha256(BLOB).hexdigest()
+    blob_inventory(blob_server, sha256=digest).download(verify="sha256", segments=1)
+    assert dest.read_bytes() == BLOB
+    report = read_report(tmp_path)
+    assert report.loc[0, "status"] == "ok"
+    assert report.loc[0, "actual"] == digest
+
+
+def test_segmented_download_hashes_in_a_single_pass(blob_server, tmp_path, monkeypatch):
+    from brainimagelibrary import _download
+
+    monkeypatch.chdir(tmp_path)
+    read_back = []
+    original = _download._OrderedHasher._read
+
+    def _read(self, end):
+        read_back.append(max(end - self.position, 0))
+        original(self, end)
+
+    monkeypatch.setattr(_download._OrderedHasher, "_read", _read)
+    monkeypatch.setattr(_download, "_hash_file", None)  # a full second read would fail
+    dest = tmp_path / "act-bag" / "act-bag" / "big.tif"
+    dest.parent.mkdir(parents=True)
+    part = bytearray(len(BLOB))
+    part[:2048] = BLOB[:2048]
+    (dest.parent / "big.tif.part").write_bytes(bytes(part))
+    (dest.parent / "big.tif.part.segments").write_text(
+        json.dumps({"size": len(BLOB), "segment_size": 1024, "done": [0, 1]})
+    )
+    digest = hashlib.sha256(BLOB).hexdigest()
+    blob_inventory(blob_server, sha256=digest).download(
+        verify="sha256", segment_threshold=1024, segment_size=1024
+    )
+    assert dest.read_bytes() == BLOB
+    assert read_report(tmp_path).loc[0, "actual"] == digest
+    assert read_back[:2] == [1024, 1024]  # the segments already on disk
+    assert sum(read_back) < len(BLOB)
+
+
+def test_download_refetches_corrupted_part(blob_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dest = tmp_path / "act-bag" / "act-bag" / "big.tif"
+    dest.parent.mkdir(parents=True)
+    (dest.parent / "big.tif.part").write_bytes(b"\0" * 1000)
+    blob_inventory(blob_server, md5=hashlib.md5(BLOB).hexdigest()).download(segments=1)
+    assert dest.read_bytes() == BLOB
+    assert read_report(tmp_path).loc[0, "status"] == "ok"
+
+
+def test_download_reports_persistent_mismatch(blob_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    blob_inventory(blob_server, md5="0" * 32).download(
+        refetch=2, segment_threshold=1024, segment_size=4096
+    )
+    assert not (tmp_path / "act-bag" / "act-bag" / "big.tif").exists()
+    assert not (tmp_path / "act-bag" / "act-bag" / "big.tif.part").exists()
+    assert len(_RangeHandler.ranges) == 3 * 3  # three segments, three attempts
+    report = read_report(tmp_path)
+    assert report.loc[0, "status"] == "mismatch"
+    assert report.loc[0, "actual"] == hashlib.md5(BLOB).hexdigest()
+
+
+def test_download_verifies_the_cheapest_checksum(blob_server, tmp_path, monkeypatch):
+    from brainimagelibrary import _download
+
+    monkeypatch.chdir(tmp_path)
+    checksums = {
+        "md5": hashlib.md5(BLOB).hexdigest(),
+        "sha256": hashlib.sha256(BLOB).hexdigest(),
+        "b2sum": hashlib.blake2b(BLOB).hexdigest(),
+        "xxh64": "0" * 16,
+    }
+    monkeypatch.setattr(_download, "xxhash", None)
+    blob_inventory(blob_server, **checksums).download(segments=1)
+    report = read_report(tmp_path)
+    assert report.loc[0, "algorithm"] == "b2sum"
+    assert report.loc[0, "status"] == "ok"
+    assert not list(tmp_path.glob("*.tsv"))  # nothing left in the working directory
+
+
+def test_cheapest_checksum_prefers_xxh64_when_installed(monkeypatch):
+    from brainimagelibrary import _download
+
+    monkeypatch.setattr(_download, "xxhash", object())
+    assert _download.cheapest_checksum(["md5", "xxh64", "sha256"]) == "xxh64"
+    monkeypatch.setattr(_download, "xxhash", None)
+    assert _download.cheapest_checksum(["md5", "xxh64", "sha256"]) == "md5"
+    assert _download.cheapest_checksum(["download_url", "size"]) is None
+
+
+def test_download_rejects_unknown_checksum(caplog):
+    data = DatasetInventory(SAMPLE_INVENTORY, "act-bag")
+    assert data.download(verify="crc32") is None
+    assert "checksum must be one of" in caplog.text
+
+
+def local_inventory(server, source):
+    entry = {
+        "download_url": f"{server}/act-bag/big.tif",
+        "fullpath": str(source),
+        "size": len(BLOB),
+    }
+    return DatasetInventory({"manifest": [entry]}, "act-bag")
+
+
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "symlink"])
+def test_download_stages_local_files_without_http(blob_server, tmp_path, monkeypatch, mode):
+    source = tmp_path / "bil" / "big.tif"
+    source.parent.mkdir()
+    source.write_bytes(BLOB)
+    monkeypatch.chdir(tmp_path)
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        local_inventory(blob_server, source).download(local=mode)
+    mock_get.assert_not_called()
+    dest = tmp_path / "act-bag" / "act-bag" / "big.tif"
+    assert dest.read_bytes() == BLOB
+    assert dest.is_symlink() == (mode == "symlink")
+    if mode == "hardlink":
+        assert dest.stat().st_ino == source.stat().st_ino
+    assert read_report(tmp_path).loc[0, "status"] == "local"
+
+
+def test_download_uses_http_when_local_size_differs(blob_server, tmp_path, monkeypatch):
+    source = tmp_path / "big.tif"
+    source.write_bytes(BLOB[:10])
+    monkeypatch.chdir(tmp_path)
+    local_inventory(blob_server, source).download()
+    assert (tmp_path / "act-bag" / "act-bag" / "big.tif").read_bytes() == BLOB
+
+
+def test_download_uses_http_when_local_source_missing(blob_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    local_inventory(blob_server, tmp_path / "missing.tif").download()
+    assert (tmp_path / "act-bag" / "act-bag" / "big.tif").read_bytes() == BLOB
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from brainimagelibrary.inventory import DatasetInventory
+from brainimagelibrary.manifest import Manifest
+
+
+RECORDS = [
+    {"extension": "tif", "size": 512, "is_cell_by_gene": False, "download_url": "https://download.brainimagelibrary.org/act-bag/a/file1.tif"},
+    {"extension": "tif", "size": 256, "is_cell_by_gene": False, "download_url": "https://download.brainimagelibrary.org/act-bag/a/file2.tif"},
+    {"extension": "csv", "size": 10, "is_cell_by_gene": True, "download_url": "https://download.brainimagelibrary.org/act-bag/b/genes.csv", "md5": "abc"},
+    {"extension": "tif", "size": 64, "is_cell_by_gene": False, "download_url": "https://download.brainimagelibrary.org/act-bag/a/file3.tif"},
+]
+
+
+def test_round_trips_records():
+    manifest = Manifest.from_records(RECORDS)
+    assert len(manifest) == 4
+    assert manifest == RECORDS
+    assert list(manifest) == RECORDS
+    assert manifest[-1] == RECORDS[-1]
+    assert manifest[1:3] == RECORDS[1:3]
+
+
+def test_missing_keys_are_omitted_from_rows():
+    manifest = Manifest.from_records(RECORDS)
+    assert "md5" not in manifest[0]
+    assert manifest[2]["md5"] == "abc"
+    assert manifest.column("md5").isna().tolist() == [True, True, False, True]
+
+
+def test_columns_use_compact_types():
+    manifest = Manifest.from_records(RECORDS)
+    assert manifest.column("size").dtype == np.int64
+    assert manifest.column("is_cell_by_gene").dtype == bool
+    assert isinstance(manifest.column("extension").dtype, pd.CategoricalDtype)
+
+
+def test_path_prefixes_are_interned():
+    manifest = Manifest.from_records(RECORDS)
+    assert manifest._columns["download_url"].prefixes[:2] == [
+        "https://download.brainimagelibrary.org/act-bag/a/",
+        "https://download.brainimagelibrary.org/act-bag/b/",
+    ]
+    assert manifest.column("download_url").tolist() == [r["download_url"] for r in RECORDS]
+
+
+def test_mixed_types_fall_back_to_python_values():
+    records = [{"size": 1, "name": "a/b"}, {"size": 2.5, "name": 3}, {"name": "c"}]
+    manifest = Manifest.from_records(records)
+    assert manifest == records
+    assert manifest.column("size").tolist()[:2] == [1.0, 2.5]
+
+
+def test_to_frame_selects_columns_and_skips_unknown():
+    frame = Manifest.from_records(RECORDS).to_frame(columns=["extension", "size", "nope"])
+    assert list(frame.columns) == ["extension", "size"]
+    assert frame.groupby("extension", observed=True)["size"].sum().to_dict() == {"tif": 832, "csv": 10}
+
+
+def test_empty_manifest():
+    manifest = Manifest.from_records([])
+    assert len(manifest) == 0
+    assert manifest == []
+    assert manifest.column("size") is None
+    assert manifest.to_frame().empty
+
+
+def test_dataset_inventory_converts_manifest():
+    data = DatasetInventory({"manifest": RECORDS}, "act-bag")
+    assert isinstance(data["manifest"], Manifest)
+    assert data["manifest"] == RECORDS
+
+
+def test_export_and_restore_round_trip():
+    records = RECORDS + [
+        {"extension": "tif", "size": 2.5, "md5": "nul\0inside", "download_url": "no-slash", "tags": ["x"]},
+    ]
+    manifest = Manifest.from_records(records)
+    layout, arrays = manifest._export()
+    assert all(isinstance(a, np.ndarray) and a.dtype != object for a in arrays)
+    restored = Manifest._restore(layout, [a.copy() for a in arrays])
+    assert restored == records
+    assert restored.column("md5").isna().tolist() == [True, True, False, True, False]
+    assert Manifest._restore(*Manifest.from_records([])._export()) == []
+
+
+def test_column_order_follows_records():
+    manifest = Manifest.from_records([{"z": 1, "a": 2, "m": 3}, {"b": 4, "z": 5}])
+    assert manifest.columns == ["z", "a", "m", "b"]
+    assert list(manifest[0]) == ["z", "a", "m"]
+
+
+def test_only_paths_are_interned_as_paths():
+    records = [
+        {"mime_type": "image/tiff", "fullpath": "a/b.tif", "url": "https://x.org/a/b.tif"}
+        for _ in range(10)
+    ]
+    columns = Manifest.from_records(records)._columns
+    assert isinstance(columns["mime_type"], pd.Categorical)
+    assert not isinstance(columns["fullpath"], (pd.Categorical, np.ndarray))
+    assert not isinstance(columns["url"], (pd.Categorical, np.ndarray))
+
+
+def test_to_list_is_json_serializable():
+    import json
+
+    manifest = Manifest.from_records(RECORDS)
+    assert json.loads(json.dumps(manifest.to_list())) == RECORDS
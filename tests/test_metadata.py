@@ -25,7 +25,7 @@ def test_get_returns_empty_dict_when_no_bildid():
 
 
 def test_get_returns_metadata_on_success():
-    with patch("brainimagelibrary.metadata.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(VALID_RESPONSE)
         result = metadata.get(bildid="act-bag")
     assert result == VALID_RESPONSE
@@ -33,7 +33,7 @@ def test_get_returns_metadata_on_success():
 
 
 def test_get_uses_retrieve_endpoint():
-    with patch("brainimagelibrary.metadata.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(VALID_RESPONSE)
         metadata.get(bildid="act-bag")
     called_url = mock_get.call_args[0][0]
@@ -42,21 +42,21 @@ def test_get_uses_retrieve_endpoint():
 
 
 def test_get_returns_empty_dict_when_not_found():
-    with patch("brainimagelibrary.metadata.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(NOT_FOUND_RESPONSE)
         result = metadata.get(bildid="nonexistent")
     assert result == {}
 
 
 def test_get_returns_none_on_request_exception():
-    with patch("brainimagelibrary.metadata.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("network error")
         result = metadata.get(bildid="act-bag")
     assert result is None
 
 
 def test_get_passes_params_and_headers():
-    with patch("brainimagelibrary.metadata.requests.get") as mock_get:
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
         mock_get.return_value = make_mock_response(VALID_RESPONSE)
         metadata.get(bildid="act-bag", params={"foo": "bar"}, headers={"X-Test": "1"})
     _, kwargs = mock_get.call_args
@@ -0,0 +1,195 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import brainimagelibrary
+from brainimagelibrary import client
+from brainimagelibrary.client import Client
+from brainimagelibrary.coalesce import Coalescer
+from brainimagelibrary.metrics import Histogram, Metrics, RequestEvent, endpoint
+from brainimagelibrary.retry import RetryPolicy
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = 0
+
+    def do_GET(self):
+        cls = type(self)
+        if cls.failures:
+            cls.failures -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.failures = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def restore_client():
+    previous = client.set_client(None)
+    yield
+    client.set_client(previous)
+
+
+# --- endpoint / Histogram ---
+
+def test_endpoint_groups_dois_and_files():
+    assert endpoint("https://api.datacite.org/dois/10.35077/act-bag/citations") == (
+        "api.datacite.org",
+        "/dois/{doi}/citations",
+    )
+    assert endpoint("https://api.semanticscholar.org/graph/v1/paper/DOI:10.35077/ace-and") == (
+        "api.semanticscholar.org",
+        "/graph/v1/paper/DOI:{doi}",
+    )
+    assert endpoint(
+        "https://download.brainimagelibrary.org/inventory/datasets/JSON/act-bag.json.gz"
+    ) == ("download.brainimagelibrary.org", "/inventory/datasets/JSON/{file}")
+    assert endpoint("https://download.brainimagelibrary.org/2019/02/13/a/b.tif") == (
+        "download.brainimagelibrary.org",
+        "/{file}",
+    )
+    assert endpoint("https://api.brainimagelibrary.org/query?bildid=x") == (
+        "api.brainimagelibrary.org",
+        "/query",
+    )
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1, 2, 4))
+    for value in (0.5, 1, 1.5, 3, 10):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(1, 2), (2, 3), (4, 4), (float("inf"), 5)]
+    assert histogram.count == 5
+    assert histogram.sum == 16
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(0.99) == 4
+    assert Histogram((1,)).quantile(0.5) is None
+
+
+# --- Metrics ---
+
+def test_metrics_aggregate_events_and_notify_subscribers():
+    metrics = Metrics()
+    seen = []
+    metrics.subscribe(seen.append)
+    metrics.record(RequestEvent("GET", "https://api.crossref.org/works/10.1038/x", 200, 100, 0.2, cache="miss"))
+    metrics.record(RequestEvent("GET", "https://api.crossref.org/works/10.1038/y", 404, 10, 0.1, retries=2))
+    metrics.unsubscribe(seen.append)
+    metrics.record(RequestEvent("GET", "https://api.crossref.org/works", None, 0, 5.0, error="Timeout"))
+
+    assert len(seen) == 2
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == 3
+    assert snapshot["errors"] == 1
+    assert snapshot["retries"] == 2
+    assert snapshot["bytes"] == 110
+    assert snapshot["cache"] == {"hit": 0, "miss": 1}
+    works = snapshot["endpoints"]["api.crossref.org/works/{doi}"]
+    assert works["statuses"] == {200: 1, 404: 1}
+    assert works["latency"]["count"] == 2
+    assert snapshot["endpoints"]["api.crossref.org/works"]["errors"] == {"Timeout": 1}
+
+    metrics.reset()
+    assert metrics.snapshot()["requests"] == 0
+
+
+def test_failing_subscriber_does_not_break_recording():
+    metrics = Metrics()
+    metrics.subscribe(lambda event: 1 / 0)
+    metrics.record(RequestEvent("GET", "https://example.org/", 200, 1, 0.01))
+    assert metrics.snapshot()["requests"] == 1
+
+
+def test_to_prometheus_renders_counters_and_histograms():
+    metrics = Metrics()
+    metrics.record(RequestEvent("GET", "https://api.datacite.org/dois/10.35077/a", 200, 2048, 0.03, cache="hit"))
+    text = metrics.to_prometheus(prefix="bil")
+    labels = 'host="api.datacite.org",endpoint="/dois/{doi}"'
+    assert "# TYPE bil_requests_total counter" in text
+    assert f'bil_requests_total{{{labels},status="200"}} 1' in text
+    assert f'bil_cache_total{{{labels},result="hit"}} 1' in text
+    assert "# TYPE bil_request_duration_seconds histogram" in text
+    assert f'bil_request_duration_seconds_bucket{{{labels},le="0.025"}} 0' in text
+    assert f'bil_request_duration_seconds_bucket{{{labels},le="0.05"}} 1' in text
+    assert f'bil_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f"bil_response_size_bytes_sum{{{labels}}} 2048" in text
+    assert f"bil_response_size_bytes_count{{{labels}}} 1" in text
+    assert text.endswith("\n")
+
+
+# --- Client integration ---
+
+def test_client_records_status_bytes_and_cache(server):
+    metrics = Metrics()
+    events = []
+    metrics.subscribe(events.append)
+    with Client(metrics=metrics, coalesce=Coalescer(ttl=60)) as c:
+        c.get(f"{server}/retrieve")
+        c.get(f"{server}/retrieve")
+        c.get(f"{server}/download", stream=True).close()
+        stats = c.stats()
+    assert [(e.status, e.bytes, e.cache) for e in events] == [
+        (200, 12, "miss"),
+        (200, 12, "hit"),
+        (200, 12, None),
+    ]
+    assert all(e.host == "127.0.0.1" and e.seconds > 0 for e in events)
+    assert stats["metrics"]["requests"] == 3
+    assert stats["metrics"]["cache"] == {"hit": 1, "miss": 1}
+
+
+def test_client_records_retries_and_errors(server):
+    _Handler.failures = 2
+    metrics = Metrics()
+    events = []
+    metrics.subscribe(events.append)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        closed = s.getsockname()[1]
+    with Client(metrics=metrics, retry=RetryPolicy(attempts=3, backoff=0)) as c:
+        assert c.get(f"{server}/retrieve").status_code == 200
+        with pytest.raises(requests.exceptions.ConnectionError):
+            c.get(f"http://127.0.0.1:{closed}/", timeout=1)
+    assert events[0].retries == 2
+    assert events[0].status == 200
+    assert events[1].status is None
+    assert events[1].error == "ConnectionError"
+    assert events[1].retries == 2
+
+
+def test_client_without_metrics_reports_none(server):
+    with Client() as c:
+        c.get(f"{server}/retrieve")
+        assert "metrics" not in c.stats()
+
+
+def test_package_stats_reads_shared_client(restore_client, server):
+    metrics = Metrics()
+    client.set_client(Client(metrics=metrics))
+    client.get_client().get(f"{server}/retrieve")
+    assert brainimagelibrary.stats()["metrics"]["requests"] == 1
+    assert brainimagelibrary.stats()["requests"] == 1
@@ -0,0 +1,188 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from brainimagelibrary import mirror, query
+from brainimagelibrary.mirror import Mirror
+
+
+def record(bildid, affiliation="Carnegie Mellon University", species="Mus musculus", version="2.0"):
+    return {
+        "retjson": [
+            {
+                "Submission": {"metadata": version, "project": f"Project {bildid}"},
+                "Contributors": [
+                    {"contributorname": "Ada", "affiliation": affiliation},
+                    {"contributorname": "Grace", "affiliation": "Allen Institute"},
+                ],
+                "Funders": [{"funder": "NIH", "award_number": "U01"}],
+                "Dataset": [{"bildirectory": f"/bil/data/{bildid}", "title": f"Title {bildid}"}],
+                "Specimen": [{"species": species, "genotype": "wild type"}],
+            }
+        ]
+    }
+
+
+RECORDS = {
+    "act-bag": record("act-bag"),
+    "ace-cat": record("ace-cat", affiliation="Salk Institute", species="Homo sapiens", version="1.0"),
+}
+
+
+def fake_get(records):
+    def get(url, params=None, headers=None, **kwargs):
+        response = MagicMock()
+        bildid = url.rsplit("bildid=", 1)[-1]
+        if bildid == "broken":
+            raise requests.exceptions.ConnectionError("down")
+        response.json.return_value = records.get(bildid, {"message": "GET failure, no entry found"})
+        return response
+
+    return get
+
+
+@pytest.fixture
+def local(tmp_path):
+    m = Mirror(str(tmp_path / "mirror.sqlite"))
+    previous = mirror.set_mirror(m)
+    yield m
+    mirror.set_mirror(previous)
+    m.close()
+
+
+def test_sync_populates_normalized_tables(local):
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)):
+        counts = local.sync(["act-bag", "ace-cat"])
+    assert counts == {"added": 2, "updated": 0, "unchanged": 0, "removed": 0, "failed": 0}
+    stats = local.stats()
+    assert stats["datasets"] == 2
+    assert stats["contributors"] == 4
+    assert stats["specimen"] == 2
+
+
+def test_sync_is_incremental(local):
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)) as mock_get:
+        local.sync(["act-bag"])
+        counts = local.sync(["act-bag", "ace-cat"])
+        assert mock_get.call_count == 2
+    assert counts["added"] == 1
+
+
+def test_sync_refresh_detects_changes(local):
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)):
+        local.sync(["act-bag", "ace-cat"])
+    changed = dict(RECORDS, **{"act-bag": record("act-bag", affiliation="MIT")})
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(changed)):
+        counts = local.sync(["act-bag", "ace-cat"], refresh=True)
+    assert counts["updated"] == 1 and counts["unchanged"] == 1
+    assert local.by_affiliation("MIT")["retjson"][0]["Submission"]["project"] == "Project act-bag"
+
+
+def test_sync_prunes_withdrawn_datasets_and_counts_failures(local):
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)):
+        local.sync(["act-bag", "ace-cat"])
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)), \
+         patch("brainimagelibrary.reports.get_all_bildids", return_value=["act-bag", "broken"]):
+        counts = local.sync()
+    assert counts["removed"] == 1 and counts["failed"] == 1
+    assert local.bildids() == ["act-bag"]
+    assert local.stats()["contributors"] == 2
+
+
+def test_sync_keeps_datasets_on_server_errors(local):
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)):
+        local.sync(["act-bag"])
+    errors = {"act-bag": {"success": False, "message": "Internal Server Error"}}
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(errors)):
+        counts = local.sync(["act-bag"], refresh=True)
+    assert counts["removed"] == 0 and counts["failed"] == 1
+    assert local.bildids() == ["act-bag"]
+
+
+def test_offline_queries_do_not_touch_the_network(local):
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)):
+        local.sync(["act-bag", "ace-cat"])
+    with patch("brainimagelibrary.client.Client.get") as mock_get:
+        assert query.by_id("act-bag", offline=True) == RECORDS["act-bag"]
+        assert query.by_id("missing", offline=True) == {}
+        assert query.by_directory("/bil/data/ace-cat/", offline=True) == RECORDS["ace-cat"]
+        assert query.by_affiliation("salk", offline=True) == RECORDS["ace-cat"]
+        assert len(query.by_affiliation("Allen", offline=True)["retjson"]) == 2
+        assert query.by_text("homo SAPIENS", offline=True) == RECORDS["ace-cat"]
+        assert query.by_version("1.0", offline=True) == ["ace-cat"]
+        assert query.by_ids(["act-bag", "missing"], offline=True) == [
+            ("act-bag", RECORDS["act-bag"]),
+            ("missing", {}),
+        ]
+        mock_get.assert_not_called()
+
+
+def test_by_affiliation_escapes_like_wildcards(local):
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(RECORDS)):
+        local.sync(["act-bag"])
+    assert local.by_affiliation("%") == {}
+
+
+# --- full-text search ---
+
+@pytest.fixture
+def searchable(local):
+    records = dict(
+        RECORDS,
+        **{
+            "mouse-only": record("mouse-only", species="mouse"),
+            "abstracts": {
+                "retjson": [
+                    {
+                        "Submission": {"metadata": "2.0", "project": "BICCN"},
+                        "Dataset": [
+                            {
+                                "bildirectory": "/bil/data/abstracts",
+                                "title": "Mouse mouse mouse cortex",
+                                "abstract": "Whole-brain imaging of H19.28.012 mouse cortices",
+                            }
+                        ],
+                        "Specimen": [{"species": "Mus musculus", "genotype": "Ai14"}],
+                    }
+                ]
+            },
+        },
+    )
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(records)):
+        local.sync(list(records))
+    return local
+
+
+def test_search_ranks_by_relevance(searchable):
+    assert searchable.search("mouse")[0] == "abstracts"
+    assert searchable.search("mouse", limit=1) == ["abstracts"]
+
+
+def test_search_supports_fields_and_boolean_operators(searchable):
+    assert searchable.search("species:mouse") == ["mouse-only"]
+    assert sorted(searchable.search("salk OR genotype:ai14")) == ["abstracts", "ace-cat"]
+    assert "ace-cat" not in searchable.search("institute NOT salk")
+    assert searchable.search("cortex") == ["abstracts"]  # stemmed: cortices
+
+
+def test_search_falls_back_to_literal_words(searchable):
+    assert searchable.search("H19.28.012") == ["abstracts"]
+    assert searchable.search("whole-brain") == ["abstracts"]
+
+
+def test_search_index_follows_updates_and_removals(searchable):
+    changed = dict(RECORDS, **{"act-bag": record("act-bag", affiliation="Broad Institute")})
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get(changed)):
+        searchable.sync(["act-bag"], refresh=True)
+    assert searchable.search("broad") == ["act-bag"]
+    with patch("brainimagelibrary.client.Client.get", side_effect=fake_get({})):
+        searchable.sync(["act-bag"], refresh=True)
+    assert searchable.search("broad") == []
+
+
+def test_search_index_is_rebuilt_for_existing_mirrors(searchable):
+    searchable._db.execute("DELETE FROM search")
+    reopened = Mirror(searchable.path)
+    assert reopened.search("salk") == ["ace-cat"]
+    reopened.close()
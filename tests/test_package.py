@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import pytest
+
+import brainimagelibrary as bil
+from brainimagelibrary import inventory, reports, retrieve, summary
+
+
+HEAVY = ("pandas", "numpy", "tqdm")
+
+
+def modules_loaded_by(statement):
+    code = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+
+def test_import_does_not_load_submodules_or_heavy_dependencies():
+    loaded = modules_loaded_by("import brainimagelibrary")
+    assert not loaded & set(HEAVY)
+    assert not {m for m in loaded if m.startswith("brainimagelibrary.")}
+
+
+def test_query_and_citation_lookups_do_not_load_pandas():
+    loaded = modules_loaded_by("from brainimagelibrary import query, datecite")
+    assert "pandas" not in loaded
+
+
+def test_every_public_name_resolves():
+    for name in bil.__all__:
+        assert getattr(bil, name) is not None
+    assert set(bil.__all__) <= set(dir(bil))
+
+
+def test_bindings_match_the_former_star_imports():
+    assert bil.summary is summary
+    assert bil.daily is summary.daily
+    assert bil.load is summary.load
+    assert bil.get is inventory.get
+    assert bil.get_all_bildids is reports.get_all_bildids
+    assert bil.by_id is retrieve.by_id
+
+
+def test_submodules_load_on_attribute_access():
+    assert bil.mirror.Mirror is not None
+
+
+def test_unknown_attribute_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        bil.does_not_exist
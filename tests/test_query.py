@@ -8,8 +8,8 @@ import brainimagelibrary.query as query
 VALID_RESPONSE = {"retjson": [{"bildid": "act-bag", "title": "Test Dataset"}]}
 NOT_FOUND_RESPONSE = {"message": "GET failure, no entry found"}
 
-# Patch target: requests.get lives in _api after the refactor
-_PATCH = "brainimagelibrary._api.requests.get"
+# Patch target: every HTTP call goes through the shared Client
+_PATCH = "brainimagelibrary.client.Client.get"
 
 
 def make_mock_response(json_data, status_code=200):
@@ -181,3 +181,81 @@ def test_by_version_returns_none_on_request_exception():
         mock_get.side_effect = requests.exceptions.RequestException("timeout")
         result = query.by_version()
     assert result is None
+
+
+# --- by_ids ---
+
+def test_by_ids_deduplicates_and_preserves_order():
+    with patch("brainimagelibrary.query.by_id") as mock_by_id:
+        mock_by_id.side_effect = lambda bildid, params=None, headers=None: {"id": bildid}
+        result = query.by_ids(["b", "a", "b", "", None, "c"])
+    assert result == [("b", {"id": "b"}), ("a", {"id": "a"}), ("c", {"id": "c"})]
+    assert mock_by_id.call_count == 3
+
+
+def test_by_ids_reports_per_item_errors():
+    def fake_by_id(bildid, params=None, headers=None):
+        if bildid == "bad":
+            raise ValueError("boom")
+        return {"id": bildid}
+
+    with patch("brainimagelibrary.query.by_id", side_effect=fake_by_id):
+        result = dict(query.by_ids(["good", "bad"]))
+    assert result["good"] == {"id": "good"}
+    assert isinstance(result["bad"], ValueError)
+
+
+def test_batches_share_threads_and_respect_max_workers():
+    import threading
+    import time
+
+    from brainimagelibrary._api import _batch
+
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "threads": set()}
+
+    def work(key):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            state["threads"].add(threading.current_thread().name)
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return key
+
+    def pool_threads():
+        return {t.ident for t in threading.enumerate() if t.name.startswith("brainimagelibrary-batch")}
+
+    assert _batch(work, range(1, 13), max_workers=3) == [(i, i) for i in range(1, 13)]
+    before = pool_threads()
+    _batch(work, range(1, 13), max_workers=3)
+    assert pool_threads() == before
+    assert state["peak"] <= 3
+    assert all(name.startswith("brainimagelibrary-batch") for name in state["threads"])
+
+
+def test_nested_batches_do_not_deadlock():
+    from brainimagelibrary._api import _SHARED_POOL_SIZE, _batch
+
+    def outer(key):
+        return [value for _, value in _batch(lambda k: k * 2, range(1, 4), max_workers=2)]
+
+    results = _batch(outer, range(1, _SHARED_POOL_SIZE + 5), max_workers=_SHARED_POOL_SIZE)
+    assert all(value == [2, 4, 6] for _, value in results)
+
+
+def test_by_ids_stream_yields_all_pairs():
+    with patch("brainimagelibrary.query.by_id") as mock_by_id:
+        mock_by_id.side_effect = lambda bildid, params=None, headers=None: {"id": bildid}
+        result = query.by_ids(["a", "b", "c"], max_workers=2, stream=True)
+        assert not isinstance(result, list)
+        pairs = sorted(result)
+    assert pairs == [("a", {"id": "a"}), ("b", {"id": "b"}), ("c", {"id": "c"})]
+
+
+def test_by_urls_delegates_to_by_url():
+    urls = ["https://download.brainimagelibrary.org/a", "https://download.brainimagelibrary.org/b"]
+    with patch("brainimagelibrary.query.by_url", side_effect=lambda url: {"url": url}):
+        result = query.by_urls(urls)
+    assert [url for url, _ in result] == urls
@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from brainimagelibrary.client import Client
+from brainimagelibrary.ratelimit import AdaptiveConcurrency, RateLimiter, TokenBucket
+from brainimagelibrary.retry import RetryPolicy
+
+
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        status = 429 if self.path == "/throttled" else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ThrottlingHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# --- TokenBucket ---
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=50, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == sorted(waits)
+    assert waits[-1] == pytest.approx(3 / 50, abs=0.01)
+
+
+def test_token_bucket_is_shared_across_threads():
+    bucket = TokenBucket(rate=40, burst=1)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: bucket.acquire(), range(9)))
+    assert time.monotonic() - start >= 0.18
+
+
+# --- AdaptiveConcurrency ---
+
+def test_adaptive_concurrency_halves_on_throttle_once_per_cooldown():
+    limit = AdaptiveConcurrency(maximum=8, cooldown=60)
+    for _ in range(3):
+        limit.acquire()
+    for _ in range(3):
+        limit.release(throttled=True)
+    assert int(limit.limit) == 4
+    assert limit.throttled == 3
+
+
+def test_adaptive_concurrency_recovers_additively():
+    limit = AdaptiveConcurrency(maximum=8, cooldown=0)
+    limit.acquire()
+    limit.release(throttled=True)
+    assert limit.limit == 4
+    for _ in range(4):
+        limit.acquire()
+        limit.release()
+    assert 4.9 < limit.limit < 5.1
+
+
+def test_adaptive_concurrency_bounds_requests_in_flight():
+    limit = AdaptiveConcurrency(maximum=2)
+    peak = 0
+    lock = threading.Lock()
+
+    def _work(_):
+        nonlocal peak
+        limit.acquire()
+        with lock:
+            peak = max(peak, limit.in_flight)
+        time.sleep(0.01)
+        limit.release()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_work, range(16)))
+    assert peak == 2
+
+
+# --- RateLimiter / Client ---
+
+def test_unlisted_hosts_are_not_limited():
+    limiter = RateLimiter()
+    assert limiter.acquire("https://api.brainimagelibrary.org/retrieve") is None
+    assert limiter.stats() == {}
+
+
+def test_client_backs_off_when_host_throttles(server):
+    limiter = RateLimiter({"127.0.0.1": {"rate": 1000, "burst": 10, "concurrency": 8}})
+    with Client(retry=RetryPolicy(attempts=1), limiter=limiter) as c:
+        assert c.get(f"{server}/ok").status_code == 200
+        assert c.get(f"{server}/throttled").status_code == 429
+        stats = c.stats()["limits"]["127.0.0.1"]
+    assert stats["requests"] == 2
+    assert stats["throttled"] == 1
+    assert stats["concurrency"] == 4
+    assert stats["in_flight"] == 0
@@ -72,7 +72,7 @@ def test_daily_skips_local_json_when_overwrite_true():
     tsv_content = SAMPLE_DF.to_csv(sep="\t", index=False).encode()
     mock_resp = make_mock_response(content=tsv_content, status_code=200)
     with patch("brainimagelibrary.reports.Path.exists", return_value=True), \
-         patch("brainimagelibrary.reports.requests.get", return_value=mock_resp), \
+         patch("brainimagelibrary.client.Client.get", return_value=mock_resp), \
          patch("builtins.open", mock_open()), \
          patch("brainimagelibrary.reports.pd.read_csv", return_value=SAMPLE_DF):
         result = reports.daily(option="simple", overwrite=True)
@@ -83,7 +83,7 @@ def test_daily_downloads_simple_report_on_success():
     tsv_content = SAMPLE_DF.to_csv(sep="\t", index=False).encode()
     mock_resp = make_mock_response(content=tsv_content, status_code=200)
     with patch("brainimagelibrary.reports.Path.exists", return_value=False), \
-         patch("brainimagelibrary.reports.requests.get", return_value=mock_resp), \
+         patch("brainimagelibrary.client.Client.get", return_value=mock_resp), \
          patch("builtins.open", mock_open()), \
          patch("brainimagelibrary.reports.pd.read_csv", return_value=SAMPLE_DF) as mock_read:
         result = reports.daily(option="simple")
@@ -95,7 +95,7 @@ def test_daily_downloads_detailed_report_on_success():
     tsv_content = SAMPLE_DF.to_csv(sep="\t", index=False).encode()
     mock_resp = make_mock_response(content=tsv_content, status_code=200)
     with patch("brainimagelibrary.reports.Path.exists", return_value=False), \
-         patch("brainimagelibrary.reports.requests.get", return_value=mock_resp) as mock_get, \
+         patch("brainimagelibrary.client.Client.get", return_value=mock_resp) as mock_get, \
          patch("builtins.open", mock_open()), \
          patch("brainimagelibrary.reports.pd.read_csv", return_value=SAMPLE_DF) as mock_read:
         result = reports.daily(option="detailed")
@@ -108,7 +108,7 @@ def test_daily_downloads_detailed_report_on_success():
 def test_daily_falls_back_to_build_when_download_fails():
     mock_resp = make_mock_response(status_code=404)
     with patch("brainimagelibrary.reports.Path.exists", return_value=False), \
-         patch("brainimagelibrary.reports.requests.get", return_value=mock_resp), \
+         patch("brainimagelibrary.client.Client.get", return_value=mock_resp), \
          patch("brainimagelibrary.reports._create_daily_report", return_value=SAMPLE_DF) as mock_build:
         result = reports.daily(option="simple")
     mock_build.assert_called_once()
@@ -117,9 +117,226 @@ def test_daily_falls_back_to_build_when_download_fails():
 
 def test_daily_falls_back_to_build_on_request_exception():
     with patch("brainimagelibrary.reports.Path.exists", return_value=False), \
-         patch("brainimagelibrary.reports.requests.get",
+         patch("brainimagelibrary.client.Client.get",
                side_effect=requests.exceptions.RequestException("timeout")), \
          patch("brainimagelibrary.reports._create_daily_report", return_value=SAMPLE_DF) as mock_build:
         result = reports.daily(option="simple")
     mock_build.assert_called_once()
     assert isinstance(result, pd.DataFrame)
+
+
+# --- _create_daily_report (incremental) ---
+
+def _did(bildid, metadata=None):
+    return {"bildid": bildid, "metadata_version": "2.0", "number_of_files": 99}
+
+
+def _retrieve(bildid, project="P"):
+    return {"retjson": [{"Submission": {"project": project}}]}
+
+
+def _entry(inventory, bildid, checked="20000101", project="P"):
+    return {
+        "inventory": inventory,
+        "metadata": reports._metadata_digest(_retrieve(bildid, project)),
+        "checked": checked,
+    }
+
+
+def _write_previous(tmp_path, rows, validators, date="20000101"):
+    import json
+    reports_dir = tmp_path / "reports"
+    reports_dir.mkdir()
+    pd.DataFrame(rows).to_csv(reports_dir / f"{date}.tsv", sep="\t", index=False)
+    (reports_dir / f"{date}.validators.json").write_text(json.dumps(validators))
+
+
+def test_incremental_report_only_fetches_new_and_changed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _write_previous(
+        tmp_path,
+        [
+            {"bildid": "same", "metadata_version": "1.0", "number_of_files": 1},
+            {"bildid": "changed", "metadata_version": "1.0", "number_of_files": 2},
+            {"bildid": "removed", "metadata_version": "1.0", "number_of_files": 3},
+            {"bildid": "edited", "metadata_version": "1.0", "number_of_files": 4},
+        ],
+        {
+            "same": _entry("a|", "same"),
+            "changed": _entry("b|", "changed"),
+            "removed": _entry("c|", "removed"),
+            "edited": _entry("e|", "edited", project="old"),
+        },
+    )
+    validators = {"same": "a|", "changed": "B|", "new": "n|", "edited": "e|"}
+    with patch("brainimagelibrary.reports.get_all_bildids", return_value=["new", "changed", "same", "edited"]), \
+         patch("brainimagelibrary.reports._get_inventory_validators", return_value=validators), \
+         patch("brainimagelibrary.reports.by_id", side_effect=_retrieve) as mock_by_id, \
+         patch("brainimagelibrary.reports._get_did", side_effect=_did) as mock_did:
+        df = reports._create_daily_report(overwrite=True, incremental=True)
+    fetched = sorted(call.args[0] for call in mock_did.call_args_list)
+    assert fetched == ["changed", "edited", "new"]
+    # "same" and "edited" are re-checked (last checked long ago); "edited" is
+    # rebuilt from that response instead of being fetched a second time.
+    looked_up = sorted(call.kwargs.get("bildid") or call.args[0] for call in mock_by_id.call_args_list)
+    assert looked_up == ["changed", "edited", "new", "same"]
+    assert df["bildid"].tolist() == ["new", "changed", "same", "edited"]
+    assert df.set_index("bildid").loc["same", "number_of_files"] == 1
+    assert df.set_index("bildid").loc["changed", "number_of_files"] == 99
+
+
+def test_incremental_report_skips_metadata_not_due(tmp_path, monkeypatch):
+    from datetime import datetime
+
+    monkeypatch.chdir(tmp_path)
+    today = datetime.today().strftime("%Y%m%d")
+    # a dataset whose slot in the re-check cycle is not today
+    bildid = next(b for b in (f"ds-{i}" for i in range(100)) if not reports._recheck_due(b, _entry("1|", b, today), today))
+    _write_previous(
+        tmp_path,
+        [{"bildid": bildid, "number_of_files": 1}],
+        {bildid: _entry("1|", bildid, checked=today)},
+    )
+    with patch("brainimagelibrary.reports.get_all_bildids", return_value=[bildid]), \
+         patch("brainimagelibrary.reports._get_inventory_validators", return_value={bildid: "1|"}), \
+         patch("brainimagelibrary.reports.by_id") as mock_by_id, \
+         patch("brainimagelibrary.reports._get_did", side_effect=_did) as mock_did:
+        df = reports._create_daily_report(overwrite=True, incremental=True)
+    mock_by_id.assert_not_called()
+    mock_did.assert_not_called()
+    assert df["number_of_files"].tolist() == [1]
+
+
+def test_recheck_due_rotates_through_the_cycle():
+    entries = {b: _entry("1|", b, checked="20240101") for b in map(str, range(200))}
+    days = [f"202401{d:02d}" for d in range(2, 8)] + ["20240101"]
+    picked = [{b for b, v in entries.items() if reports._recheck_due(b, v, day)} for day in days]
+    assert set().union(*picked) == set(entries)
+    assert sum(len(p) for p in picked) == len(entries)
+    assert all(reports._recheck_due(b, v, "20240108") for b, v in entries.items())
+    assert reports._recheck_due("a", {"inventory": "1|"}, "20240102")
+
+
+def test_incremental_report_without_previous_does_full_build(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with patch("brainimagelibrary.reports.get_all_bildids", return_value=["a", "b"]), \
+         patch("brainimagelibrary.reports._get_inventory_validators", return_value={"a": "1|"}), \
+         patch("brainimagelibrary.reports.by_id", side_effect=_retrieve), \
+         patch("brainimagelibrary.reports._get_did", side_effect=_did) as mock_did:
+        df = reports._create_daily_report(overwrite=True, incremental=True)
+    assert mock_did.call_count == 2
+    assert len(df) == 2
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_report_writes_validators_sidecar(tmp_path, monkeypatch, incremental):
+    import json
+    monkeypatch.chdir(tmp_path)
+    with patch("brainimagelibrary.reports.get_all_bildids", return_value=["a", "b", "c"]), \
+         patch("brainimagelibrary.reports._get_inventory_validators", return_value={"a": "1|", "b": "2|"}), \
+         patch("brainimagelibrary.reports.by_id", side_effect=_retrieve) as mock_by_id, \
+         patch("brainimagelibrary.reports._get_did", side_effect=_did):
+        reports._create_daily_report(overwrite=True, incremental=incremental)
+    assert mock_by_id.call_count == 3
+    sidecars = list((tmp_path / "reports").glob("*.validators.json"))
+    assert len(sidecars) == 1
+    today = sidecars[0].name.split(".")[0]
+    assert json.loads(sidecars[0].read_text()) == {"a": _entry("1|", "a", today), "b": _entry("2|", "b", today)}
+
+
+def test_metadata_digest_tracks_retrieve_responses():
+    first = reports._metadata_digest({"retjson": [{"bildate": "2024-01-01"}]})
+    second = reports._metadata_digest({"retjson": [{"bildate": "2024-02-01"}]})
+    assert first and second and first != second
+    assert reports._metadata_digest({}) is None
+    assert reports._metadata_digest(None) is None
+
+
+def test_daily_passes_incremental_to_builder():
+    mock_resp = make_mock_response(status_code=404)
+    with patch("brainimagelibrary.reports.Path.exists", return_value=False), \
+         patch("brainimagelibrary.client.Client.get", return_value=mock_resp), \
+         patch("brainimagelibrary.reports._create_daily_report", return_value=SAMPLE_DF) as mock_build:
+        reports.daily(option="simple", incremental=True)
+    mock_build.assert_called_once_with(False, incremental=True)
+
+
+# --- Parquet reports ---
+
+def test_report_parquet_round_trip_keeps_types(tmp_path):
+    pytest.importorskip("pyarrow")
+    rows = [
+        {"bildid": "a", "metadata_version": "2.0", "species": "Mus musculus", "number_of_files": 3,
+         "size": 2**40, "file_types": ["tif", "json"], "frequencies": {"tif": 2, "json": 1},
+         "mime_types": None, "extra": "kept"},
+        {"bildid": "b", "metadata_version": "1.0", "species": None, "number_of_files": None,
+         "size": None, "file_types": None, "frequencies": None, "mime_types": {"image/tiff": 4},
+         "extra": "also"},
+    ]
+    reports._save_report(pd.DataFrame(rows), {}, tmp_path, "20240101")
+    assert (tmp_path / "20240101.tsv").exists()
+
+    df = reports._read_report(tmp_path / "20240101.tsv")
+    assert isinstance(df["species"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["metadata_version"].dtype, pd.CategoricalDtype)
+    assert df["metadata_version"].tolist() == ["2.0", "1.0"]
+    assert df["size"].iloc[0] == 2**40
+    assert df["file_types"].tolist() == [["tif", "json"], None]
+    assert df["frequencies"].tolist() == [{"tif": 2, "json": 1}, None]
+    assert df["mime_types"].tolist() == [None, {"image/tiff": 4}]
+    assert df["extra"].tolist() == ["kept", "also"]
+
+
+def test_read_report_falls_back_to_tsv(tmp_path):
+    SAMPLE_DF.to_csv(tmp_path / "20240101.tsv", sep="\t", index=False)
+    assert reports._read_report(tmp_path / "20240101.tsv")["bildid"].tolist() == ["act-bag", "xyz-abc"]
+
+    (tmp_path / "20240101.parquet").write_bytes(b"not parquet")
+    df = reports._read_report(tmp_path / "20240101.tsv")
+    assert df["bildid"].tolist() == ["act-bag", "xyz-abc"]
+    assert reports._read_report(tmp_path / "20240102.tsv") is None
+
+
+def test_parquet_from_tsv_rows_parses_nested_reprs(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"bildid": ["a"], "frequencies": ["{'tif': 2}"], "number_of_files": [2.0]})
+    reports._write_parquet(df, tmp_path / "r.parquet")
+    result = reports._read_parquet(tmp_path / "r.parquet")
+    assert result["frequencies"].tolist() == [{"tif": 2}]
+    assert result["number_of_files"].tolist() == [2]
+
+
+def test_parquet_from_tsv_rows_restores_whole_numbers(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame(
+        {
+            "bildid": ["a", "b"],
+            "award_number": [10090.0, float("nan")],
+            "samplelocalid": [1.5, 3.0],
+            "metadata_version": [2.0, 2.0],
+        }
+    )
+    reports._write_parquet(df, tmp_path / "r.parquet")
+    result = reports._read_parquet(tmp_path / "r.parquet")
+    assert result["award_number"].tolist()[0] == "10090"
+    assert pd.isna(result["award_number"].tolist()[1])
+    assert result["samplelocalid"].tolist() == ["1.5", "3"]
+    assert result["metadata_version"].astype(str).tolist() == ["2.0", "2.0"]
+
+
+def test_cached_report_prefers_parquet(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    with patch("brainimagelibrary.reports.get_all_bildids", return_value=["a", "b"]), \
+         patch("brainimagelibrary.reports._get_inventory_validators", return_value={}), \
+         patch("brainimagelibrary.reports.by_id", side_effect=_retrieve), \
+         patch("brainimagelibrary.reports._get_did", side_effect=_did):
+        reports._create_daily_report(overwrite=True)
+    assert len(list((tmp_path / "reports").glob("*.parquet"))) == 1
+
+    with patch("brainimagelibrary.reports.pd.read_csv") as mock_read, \
+         patch("brainimagelibrary.reports.get_all_bildids") as mock_ids:
+        df = reports._create_daily_report(overwrite=False)
+    mock_read.assert_not_called()
+    mock_ids.assert_not_called()
+    assert df["bildid"].tolist() == ["a", "b"]
@@ -8,8 +8,8 @@ from brainimagelibrary import retrieve
 VALID_RESPONSE = {"retjson": [{"bildid": "act-bag", "title": "Test Dataset"}]}
 NOT_FOUND_RESPONSE = {"message": "GET failure, no entry found"}
 
-# Patch target: requests.get lives in _api after the refactor
-_PATCH = "brainimagelibrary._api.requests.get"
+# Patch target: every HTTP call goes through the shared Client
+_PATCH = "brainimagelibrary.client.Client.get"
 
 
 def make_mock_response(json_data, status_code=200):
@@ -120,3 +120,41 @@ def test_by_affiliation_returns_none_on_request_exception():
         mock_get.side_effect = requests.exceptions.RequestException("timeout")
         result = retrieve.by_affiliation("Carnegie Mellon University")
     assert result is None
+
+
+# --- by_ids ---
+
+def test_by_ids_deduplicates_and_preserves_order():
+    with patch("brainimagelibrary.retrieve.by_id") as mock_by_id:
+        mock_by_id.side_effect = lambda bildid, params=None, headers=None: {"id": bildid}
+        result = retrieve.by_ids(["b", "a", "b", "", None, "c"])
+    assert result == [("b", {"id": "b"}), ("a", {"id": "a"}), ("c", {"id": "c"})]
+    assert mock_by_id.call_count == 3
+
+
+def test_by_ids_reports_per_item_errors():
+    def fake_by_id(bildid, params=None, headers=None):
+        if bildid == "bad":
+            raise ValueError("boom")
+        return {"id": bildid}
+
+    with patch("brainimagelibrary.retrieve.by_id", side_effect=fake_by_id):
+        result = dict(retrieve.by_ids(["good", "bad"]))
+    assert result["good"] == {"id": "good"}
+    assert isinstance(result["bad"], ValueError)
+
+
+def test_by_ids_stream_yields_all_pairs():
+    with patch("brainimagelibrary.retrieve.by_id") as mock_by_id:
+        mock_by_id.side_effect = lambda bildid, params=None, headers=None: {"id": bildid}
+        result = retrieve.by_ids(["a", "b", "c"], max_workers=2, stream=True)
+        assert not isinstance(result, list)
+        pairs = sorted(result)
+    assert pairs == [("a", {"id": "a"}), ("b", {"id": "b"}), ("c", {"id": "c"})]
+
+
+def test_by_urls_delegates_to_by_url():
+    urls = ["https://download.brainimagelibrary.org/a", "https://download.brainimagelibrary.org/b"]
+    with patch("brainimagelibrary.retrieve.by_url", side_effect=lambda url: {"url": url}):
+        result = retrieve.by_urls(urls)
+    assert [url for url, _ in result] == urls
@@ -0,0 +1,128 @@
+import socket
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import time
+
+import pytest
+import requests
+
+from brainimagelibrary.client import Client
+from brainimagelibrary.retry import RetryPolicy
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = 0
+    status = 503
+    calls = 0
+
+    def _respond(self, body):
+        cls = type(self)
+        cls.calls += 1
+        if cls.calls <= cls.failures:
+            self.send_response(cls.status)
+            self.send_header("Retry-After", "0")
+            body = b""
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_GET(self):
+        self.wfile.write(self._respond(b'{"ok": true}'))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.wfile.write(self._respond(b"{}"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _FlakyHandler.failures = 0
+    _FlakyHandler.status = 503
+    _FlakyHandler.calls = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# --- RetryPolicy ---
+
+def test_delay_uses_jittered_exponential_backoff():
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(5, 2**attempt)
+
+
+def test_delay_honours_retry_after_seconds_and_dates():
+    policy = RetryPolicy(max_retry_after=60)
+    assert policy.delay(0, {"Retry-After": "7"}, 429) == 7
+    assert policy.delay(0, {"Retry-After": "600"}, 503) == 60
+    future = formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= policy.delay(0, {"Retry-After": future}, 503) <= 31
+
+
+def test_retry_after_is_ignored_for_other_statuses():
+    policy = RetryPolicy(backoff=0)
+    assert policy.delay(0, {"Retry-After": "50"}, 502) == 0
+
+
+def test_should_retry_limits_attempts_and_statuses():
+    policy = RetryPolicy(attempts=3)
+    assert policy.should_retry(0, 502)
+    assert policy.should_retry(1)
+    assert not policy.should_retry(2, 502)
+    assert not policy.should_retry(0, 404)
+    assert not policy.allows("POST")
+
+
+# --- Client integration ---
+
+def test_client_retries_transient_statuses(server):
+    _FlakyHandler.failures = 2
+    with Client(retry=RetryPolicy(backoff=0)) as c:
+        response = c.get(f"{server}/retrieve")
+        stats = c.stats()["retries"]
+    assert response.json() == {"ok": True}
+    assert _FlakyHandler.calls == 3
+    assert stats["retries"] == 2
+    assert stats["reasons"] == {"503": 2}
+    assert stats["hosts"] == {"127.0.0.1": 2}
+
+
+def test_client_returns_last_response_when_attempts_run_out(server):
+    _FlakyHandler.failures = 10
+    _FlakyHandler.status = 502
+    with Client(retry=RetryPolicy(attempts=3, backoff=0)) as c:
+        response = c.get(f"{server}/retrieve")
+        stats = c.stats()["retries"]
+    assert response.status_code == 502
+    assert _FlakyHandler.calls == 3
+    assert stats["gave_up"] == 1
+
+
+def test_client_does_not_retry_post(server):
+    _FlakyHandler.failures = 1
+    with Client(retry=RetryPolicy(backoff=0)) as c:
+        assert c.request("POST", f"{server}/retrieve", data=b"x").status_code == 503
+    assert _FlakyHandler.calls == 1
+
+
+def test_client_retries_connection_errors():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    with Client(retry=RetryPolicy(attempts=2, backoff=0)) as c:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            c.get(f"http://127.0.0.1:{port}/", timeout=1)
+        stats = c.stats()["retries"]
+    assert stats["retries"] == 1
+    assert stats["gave_up"] == 1
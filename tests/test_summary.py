@@ -31,6 +31,7 @@ def test_load_reads_from_bil_path_when_exists(tmp_path):
     with patch("brainimagelibrary.summary.Path") as mock_path_cls:
         mock_path_instance = MagicMock()
         mock_path_instance.exists.return_value = True
+        mock_path_instance.with_suffix.return_value.exists.return_value = False
         mock_path_cls.return_value = mock_path_instance
         with patch("brainimagelibrary.summary.pd.read_csv", return_value=SAMPLE_DF) as mock_read:
             result = summary.load("20240101")
@@ -40,11 +41,12 @@ def test_load_reads_from_bil_path_when_exists(tmp_path):
 
 def test_load_downloads_when_bil_path_missing(tmp_path):
     with patch("brainimagelibrary.summary.Path") as mock_path_cls, \
-         patch("brainimagelibrary.summary.requests.get") as mock_get, \
+         patch("brainimagelibrary.client.Client.get") as mock_get, \
          patch("builtins.open", mock_open()), \
          patch("brainimagelibrary.summary.pd.read_csv", return_value=SAMPLE_DF):
         mock_path_instance = MagicMock()
         mock_path_instance.exists.return_value = False
+        mock_path_instance.with_suffix.return_value.exists.return_value = False
         mock_path_cls.return_value = mock_path_instance
         mock_get.return_value = make_mock_response(
             content=SAMPLE_TSV_CONTENT.encode(), status_code=200
@@ -56,10 +58,11 @@ def test_load_downloads_when_bil_path_missing(tmp_path):
 def test_load_returns_none_when_download_fails(caplog):
     import logging
     with patch("brainimagelibrary.summary.Path") as mock_path_cls, \
-         patch("brainimagelibrary.summary.requests.get") as mock_get, \
+         patch("brainimagelibrary.client.Client.get") as mock_get, \
          caplog.at_level(logging.WARNING, logger="brainimagelibrary.summary"):
         mock_path_instance = MagicMock()
         mock_path_instance.exists.return_value = False
+        mock_path_instance.with_suffix.return_value.exists.return_value = False
         mock_path_cls.return_value = mock_path_instance
         mock_get.return_value = make_mock_response(status_code=404)
         result = summary.load("19000101")
@@ -70,10 +73,11 @@ def test_load_returns_none_when_download_fails(caplog):
 def test_load_returns_none_on_request_exception(caplog):
     import logging
     with patch("brainimagelibrary.summary.Path") as mock_path_cls, \
-         patch("brainimagelibrary.summary.requests.get") as mock_get, \
+         patch("brainimagelibrary.client.Client.get") as mock_get, \
          caplog.at_level(logging.WARNING, logger="brainimagelibrary.summary"):
         mock_path_instance = MagicMock()
         mock_path_instance.exists.return_value = False
+        mock_path_instance.with_suffix.return_value.exists.return_value = False
         mock_path_cls.return_value = mock_path_instance
         mock_get.side_effect = requests.exceptions.RequestException("timeout")
         result = summary.load("20240101")
@@ -81,6 +85,21 @@ def test_load_returns_none_on_request_exception(caplog):
     assert "unavailable" in caplog.text
 
 
+def test_load_prefers_parquet_with_nested_columns(tmp_path):
+    pytest.importorskip("pyarrow")
+    from brainimagelibrary import reports
+
+    df = SAMPLE_DF.assign(frequencies=[{"tif": 2}, {"json": 1}], file_types=[["tif"], ["json"]])
+    reports._write_parquet(df, tmp_path / "20240101.parquet")
+    with patch("brainimagelibrary.summary.Path", return_value=tmp_path / "20240101.tsv"), \
+         patch("brainimagelibrary.summary.pd.read_csv") as mock_read:
+        result = summary.load("20240101")
+    mock_read.assert_not_called()
+    assert result["frequencies"].tolist() == [{"tif": 2}, {"json": 1}]
+    assert result["file_types"].tolist() == [["tif"], ["json"]]
+    assert isinstance(result["species"].dtype, pd.CategoricalDtype)
+
+
 # --- daily() ---
 
 def test_daily_returns_dict_with_expected_keys():